@@ -0,0 +1,5 @@
+from qtpex.benchmarks.hot_paths import main
+
+
+if __name__ == "__main__":
+    main()
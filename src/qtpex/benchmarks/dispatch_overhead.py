@@ -0,0 +1,153 @@
+"""
+Measures the per-call cost of an extra forwarding hop on top of the ConfigurableXYSeriesMixin, where every method of the
+    series forwards to a static method which then calls back into the series, as the former StaticConfigurableXYSeries
+    dispatch did.
+Both variants run the current implementation, thus, this is not a comparison with the former implementation, only with
+    its dispatch.
+
+Run with: QT_QPA_PLATFORM=offscreen python -m qtpex.benchmarks.dispatch_overhead
+"""
+import os
+import timeit
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCharts import QXYSeries
+from PySide6.QtCore import QPointF, Slot
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication
+
+from qtpex.qt_objects.configurable_scatter_series import ConfigurableScatterSeries
+from qtpex.qt_objects.configurable_xy_series import ConfigurableXYSeriesMixin
+
+# kept alive while the series exist
+_app = None
+
+class _StaticForwarding:
+    """
+    A static class which the series forward to, like the former StaticConfigurableXYSeries.
+    """
+    @staticmethod
+    def swap(self, idx1, idx2):
+        return ConfigurableXYSeriesMixin.swap(self, idx1, idx2)
+
+    @staticmethod
+    def setPointConfiguration(self, index, configuration):
+        return ConfigurableXYSeriesMixin.setPointConfiguration(self, index, configuration)
+
+    @staticmethod
+    def set_id_configuration_for_point_at_idx(self, idx, conf):
+        return ConfigurableXYSeriesMixin.set_id_configuration_for_point_at_idx(self, idx, conf)
+
+    @staticmethod
+    def get_id_of_point_idx(self, idx):
+        return ConfigurableXYSeriesMixin.get_id_of_point_idx(self, idx)
+
+    @staticmethod
+    def update_points_configuration(self, indices=None):
+        return ConfigurableXYSeriesMixin.update_points_configuration(self, indices)
+
+    @staticmethod
+    def clearPointConfiguration(self, index, key=None):
+        return ConfigurableXYSeriesMixin.clearPointConfiguration(self, index, key)
+
+    @staticmethod
+    def id_series_added(self, idx):
+        return ConfigurableXYSeriesMixin.id_series_added(self, idx)
+
+    @staticmethod
+    def id_series_removed(self, idx):
+        return ConfigurableXYSeriesMixin.id_series_removed(self, idx)
+
+    @staticmethod
+    def id_series_swapped(self, idx1, idx2):
+        return ConfigurableXYSeriesMixin.id_series_swapped(self, idx1, idx2)
+
+
+class StaticForwardingScatterSeries(ConfigurableScatterSeries):
+    """
+    A ConfigurableScatterSeries whose hot-path methods go through an extra wrapper -> static method hop.
+    """
+    def swap(self, idx1, idx2):
+        return _StaticForwarding.swap(self, idx1, idx2)
+
+    def setPointConfiguration(self, index, configuration):
+        return _StaticForwarding.setPointConfiguration(self, index, configuration)
+
+    def set_id_configuration_for_point_at_idx(self, idx, conf):
+        return _StaticForwarding.set_id_configuration_for_point_at_idx(self, idx, conf)
+
+    def get_id_of_point_idx(self, idx):
+        return _StaticForwarding.get_id_of_point_idx(self, idx)
+
+    def update_points_configuration(self, indices=None):
+        return _StaticForwarding.update_points_configuration(self, indices)
+
+    def clearPointConfiguration(self, index, key=None):
+        return _StaticForwarding.clearPointConfiguration(self, index, key)
+
+    @Slot(int)
+    def id_series_added(self, idx):
+        return _StaticForwarding.id_series_added(self, idx)
+
+    @Slot(int)
+    def id_series_removed(self, idx):
+        return _StaticForwarding.id_series_removed(self, idx)
+
+    @Slot(int, int)
+    def id_series_swapped(self, idx1, idx2):
+        return _StaticForwarding.id_series_swapped(self, idx1, idx2)
+
+
+def _time_per_call(series_class, operation: str, n_points: int, n_calls: int) -> float:
+    series = series_class()
+    series.append_many((list(range(n_points)), [0.0] * n_points))
+    series.flush_points_configuration()
+
+    conf = {QXYSeries.PointConfiguration.Color: QColor(255, 0, 0)}
+
+    if operation == "add":
+        def call():
+            series.append(QPointF(n_points, 0))
+    elif operation == "remove":
+        series.append_many((list(range(n_calls)), [0.0] * n_calls))
+
+        def call():
+            series.remove(series.count() - 1)
+    elif operation == "swap":
+        def call():
+            series.swap(0, 1)
+    elif operation == "config":
+        def call():
+            series.setPointConfiguration(n_points // 2, conf)
+    else:
+        raise ValueError("unknown operation: {}".format(operation))
+
+    seconds = timeit.timeit(call, number=n_calls)
+    series.flush_points_configuration()
+    return seconds / n_calls
+
+
+def run(n_points: int = 1000, n_calls: int = 2000) -> dict:
+    """
+    Returns the seconds per call of the mixin with and without static forwarding for add, remove, swap, and config.
+    :param n_points: The number of points in the series.
+    :param n_calls: The number of calls to measure per operation.
+    :return:
+    """
+    global _app
+    _app = QApplication.instance() or QApplication([])
+
+    results = dict()
+    for operation in ("add", "remove", "swap", "config"):
+        results[operation] = {
+            "mixin": _time_per_call(ConfigurableScatterSeries, operation, n_points, n_calls),
+            "static_forwarding": _time_per_call(StaticForwardingScatterSeries, operation, n_points, n_calls),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    for operation, r in run().items():
+        print("{:8s} mixin: {:8.2f} us/call   static forwarding: {:8.2f} us/call".format(
+            operation, r["mixin"] * 1e6, r["static_forwarding"] * 1e6))
@@ -0,0 +1,346 @@
+"""
+Benchmarks of the hot paths of qt_objects and qt_widgets.
+
+Every benchmark is a function that takes the size of the problem, sets it up, and returns a BenchmarkCase whose call
+    is timed. The results are written as json, so runs of different commits can be compared.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import PySide6
+from PySide6.QtCharts import QXYSeries
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication
+
+from qtpex.qt_objects.configurable_line_series import ConfigurableLineSeries
+from qtpex.qt_objects.configurable_scatter_series import ConfigurableScatterSeries
+from qtpex.qt_utility.series import find_point_idx
+from qtpex.qt_widgets.interactive_chart import InteractiveChartWidget
+from qtpex.qt_widgets.transferfunction_widget import TransferFunctionWidget
+
+
+DEFAULT_SIZES = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+
+class BenchmarkCase:
+    """
+    A set up benchmark.
+    :param call: The timed function.
+    :param reset: An untimed function called after every call, e.g., to undo the call.
+    :param max_calls: The maximum number of calls the set up state allows.
+    """
+    def __init__(self, call: Callable[[], None], reset: Callable[[], None] = None, max_calls: int = None):
+        self.call = call
+        self.reset = reset
+        self.max_calls = max_calls
+
+
+# name -> (function(size) -> BenchmarkCase, maximum size or None)
+BENCHMARKS = dict()
+
+
+def benchmark(name: str, max_size: int = None):
+    """
+    Registers a benchmark function under name.
+    :param name:
+    :param max_size: Sizes above are skipped unless size limits are disabled, e.g., for quadratic benchmarks.
+    :return:
+    """
+    def decorator(f):
+        BENCHMARKS[name] = (f, max_size)
+        return f
+    return decorator
+
+
+def _filled_series(series_class, size: int):
+    series = series_class()
+    series.append_many((np.arange(size, dtype=np.float64), np.zeros(size)))
+    series.flush_points_configuration()
+    return series
+
+
+def _series_benchmarks(prefix: str, series_class):
+    conf = {QXYSeries.PointConfiguration.Color: QColor(255, 0, 0)}
+
+    @benchmark(prefix + ".append")
+    def append(size: int):
+        series = _filled_series(series_class, size)
+
+        def call():
+            series.append(size, 0)
+            series.flush_points_configuration()
+
+        return BenchmarkCase(call, lambda: series.remove_range(size, series.count() - size))
+
+    @benchmark(prefix + ".remove")
+    def remove(size: int):
+        series = _filled_series(series_class, size)
+
+        def call():
+            series.remove(size // 2)
+            series.flush_points_configuration()
+
+        return BenchmarkCase(call, lambda: series.insert(size // 2, QPointF(size // 2, 0)))
+
+    @benchmark(prefix + ".swap")
+    def swap(size: int):
+        series = _filled_series(series_class, size)
+
+        def call():
+            series.swap(size // 2, size // 2 + 1)
+            series.flush_points_configuration()
+
+        return BenchmarkCase(call)
+
+    @benchmark(prefix + ".set_point_configuration")
+    def set_point_configuration(size: int):
+        series = _filled_series(series_class, size)
+
+        def call():
+            series.setPointConfiguration(size // 2, conf)
+            series.flush_points_configuration()
+
+        return BenchmarkCase(call)
+
+    @benchmark(prefix + ".append_many")
+    def append_many(size: int):
+        series = series_class()
+        x, y = np.arange(size, dtype=np.float64), np.zeros(size)
+
+        def call():
+            series.append_many((x, y))
+            series.flush_points_configuration()
+
+        return BenchmarkCase(call, lambda: series.remove_range(0, series.count()))
+
+
+_series_benchmarks("configurable_scatter_series", ConfigurableScatterSeries)
+_series_benchmarks("configurable_line_series", ConfigurableLineSeries)
+
+
+# QtCharts creates one graphics item per point of a scatter series in a chart, filling a chart takes ~20 s for 10^5
+# points and grows superlinearly, thus, the chart benchmarks are limited to this size
+_MAX_CHART_SIZE = 10 ** 5
+
+
+def _filled_chart(size: int) -> InteractiveChartWidget:
+    chart = InteractiveChartWidget()
+    chart.scatterseries.append_many((np.arange(size, dtype=np.float64), np.zeros(size)))
+    chart.scatterseries.flush_points_configuration()
+    return chart
+
+
+@benchmark("interactive_chart.sorted_insert", max_size=_MAX_CHART_SIZE)
+def sorted_insert(size: int):
+    chart = _filled_chart(size)
+
+    return BenchmarkCase(lambda: chart.sorted_insert(QPointF(size / 2 + 0.5, 0)),
+                         lambda: chart.scatterseries.remove(size // 2 + 1))
+
+
+@benchmark("interactive_chart.sorted_replace", max_size=_MAX_CHART_SIZE)
+def sorted_replace(size: int):
+    chart = _filled_chart(size)
+    state = {"idx": size // 4}
+
+    def call():
+        # drag the point just behind its right neighbor, i.e., the ordering changes with every call
+        state["idx"] = chart.sorted_replace(state["idx"], QPointF(state["idx"] + 1.5, 0))
+
+    return BenchmarkCase(call, max_calls=size // 2)
+
+
+@benchmark("qt_utility.find_point_idx")
+def find_point_idx_(size: int):
+    series = _filled_series(ConfigurableScatterSeries, size)
+    point = QPointF(size - 1, 0)
+
+    return BenchmarkCase(lambda: find_point_idx(point, series))
+
+
+@benchmark("transferfunction_widget.get_current_color_map", max_size=10 ** 4)
+def get_current_color_map(size: int):
+    tf = TransferFunctionWidget("linear")
+    rng = np.random.default_rng(0)
+    tf.scatterseries.insert_many(1, (np.linspace(1, 254, size), rng.random(size)))
+
+    return BenchmarkCase(tf.get_current_color_map)
+
+
+@benchmark("transferfunction_widget.get_lut")
+def get_lut(size: int):
+    tf = TransferFunctionWidget("linear")
+    rng = np.random.default_rng(0)
+    tf.scatterseries.insert_many(1, (np.linspace(1, 254, size), rng.random(size)))
+
+    # the lookup tables are cached until the points change, invalidate them as a change would to time their
+    # construction, see get_lut_cached for the cache hits
+    return BenchmarkCase(tf.get_lut, reset=tf._invalidate_lut_)
+
+
+@benchmark("transferfunction_widget.get_lut_cached")
+def get_lut_cached(size: int):
+    tf = TransferFunctionWidget("linear")
+    rng = np.random.default_rng(0)
+    tf.scatterseries.insert_many(1, (np.linspace(1, 254, size), rng.random(size)))
+    tf.get_lut()
+
+    return BenchmarkCase(tf.get_lut)
+
+
+@benchmark("transferfunction_widget.apply")
+def apply(size: int):
+    tf = TransferFunctionWidget("linear", x_range=(0, 4095))
+    data = np.random.default_rng(0).integers(0, 4096, size).astype(np.uint16)
+    out = np.empty((size, 4), dtype=np.uint8)
+
+    return BenchmarkCase(lambda: tf.apply(data, out))
+
+
+def run_benchmark(name: str, size: int, min_time: float = 0.2, max_calls: int = 1000) -> dict:
+    """
+    Sets up the benchmark name with size and calls it until min_time passed or max_calls calls were made.
+    :param name:
+    :param size:
+    :param min_time: The minimum total seconds of timed calls.
+    :param max_calls:
+    :return: The result as dict.
+    """
+    case = BENCHMARKS[name][0](size)
+    if case.max_calls is not None:
+        max_calls = max(1, min(max_calls, case.max_calls))
+
+    times = []
+    while len(times) < max_calls and sum(times) < min_time:
+        t0 = time.perf_counter()
+        case.call()
+        times.append(time.perf_counter() - t0)
+        if case.reset is not None:
+            case.reset()
+
+    return {
+        "benchmark": name,
+        "size": size,
+        "calls": len(times),
+        "seconds_per_call": sum(times) / len(times),
+        "min_seconds": min(times),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(__file__),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes: List[int] = None, names: List[str] = None, min_time: float = 0.2, max_calls: int = 1000,
+                   size_limits: bool = True, log=None) -> dict:
+    """
+    Runs the benchmarks for all sizes.
+    :param sizes: Defaults to DEFAULT_SIZES.
+    :param names: Names or name prefixes of the benchmarks to run. Defaults to all benchmarks.
+    :param min_time: The minimum total seconds of timed calls per benchmark and size.
+    :param max_calls: The maximum number of calls per benchmark and size.
+    :param size_limits: Skips sizes above the maximum size of a benchmark if True.
+    :param log: Optional text stream to print progress to.
+    :return: A json compatible dict with the keys "meta" and "results".
+    """
+    app = QApplication.instance() or QApplication([])
+
+    sizes = DEFAULT_SIZES if sizes is None else sizes
+    selected = [n for n in BENCHMARKS if names is None or any(n.startswith(p) for p in names)]
+
+    results = []
+    for name in selected:
+        max_size = BENCHMARKS[name][1]
+        for size in sizes:
+            if size_limits and max_size is not None and size > max_size:
+                continue
+            result = run_benchmark(name, size, min_time, max_calls)
+            results.append(result)
+            app.processEvents()
+            if log is not None:
+                print("{:55s} {:>9d} {:12.3f} us/call ({} calls)".format(
+                    name, size, result["seconds_per_call"] * 1e6, result["calls"]), file=log)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "pyside6": PySide6.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "min_time": min_time,
+            "max_calls": max_calls,
+        },
+        "results": results,
+    }
+
+
+def compare(old: dict, new: dict) -> List[dict]:
+    """
+    Compares two results of run_benchmarks.
+    :param old:
+    :param new:
+    :return: One dict per benchmark and size in both results with the ratio new / old of the seconds per call.
+    """
+    old_results = {(r["benchmark"], r["size"]): r for r in old["results"]}
+    comparison = []
+    for r in new["results"]:
+        key = (r["benchmark"], r["size"])
+        if key in old_results:
+            comparison.append({
+                "benchmark": r["benchmark"],
+                "size": r["size"],
+                "old_seconds_per_call": old_results[key]["seconds_per_call"],
+                "new_seconds_per_call": r["seconds_per_call"],
+                "ratio": r["seconds_per_call"] / old_results[key]["seconds_per_call"],
+            })
+    return comparison
+
+
+def main(argv: List[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Runs the qtpex hot path benchmarks headless.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--benchmarks", nargs="+", default=None, help="names or name prefixes of benchmarks")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--max-calls", type=int, default=1000)
+    parser.add_argument("--no-size-limits", action="store_true", help="also run sizes above a benchmark's maximum")
+    parser.add_argument("--output", "-o", default=None, help="json file to write the results to")
+    parser.add_argument("--compare", default=None, help="json file of a previous run to compare with")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (_, max_size) in BENCHMARKS.items():
+            print(name if max_size is None else "{} (max size {})".format(name, max_size))
+        return
+
+    results = run_benchmarks(args.sizes, args.benchmarks, args.min_time, args.max_calls,
+                             not args.no_size_limits, log=sys.stderr)
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            old = json.load(f)
+        for c in compare(old, results):
+            print("{:55s} {:>9d} {:8.2f}x".format(c["benchmark"], c["size"], c["ratio"]), file=sys.stderr)
@@ -1,3 +1,4 @@
+import numpy as np
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QIntList, Signal
 from PySide6.QtGui import QColor
 
@@ -13,6 +14,10 @@ class CustomTableModel(QAbstractTableModel):
         self.input_dates = data[0].values
         self.input_magnitudes = data[1].values
 
+        # seconds since epoch of the dates, e.g., as x-coordinates for the chart
+        self.input_timestamps = np.fromiter((d.toSecsSinceEpoch() for d in self.input_dates), dtype=np.float64,
+                                            count=len(self.input_dates))
+
         self.column_count = 2
         self.row_count = len(self.input_magnitudes)
 
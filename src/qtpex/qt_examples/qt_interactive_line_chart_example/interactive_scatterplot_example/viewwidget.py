@@ -1,11 +1,13 @@
+import numpy as np
 from PySide6.QtWidgets import (QHBoxLayout, QHeaderView, QSizePolicy,
                                QTableView, QWidget)
-from PySide6.QtCore import QDateTime, Qt, Slot
+from PySide6.QtCore import Qt, Slot
 from PySide6.QtGui import QPainter, QMouseEvent, QColor
 
 from PySide6.QtCharts import QChart, QLineSeries, QDateTimeAxis, QValueAxis, QScatterSeries
 
 from tablemodel import CustomTableModel
+from qtpex.qt_utility.series import set_series_points
 from qtpex.qt_widgets.iqchartview import IQChartView
 
 
@@ -115,9 +117,7 @@ class Widget(QWidget):
     @Slot(int, int, float, float)
     def update_data(self, row, column, old_magnitude, new_magnitude):
         # Getting the data
-        t = self.model.index(row, 0).data()
-        date_fmt = "yyyy-MM-dd HH:mm:ss.zzz"
-        x = float(QDateTime().fromString(t, date_fmt).toSecsSinceEpoch())
+        x = float(self.model.input_timestamps[row])
         y = old_magnitude
 
         self.series.replace(x, y, x, new_magnitude)
@@ -143,16 +143,12 @@ class Widget(QWidget):
         self.scatterseries.setSelectedColor(sc)
 
         # Filling QLineSeries and QScatterSeries
-        for i in range(self.model.rowCount()):
-            # Getting the data
-            t = self.model.index(i, 0).data()
-            date_fmt = "yyyy-MM-dd HH:mm:ss.zzz"
-            x = QDateTime().fromString(t, date_fmt).toSecsSinceEpoch()
-            y = float(self.model.index(i, 1).data())
-
-            if x > 0 and y > 0:
-                self.series.append(x, y)
-                self.scatterseries.append(x, y)
+        x = self.model.input_timestamps
+        y = np.asarray(self.model.input_magnitudes, dtype=np.float64)
+        valid = (x > 0) & (y > 0)
+
+        set_series_points(self.series, x[valid], y[valid])
+        set_series_points(self.scatterseries, x[valid], y[valid])
 
         self.chart.addSeries(self.series)
         self.chart.addSeries(self.scatterseries)
@@ -0,0 +1,105 @@
+"""
+A versioned flat binary format for the points of configurable series.
+
+Layout (little endian):
+    header (32 bytes): magic b"QTPEXPTS", uint32 version, uint64 number of points n, 12 bytes padding
+    x: n * float64
+    y: n * float64
+    colors: n * uint32 (ARGB)
+    sizes: n * float32
+    flags: n * uint8 (the bitmask of PointConfigurationStore)
+
+The columns are stored one after another, thus, each of them can be memory-mapped directly.
+"""
+import os
+import struct
+from typing import Dict
+
+import numpy as np
+
+MAGIC = b"QTPEXPTS"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIQ12x")
+
+COLUMNS = (
+    ("x", np.dtype("<f8")),
+    ("y", np.dtype("<f8")),
+    ("colors", np.dtype("<u4")),
+    ("sizes", np.dtype("<f4")),
+    ("flags", np.dtype("u1")),
+)
+
+
+def write_point_columns(file, x, y, colors, sizes, flags):
+    """
+    Writes the point columns to file.
+    :param file: A path or a binary file object.
+    :param x:
+    :param y:
+    :param colors:
+    :param sizes:
+    :param flags:
+    :return:
+    """
+    columns = dict(x=x, y=y, colors=colors, sizes=sizes, flags=flags)
+    count = len(x)
+
+    for name, _ in COLUMNS:
+        if len(columns[name]) != count:
+            raise ValueError("column {} has {} entries, expected {}".format(name, len(columns[name]), count))
+
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "wb") as f:
+            return write_point_columns(f, x, y, colors, sizes, flags)
+
+    file.write(_HEADER.pack(MAGIC, VERSION, count))
+    for name, dtype in COLUMNS:
+        file.write(np.ascontiguousarray(columns[name], dtype=dtype).data)
+
+
+def read_point_columns(file, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Reads the point columns from file.
+    :param file: A path or a binary file object.
+    :param mmap: If True and file is a path, memory-maps the columns read-only instead of reading them.
+    :return: A dict with the columns x, y, colors, sizes, and flags.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        if not mmap:
+            with open(file, "rb") as f:
+                return read_point_columns(f)
+        with open(file, "rb") as f:
+            count = _read_header_(f.read(_HEADER.size))
+
+        columns = dict()
+        offset = _HEADER.size
+        for name, dtype in COLUMNS:
+            columns[name] = np.memmap(file, dtype=dtype, mode="r", offset=offset, shape=(count,)) \
+                if count > 0 else np.empty(0, dtype=dtype)
+            offset += count * dtype.itemsize
+        return columns
+
+    count = _read_header_(file.read(_HEADER.size))
+
+    columns = dict()
+    for name, dtype in COLUMNS:
+        buffer = file.read(count * dtype.itemsize)
+        if len(buffer) != count * dtype.itemsize:
+            raise ValueError("unexpected end of file in column {}".format(name))
+        columns[name] = np.frombuffer(buffer, dtype=dtype)
+    return columns
+
+
+def _read_header_(header: bytes) -> int:
+    if len(header) != _HEADER.size:
+        raise ValueError("unexpected end of file in header")
+
+    magic, version, count = _HEADER.unpack(header)
+
+    if magic != MAGIC:
+        raise ValueError("not a qtpex point file")
+    if version > VERSION:
+        raise ValueError("unsupported qtpex point file version: {}".format(version))
+
+    return count
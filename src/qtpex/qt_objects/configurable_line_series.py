@@ -1,160 +1,264 @@
-from typing import Dict, Any
+import numpy as np
+from PySide6.QtCharts import QLineSeries, QXYSeries
+from PySide6.QtCore import Qt, QTimer, Slot
 
-import PySide6
-from PySide6.QtCore import Slot, Signal
+from qtpex.qt_objects.configurable_xy_series import ConfigurableXYSeriesMixin
+from qtpex.qt_utility.downsampling import lttb_indices, pixel_minmax_indices
 
-from PySide6.QtCharts import QLineSeries, QScatterSeries
 
-from qtpex.qt_objects.configurable_xy_series import StaticConfigurableXYSeries
-
-
-class ConfigurableLineSeries(QLineSeries):
+class ConfigurableLineSeries(ConfigurableXYSeriesMixin, QLineSeries):
     """
-        A QLineSeries which keeps a second scatter series to keep track of point ids.
+        A QLineSeries which keeps a point id store to keep track of point ids.
         It overrides the set configuration methods for the points to keep the same configurations even if points
             are deleted, or replaced, or intermediately inserted.
+
+        With level of detail (LOD) enabled, all points stay in the coordinate buffer, but qt only gets the points that
+            are needed to draw the line in the visible x-range at the width of the plot area.
+        In LOD mode, the point indices of the methods of this class, e.g., setPointConfiguration, refer to all points,
+            whereas the indices of qt methods, e.g., at or count, refer to the displayed points.
+        Points with a configuration, e.g., a color, are always displayed.
+        Modify the points with the bulk methods (append_many, insert_many, remove_range, replace_many, move, swap) only.
+            The single point methods of qt (append, insert, remove, replace, removePoints, clear) raise a RuntimeError
+            in LOD mode.
         """
-    swapped_signal = Signal(int, int)
+    LOD_MINMAX = "minmax"
+    LOD_LTTB = "lttb"
+
+    # without an attached chart, the points are downsampled for this width in pixels
+    DEFAULT_LOD_WIDTH = 1024
 
     def __init__(self, parent=None):
         super().__init__(parent=parent)
-        StaticConfigurableXYSeries.set_up_init(self)
 
-    def block_qt_configuration_updates(self, block: bool):
-        """
-        sets the blocking state up configuration updates.
-        usefull for adding and removing lot's of points at once where we don't need the GUI to keep up with our
-            updates.
+        # the indices of the displayed points in LOD mode, None if LOD is disabled
+        self._lod_indices = None
+        self._lod_method = self.LOD_MINMAX
+        self._lod_sources = []
 
-        Note that after a series of blocked updates, there should be a final call to unblock this and update manually.
-        :param self:
-        :param block:
-        :return:
-        """
-        return StaticConfigurableXYSeries.block_qt_configuration_updates(self, block)
+        # recomputes the displayed points once per event-loop iteration, e.g., after zooming both axes
+        self._lod_timer = QTimer(self)
+        self._lod_timer.setSingleShot(True)
+        self._lod_timer.setInterval(0)
+        self._lod_timer.timeout.connect(self.update_lod)
 
-    def swap(self, idx1: int, idx2: int):
+    def set_lod(self, enabled: bool = True, method: str = LOD_MINMAX):
         """
-        Swaps the index of two points and keeps their configuration.
-        Triggers the swap signal.
-        Does not trigger other signals.
-        :param idx1:
-        :param idx2:
+        Enables or disables the level of detail mode.
+        Attach the series to its chart and axes first, s.t., the displayed points follow the axis range and plot size.
+        :param enabled:
+        :param method: LOD_MINMAX keeps the first, last, minimum, and maximum point per pixel column, which draws the
+            same line as all points. LOD_LTTB keeps two points per pixel column with the largest triangle three
+            buckets algorithm, which keeps the shape but may drop peaks.
         :return:
         """
-        return StaticConfigurableXYSeries.swap(self, idx1, idx2)
+        if method not in (self.LOD_MINMAX, self.LOD_LTTB):
+            raise ValueError("unknown LOD method: {}".format(method))
+
+        self._lod_method = method
 
-    def setPointConfiguration(self, index: int,
-                              configuration: Dict[PySide6.QtCharts.QXYSeries.PointConfiguration, Any]) -> None:
-        return StaticConfigurableXYSeries.setPointConfiguration(self, index, configuration)
+        if not enabled:
+            if self._lod_indices is not None:
+                self._lod_indices = None
+                self._replace_qt_points_()
+                self.update_points_configuration()
+            return
 
-    def setPointConfigurationKeyVal(self, index: int, key, val):
+        self._lod_indices = np.empty(0, dtype=np.int64)
+        self.update_lod()
+
+    def lod_enabled(self) -> bool:
+        return self._lod_indices is not None
+
+    def get_displayed_point_indices(self) -> np.ndarray:
         """
-        Sets only key and value of for the point at given index.
-        Does not adjust the other values.
-        :param index:
-        :param key:
-        :param val:
+        Returns the indices of the points that are displayed in qt, i.e., all indices if LOD is disabled.
         :return:
         """
-        return StaticConfigurableXYSeries.setPointConfigurationKeyVal(self, index, key, val)
+        if self._lod_indices is None:
+            return np.arange(len(self._point_coordinates))
+        return self._lod_indices.copy()
 
-    def setPointsConfiguration(self, pointsConfiguration: Dict[
-        int, Dict[PySide6.QtCharts.QXYSeries.PointConfiguration, Any]]) -> None:
+    @Slot()
+    def update_lod(self):
         """
-        Sets the configuration for multiple points at once.
-        If it is an empty dict, deletes all configurations.
-        :param pointsConfiguration:
+        Recomputes the displayed points for the current axis range and plot size and pushes them to qt.
         :return:
         """
-        return StaticConfigurableXYSeries.setPointsConfiguration(self, pointsConfiguration)
+        self._lod_timer.stop()
+        if self._lod_indices is None:
+            return
 
-    def clearPointConfiguration(self, index: int, key=None) -> None:
-        return StaticConfigurableXYSeries.clearPointConfiguration(self, index, key)
+        self._connect_lod_sources_()
 
-    def clearPointsConfiguration(self, key=None) -> None:
-        return StaticConfigurableXYSeries.clearPointsConfiguration(self, key)
+        x, y = self._point_coordinates.x(), self._point_coordinates.y()
+        width, x_range = self._lod_view_()
 
-    def get_id_of_point_idx(self, idx: int):
-        """
-        Returns the id of the point idx.
-        :param idx:
-        :return:
-        """
-        return StaticConfigurableXYSeries.get_id_of_point_idx(self, idx)
+        if x_range is None:
+            x_range = (float(x.min()), float(x.max())) if len(x) > 0 else (0.0, 1.0)
+
+        if len(x) <= 2 * width:
+            indices = np.arange(len(x))
+        elif not np.all(x[1:] >= x[:-1]):
+            # unsorted points can not be split in pixel columns, downsample them in index order
+            indices = lttb_indices(np.arange(len(x), dtype=np.float64), y, 2 * width)
+        elif self._lod_method == self.LOD_LTTB:
+            lo = max(int(np.searchsorted(x, x_range[0], side="left")) - 1, 0)
+            hi = min(int(np.searchsorted(x, x_range[1], side="right")) + 1, len(x))
+            indices = lttb_indices(x[lo:hi], y[lo:hi], 2 * width) + lo
+        else:
+            indices = pixel_minmax_indices(x, y, x_range[0], x_range[1], width)
+
+        if len(indices) < len(x):
+            # keep the configured points in the visible range, s.t., their colors, sizes, etc. stay visible
+            configured = np.flatnonzero(self._points_id_configuration.configured(self._point_ids.ids()))
+            configured = configured[(x[configured] >= x_range[0]) & (x[configured] <= x_range[1])]
+            if len(configured) > 0:
+                indices = np.union1d(indices, configured)
 
-    def get_idx_of_point_id(self, point_id: int):
+        self._lod_indices = indices
+
+        self._bulk_update_in_progress = True
+        try:
+            self.replaceNp(x[indices], y[indices])
+        finally:
+            self._bulk_update_in_progress = False
+
+        self.update_points_configuration()
+
+    def _lod_view_(self):
         """
-        Returns the current index of the point with given id.
-        Returns -1 if not found.
-        :param point_id:
-        :return:
+        Returns the width of the plot area in pixels and the range of the horizontal axis, or None if not attached.
+        :return: (width, (min, max) or None)
         """
-        return StaticConfigurableXYSeries.get_idx_of_point_id(self, point_id)
+        width, x_range = self.DEFAULT_LOD_WIDTH, None
+
+        if self.chart() is not None and self.chart().plotArea().width() >= 1:
+            width = int(self.chart().plotArea().width())
+
+        for axis in self.attachedAxes():
+            if axis.orientation() == Qt.Horizontal and hasattr(axis, "min"):
+                x_range = (float(axis.min()), float(axis.max()))
 
-    def set_id_configuration_for_point_at_idx(self, idx: int, conf: dict):
+        return width, x_range
+
+    def _connect_lod_sources_(self):
         """
-        Sets the configuration for the point at idx based on its id.
-        :param conf:
-        :param idx:
+        Recomputes the displayed points whenever the plot area or the range of an attached axis changes.
         :return:
         """
-        return StaticConfigurableXYSeries.set_id_configuration_for_point_at_idx(self, idx, conf)
+        sources = [self.chart()] + list(self.attachedAxes())
+        for source in sources:
+            if source is None or any(source is s for s in self._lod_sources):
+                continue
+            if hasattr(source, "plotAreaChanged"):
+                source.plotAreaChanged.connect(self._schedule_lod_update_)
+            if hasattr(source, "rangeChanged"):
+                source.rangeChanged.connect(self._schedule_lod_update_)
+            self._lod_sources.append(source)
 
-    def get_configuration_for_point_at_idx(self, idx: int):
-        return StaticConfigurableXYSeries.get_configuration_for_point_at_idx(self, idx)
+    @Slot()
+    def _schedule_lod_update_(self):
+        if self._lod_indices is not None and not self._lod_timer.isActive():
+            self._lod_timer.start()
 
-    @staticmethod
-    def get_qt_point_configuration_keys():
-        return StaticConfigurableXYSeries.get_qt_point_configuration_keys()
+    def _raise_if_lod_(self, method: str):
+        if self._lod_indices is not None:
+            raise RuntimeError("{} is not supported in LOD mode, use the bulk methods instead".format(method))
 
-    def as_json_compatible_list(self):
-        return StaticConfigurableXYSeries.as_json_compatible_list(self)
+    def append(self, *args):
+        self._raise_if_lod_("append")
+        return super().append(*args)
 
-    @staticmethod
-    def json_compatible_list_to_regular_point_list(points: list):
-        return StaticConfigurableXYSeries.json_compatible_list_to_regular_point_list(points)
+    def insert(self, *args):
+        self._raise_if_lod_("insert")
+        return super().insert(*args)
 
-    def get_points_configuration_with_limited_keys(self, conf: dict):
-        return StaticConfigurableXYSeries.get_points_configuration_with_limited_keys(self, conf)
+    def remove(self, *args):
+        self._raise_if_lod_("remove")
+        return super().remove(*args)
 
-    def update_points_configuration(self, indices=None):
-        """
-        Updates the configuration of scatterseries with the current points_id_configuration.
-        :param indices: The indices to be updated. If not specified, updates all indices.
-        :return:
-        """
-        return StaticConfigurableXYSeries.update_points_configuration(self, indices)
+    def replace(self, *args):
+        self._raise_if_lod_("replace")
+        return super().replace(*args)
 
-    def get_points_id_configuration(self):
-        """
-        Returns the current points_id_configuration for all point of scatterseries.
-        The id's are the point's id's from point_id_series.
-        :return:
-        """
-        return StaticConfigurableXYSeries.get_points_id_configuration(self)
+    def removePoints(self, index: int, count: int):
+        self._raise_if_lod_("removePoints")
+        return super().removePoints(index, count)
+
+    def clear(self):
+        self._raise_if_lod_("clear")
+        return super().clear()
+
+    def _replace_qt_points_(self):
+        if self._lod_indices is None:
+            return super()._replace_qt_points_()
+        self.update_lod()
+
+    def _append_qt_points_(self, x, y):
+        if self._lod_indices is None:
+            return super()._append_qt_points_(x, y)
+        self.update_lod()
+
+    def remove_range(self, idx: int, count: int):
+        if self._lod_indices is None:
+            return super().remove_range(idx, count)
+
+        if count < 0 or not 0 <= idx <= len(self._point_coordinates) - count:
+            raise IndexError("point range out of range: {}, {}".format(idx, count))
+        if count == 0:
+            return
 
-    def set_points_id_configuration(self, conf: dict):
-        return StaticConfigurableXYSeries.set_points_id_configuration(self, conf)
+        self.id_series_points_removed(idx, count)
+        self.update_lod()
 
-    @Slot(int)
-    def id_series_added(self, idx: int):
-        return StaticConfigurableXYSeries.id_series_added(self, idx)
+    def move(self, from_idx: int, to_idx: int):
+        if self._lod_indices is None:
+            return super().move(from_idx, to_idx)
 
-    @Slot(int)
-    def id_series_removed(self, idx: int):
-        return StaticConfigurableXYSeries.id_series_removed(self, idx)
+        if from_idx != to_idx:
+            self.moved_signal.emit(from_idx, to_idx)
+            self.update_lod()
 
-    @Slot(int)
-    def id_series_replaced(self, idx: int):
-        return StaticConfigurableXYSeries.id_series_replaced(self, idx)
+    def swap(self, idx1: int, idx2: int):
+        if self._lod_indices is None:
+            return super().swap(idx1, idx2)
+
+        self.swapped_signal.emit(idx1, idx2)
+        self.update_lod()
+
+    def clearPointConfiguration(self, index: int, key=None) -> None:
+        if self._lod_indices is None:
+            return super().clearPointConfiguration(index, key)
+
+        self._points_id_configuration.delete(self.get_id_of_point_idx(index))
+        self.update_points_configuration([index])
+
+    def clearPointsConfiguration(self, key=None) -> None:
+        if self._lod_indices is None:
+            return super().clearPointsConfiguration(key)
+
+        self._points_id_configuration.clear(key)
+        self.update_points_configuration()
 
-    @Slot(int, int)
-    def id_series_swapped(self, idx1: int, idx2: int):
+    @Slot()
+    def flush_points_configuration(self):
         """
-        Swappes the id_series points.
-        :param idx1:
-        :param idx2:
+        Pushes the configurations to qt now.
+        In LOD mode, the configurations of all displayed points are pushed by their displayed index.
         :return:
         """
-        return StaticConfigurableXYSeries.id_series_swapped(self, idx1, idx2)
\ No newline at end of file
+        if self._lod_indices is None:
+            return super().flush_points_configuration()
+
+        if self._block_qt_configuration_updates or self._batch_updates_depth > 0:
+            return
+
+        self._flush_timer.stop()
+        self._all_points_dirty = False
+        self._dirty_point_indices = set()
+
+        ids = self._point_ids.ids()[self._lod_indices]
+        configured = self._points_id_configuration.configured(ids)
+        confs = self._points_id_configuration.get_many(ids[configured], self.get_qt_point_configuration_keys())
+
+        QXYSeries.setPointsConfiguration(self, dict(zip(np.flatnonzero(configured).tolist(), confs)))
@@ -1,56 +1,125 @@
-import json
+from contextlib import contextmanager
 from typing import Dict, Any
 
+import numpy as np
 import PySide6
-from PySide6.QtCharts import QScatterSeries, QXYSeries
+from PySide6.QtCharts import QXYSeries
+from PySide6.QtCore import QTimer, Signal, Slot
 from PySide6.QtGui import QColor
 
+from qtpex.qt_objects.binary_point_format import read_point_columns, write_point_columns
+from qtpex.qt_objects.json_point_stream import columns_to_json_points, iter_json_point_batches, \
+    json_points_to_columns, write_json_points
+from qtpex.qt_objects.point_configuration_store import PointConfigurationStore
+from qtpex.qt_objects.point_coordinate_buffer import PointCoordinateBuffer
+from qtpex.qt_objects.point_id_store import PointIdStore
+from qtpex.qt_objects.point_spatial_index import PointSpatialIndex
 
-class StaticConfigurableXYSeries:
+
+class ConfigurableXYSeriesMixin:
     """
-    A static QXYSeries which keeps a second scatter series to keep track of point ids.
+    A mixin for QXYSeries which keeps a point id store to keep track of point ids.
     It overrides the set configuration methods for the points to keep the same configurations even if points
         are deleted, or replaced, or intermediately inserted.
 
-    Don't use instances of this class. Derive from QXYSeries or similar and call the functions of this class with 'self'
-        as parameter of themselves.
+    Put it before the QXYSeries class in the bases, e.g., 'class MySeries(ConfigurableXYSeriesMixin, QScatterSeries)'.
+    It calls the QXYSeries methods cooperatively with super(), thus, it can be combined with any QXYSeries subclass
+        and subclassed further.
 
-    Be sure to implement the swapped_signal in the derived classes, i.e., add 'swapped_signal = Signal(int, int)' to the
-        class.
+    Shiboken base classes do not allow non-empty __slots__ in mixins, thus, the state lives in a few attributes that
+        are all set up in __init__.
     """
-    @staticmethod
-    def set_up_init(self):
-        # a scatter series that keeps track of the ids of individual points (their y-values)
-        self._point_id_series = QScatterSeries()
-        self._next_point_id = 0
+    __slots__ = ()
+
+    swapped_signal = Signal(int, int)
+    moved_signal = Signal(int, int)  # (old index of the moved point, new index of the moved point)
+    points_inserted_signal = Signal(int, int)  # (index of first inserted point, number of inserted points)
+    points_replaced_signal = Signal(int, int)  # (index of first replaced point, number of replaced points)
+    points_reordered_signal = Signal(object)  # the order passed to reorder
+    configuration_changed_signal = Signal()  # fired when point configurations were set, cleared, or marked as changed
+
+    # up to this many changed indices are pushed to qt one by one, more are pushed with one setPointsConfiguration
+    _MAX_SINGLE_CONFIGURATION_UPDATES = 32
+
+    # moves that shift up to this many points replace them in qt one by one, larger moves replace all points
+    _MAX_SINGLE_POINT_REPLACES = 32
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # keeps track of the ids of individual points (index -> id and id -> index)
+        self._point_ids = PointIdStore()
+
+        # mirrors the coordinates of the points to avoid reading them back from qt
+        self._point_coordinates = PointCoordinateBuffer()
+
+        # point lookups by coordinates, created with the first lookup and kept up to date afterwards
+        self._point_spatial_index = None
+
+        # set while the bulk methods replace all points in qt, they update ids and coordinates themselves
+        self._bulk_update_in_progress = False
 
         self.pointAdded.connect(self.id_series_added)
         self.pointReplaced.connect(self.id_series_replaced)
         self.pointRemoved.connect(self.id_series_removed)
+        self.pointsRemoved.connect(self.id_series_points_removed)
+        self.pointsReplaced.connect(self.id_series_points_replaced)
         self.swapped_signal.connect(self.id_series_swapped)
+        self.moved_signal.connect(self.id_series_moved)
 
         # blocks calls to configuration updates
         # usefull for adding and removing lot's of points at once where we don't need the GUI to keep up with our
         # updates
         self._block_qt_configuration_updates = False
 
-        self._points_id_configuration = dict()
+        # indices whose configuration changed since the last flush to qt
+        self._dirty_point_indices = set()
+        self._all_points_dirty = False
+        self._batch_updates_depth = 0
+
+        # flushes the changed configurations once per event-loop iteration
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self.flush_points_configuration)
+
+        # the configurations of the points by their id
+        self._points_id_configuration = PointConfigurationStore()
 
-    @staticmethod
     def block_qt_configuration_updates(self, block: bool = True):
         """
         sets the blocking state up configuration updates.
         usefull for adding and removing lot's of points at once where we don't need the GUI to keep up with our
             updates.
 
-        Note that after a series of blocked updates, there should be a final call to unblock this and update manually.
-        :param self:
+        Changes made while blocked are kept and flushed to qt after unblocking.
+        Prefer batch_updates(), which unblocks automatically.
         :param block:
         :return:
         """
         self._block_qt_configuration_updates = block
+        if not block:
+            self._schedule_flush_()
+
+    @contextmanager
+    def batch_updates(self):
+        """
+        Context manager which defers pushing configuration changes to qt until the outermost context is left.
+        The changed configurations are flushed once on exit, e.g.:
+
+            with series.batch_updates():
+                for idx in indices:
+                    series.setPointConfiguration(idx, conf)
+        :return:
+        """
+        self._batch_updates_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_updates_depth -= 1
+            if self._batch_updates_depth == 0:
+                self.flush_points_configuration()
 
-    @staticmethod
     def swap(self, idx1: int, idx2: int):
         """
         Swaps the index of two points and keeps their configuration.
@@ -68,6 +137,329 @@ class StaticConfigurableXYSeries:
 
         self.swapped_signal.emit(idx1, idx2)
 
+    def move(self, from_idx: int, to_idx: int):
+        """
+        Moves the point at from_idx to to_idx and shifts the points in between by one, e.g., to reorder a point.
+        All points keep their configuration.
+        Only the shifted points are replaced in qt if there are few of them, otherwise all points are replaced.
+        Triggers pointsReplaced and the moved signal once.
+        :param from_idx:
+        :param to_idx:
+        :return:
+        """
+        count = len(self._point_coordinates)
+        if not (0 <= from_idx < count and 0 <= to_idx < count):
+            raise IndexError("point index out of range: {}, {}".format(from_idx, to_idx))
+        if from_idx == to_idx:
+            return
+
+        lo, hi = min(from_idx, to_idx), max(from_idx, to_idx) + 1
+        shift = -1 if to_idx > from_idx else 1
+        x, y = self._point_coordinates.x()[lo:hi], self._point_coordinates.y()[lo:hi]
+        x, y = np.roll(x, shift), np.roll(y, shift)
+
+        if hi - lo <= self._MAX_SINGLE_POINT_REPLACES and np.isfinite(x).all() and np.isfinite(y).all():
+            with self._silent_qt_update_():
+                for i, px, py in zip(range(lo, hi), x.tolist(), y.tolist()):
+                    self.replace(i, px, py)
+        else:
+            all_x, all_y = self._point_coordinates.x().copy(), self._point_coordinates.y().copy()
+            all_x[lo:hi], all_y[lo:hi] = x, y
+
+            self._bulk_update_in_progress = True
+            try:
+                self.replaceNp(all_x, all_y)
+            finally:
+                self._bulk_update_in_progress = False
+
+        self.moved_signal.emit(from_idx, to_idx)
+
+    @staticmethod
+    def _points_to_xy_(points):
+        """
+        Returns the x- and y-coordinates of points as two float64 arrays.
+        :param points: A (N, 2) array, a tuple (x, y) of two arrays, or a list of QPointF.
+        :return:
+        """
+        if isinstance(points, tuple) and len(points) == 2:
+            x = np.asarray(points[0], dtype=np.float64).ravel()
+            y = np.asarray(points[1], dtype=np.float64).ravel()
+        elif isinstance(points, np.ndarray):
+            points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+            x, y = points[:, 0], points[:, 1]
+        else:
+            points = list(points)
+            x = np.fromiter((p.x() for p in points), dtype=np.float64, count=len(points))
+            y = np.fromiter((p.y() for p in points), dtype=np.float64, count=len(points))
+
+        if len(x) != len(y):
+            raise ValueError("got {} x-coordinates but {} y-coordinates".format(len(x), len(y)))
+
+        return x, y
+
+    def _replace_qt_points_(self):
+        """
+        Replaces all points in qt with the coordinates of the coordinate buffer.
+        Emits pointsReplaced once.
+        :return:
+        """
+        self._bulk_update_in_progress = True
+        try:
+            self.replaceNp(self._point_coordinates.x(), self._point_coordinates.y())
+        finally:
+            self._bulk_update_in_progress = False
+
+    @contextmanager
+    def _silent_qt_update_(self):
+        """
+        Context manager which blocks the signals qt triggers per point while changing points in qt, e.g., pointAdded,
+            and triggers pointsReplaced once on exit instead.
+        The ids and coordinates are not synchronized from qt inside of it.
+        :return:
+        """
+        self._bulk_update_in_progress = True
+        try:
+            blocked = self.blockSignals(True)
+            try:
+                yield
+            finally:
+                self.blockSignals(blocked)
+            self.pointsReplaced.emit()
+        finally:
+            self._bulk_update_in_progress = False
+
+    def _append_qt_points_(self, x, y):
+        """
+        Appends the points to qt without triggering pointAdded per point, e.g., to append chunk by chunk without
+            replacing all points every time.
+        Emits pointsReplaced once, like _replace_qt_points_.
+        Falls back to _replace_qt_points_ for non-finite coordinates, which qt does not append.
+        :param x:
+        :param y:
+        :return:
+        """
+        if not (np.isfinite(x).all() and np.isfinite(y).all()):
+            return self._replace_qt_points_()
+
+        with self._silent_qt_update_():
+            self.appendNp(x, y)
+
+    def append_many(self, points):
+        """
+        Appends multiple points at once.
+        Triggers the points_inserted_signal once instead of pointAdded per point.
+        :param points: A (N, 2) array, a tuple (x, y) of two arrays, or a list of QPointF.
+        :return:
+        """
+        self.insert_many(len(self._point_coordinates), points)
+
+    def insert_many(self, idx: int, points, configuration_columns=None):
+        """
+        Inserts multiple points at once, starting at idx.
+        The new points get new ids, existing points keep their id and configuration.
+        Triggers pointsReplaced and the points_inserted_signal once instead of pointAdded per point.
+        Appending at the end only pushes the new points to qt, inserting in the middle replaces all points in qt.
+        Only the configurations of the new and the shifted points are pushed to qt again.
+        :param idx:
+        :param points: A (N, 2) array, a tuple (x, y) of two arrays, or a list of QPointF.
+        :param configuration_columns: Optional (colors, sizes, flags) columns with the configurations of the new points,
+            see get_configuration_columns. They are set before the points_inserted_signal is triggered.
+        :return:
+        """
+        x, y = self._points_to_xy_(points)
+
+        if not 0 <= idx <= len(self._point_coordinates):
+            raise IndexError("point index out of range: {}".format(idx))
+        if len(x) == 0:
+            return
+
+        append = idx == len(self._point_coordinates)
+        self._point_coordinates.insert(idx, x, y)
+        new_ids = self._point_ids.insert(idx, len(x))
+        if self._point_spatial_index is not None:
+            self._point_spatial_index.set(new_ids, x, y)
+
+        if configuration_columns is not None:
+            self._points_id_configuration.set_columns(new_ids, *configuration_columns)
+
+        if append:
+            self._append_qt_points_(x, y)
+        else:
+            self._replace_qt_points_()
+        self.update_points_configuration(range(idx, len(self._point_ids)))
+
+        self.points_inserted_signal.emit(idx, len(x))
+
+    def remove_range(self, idx: int, count: int):
+        """
+        Removes count points starting at idx and deletes their configurations.
+        Triggers pointsRemoved once instead of pointRemoved per point.
+        :param idx:
+        :param count:
+        :return:
+        """
+        if count < 0 or not 0 <= idx <= len(self._point_coordinates) - count:
+            raise IndexError("point range out of range: {}, {}".format(idx, count))
+        if count == 0:
+            return
+
+        self.removePoints(idx, count)
+
+    def replace_many(self, idx: int, points):
+        """
+        Replaces the coordinates of multiple points at once, starting at idx.
+        The points keep their id and configuration.
+        Triggers pointsReplaced and the points_replaced_signal once instead of pointReplaced per point.
+        :param idx:
+        :param points: A (N, 2) array, a tuple (x, y) of two arrays, or a list of QPointF.
+        :return:
+        """
+        x, y = self._points_to_xy_(points)
+
+        self._point_coordinates.replace(idx, x, y)
+        if self._point_spatial_index is not None:
+            self._point_spatial_index.set(self._point_ids.ids()[idx:idx + len(x)], x, y)
+
+        self._replace_qt_points_()
+
+        self.points_replaced_signal.emit(idx, len(x))
+
+    def reorder(self, order, points=None):
+        """
+        Rearranges all points at once, s.t., the new point at index i is the old point at index order[i].
+        The points keep their id and configuration, e.g., to sort points after moving many of them.
+        Triggers pointsReplaced and the points_reordered_signal once.
+        :param order: A permutation of all indices.
+        :param points: Optional new coordinates of all points in the new order.
+            A (N, 2) array, a tuple (x, y) of two arrays, or a list of QPointF.
+        :return:
+        """
+        order = np.asarray(order, dtype=np.int64)
+        count = len(self._point_coordinates)
+
+        if len(order) != count or not np.array_equal(np.sort(order), np.arange(count)):
+            raise ValueError("order is not a permutation of the {} point indices".format(count))
+
+        if points is None:
+            x, y = self._point_coordinates.x()[order], self._point_coordinates.y()[order]
+        else:
+            x, y = self._points_to_xy_(points)
+            if len(x) != count:
+                raise ValueError("got {} points, expected {}".format(len(x), count))
+
+        self._point_ids.permute(order)
+        self._point_coordinates.set(x, y)
+        if self._point_spatial_index is not None and points is not None:
+            self._point_spatial_index.set(self._point_ids.ids(), x, y)
+
+        self._replace_qt_points_()
+        self.update_points_configuration()
+
+        self.points_reordered_signal.emit(order)
+
+    def get_configuration_columns(self):
+        """
+        Returns the configurations of all points ordered by index as columns.
+        :return: (uint32 ARGB colors, float32 sizes, uint8 flags), see PointConfigurationStore for the flags.
+        """
+        return self._points_id_configuration.gather(self._point_ids.ids())
+
+    def set_configuration_columns(self, colors, sizes, flags):
+        """
+        Replaces the configurations of all points ordered by index with columns, see get_configuration_columns.
+        The points keep their ids.
+        :param colors: uint32 ARGB colors.
+        :param sizes: float32 sizes.
+        :param flags: uint8 flags, see PointConfigurationStore.
+        :return:
+        """
+        self._points_id_configuration.set_columns(self._point_ids.ids(), colors, sizes, flags)
+        self.update_points_configuration()
+
+    def get_extra_configurations(self):
+        """
+        Returns the configuration entries that are not in get_configuration_columns, e.g., custom keys.
+        :return: A dict of point index -> configuration dict, only for points that have such entries.
+        """
+        ids = self._point_ids.ids()
+        return {self.get_idx_of_point_id(point_id): conf
+                for point_id, conf in self._points_id_configuration.gather_extra(ids).items()}
+
+    def set_points_from_columns(self, x, y, colors=None, sizes=None, flags=None):
+        """
+        Replaces all points and their configurations at once.
+        Triggers pointsRemoved, pointsReplaced, and the points_inserted_signal once each.
+        :param x:
+        :param y:
+        :param colors: Optional uint32 ARGB colors.
+        :param sizes: Optional float32 sizes.
+        :param flags: Optional uint8 flags, see PointConfigurationStore. Required to use colors and sizes.
+        :return:
+        """
+        configuration_columns = None
+        if flags is not None:
+            configuration_columns = (
+                np.zeros(len(x), dtype=np.uint32) if colors is None else colors,
+                np.zeros(len(x), dtype=np.float32) if sizes is None else sizes,
+                flags)
+
+        with self.batch_updates():
+            self.remove_range(0, len(self._point_coordinates))
+            self.insert_many(0, (x, y), configuration_columns)
+
+    def save_binary(self, file):
+        """
+        Saves all points and their qt compatible configurations in the binary format of binary_point_format.
+        :param file: A path or a binary file object.
+        :return:
+        """
+        colors, sizes, flags = self.get_configuration_columns()
+        write_point_columns(file, self._point_coordinates.x(), self._point_coordinates.y(), colors, sizes, flags)
+
+    def load_binary(self, file, mmap: bool = True):
+        """
+        Replaces all points and their configurations with the ones saved with save_binary.
+        :param file: A path or a binary file object.
+        :param mmap: Memory-maps the file instead of reading it, if file is a path.
+        :return:
+        """
+        columns = read_point_columns(file, mmap=mmap)
+        self.set_points_from_columns(columns["x"], columns["y"], columns["colors"], columns["sizes"],
+                                     columns["flags"])
+
+    def find_point_idx_near(self, x: float, y: float, tolerance_x: float = 0.0, tolerance_y: float = None) -> int:
+        """
+        Returns the index of the point nearest to (x, y) within the tolerance, see PointSpatialIndex.nearest.
+        The first lookup builds the spatial index, which is updated incrementally afterwards.
+        Returns -1 if no point is within the tolerance.
+        :param x:
+        :param y:
+        :param tolerance_x:
+        :param tolerance_y: Defaults to tolerance_x.
+        :return:
+        """
+        if self._point_spatial_index is None:
+            self._point_spatial_index = PointSpatialIndex()
+            self._point_spatial_index.reset(self._point_ids.ids(), self._point_coordinates.x(),
+                                            self._point_coordinates.y())
+
+        point_id = self._point_spatial_index.nearest(x, y, tolerance_x, tolerance_y)
+        return -1 if point_id == -1 else self._point_ids.index_of(point_id)
+
+    def get_point_ids(self):
+        """
+        Returns a read-only view of the ids of all points ordered by index.
+        :return:
+        """
+        return self._point_ids.ids()
+
+    def get_points_as_arrays(self):
+        """
+        Returns read-only views of the x- and y-coordinates of all points ordered by index.
+        :return: (x, y)
+        """
+        return self._point_coordinates.x(), self._point_coordinates.y()
+
     @staticmethod
     def _parse_point_configuration_to_json_comp_dict_(conf: dict):
         json_conf = dict()
@@ -87,31 +479,65 @@ class StaticConfigurableXYSeries:
 
         return json_conf
 
-    @staticmethod
     def as_json_compatible_list(self):
         """
         Returns a list of points that can be directly passed to json.dump(s).
         :return:
         """
-        points = []
-        for idx in range(self.count()):
-            p = self.at(idx)
-            conf = self.get_points_configuration_with_limited_keys(
-                self.get_configuration_for_point_at_idx(idx))
+        colors, sizes, flags = self.get_configuration_columns()
+        return columns_to_json_points(self._point_coordinates.x(), self._point_coordinates.y(), colors, sizes, flags)
 
-            o = {
-                "x": p.x(),
-                "y": p.y(),
-                "configuration": StaticConfigurableXYSeries._parse_point_configuration_to_json_comp_dict_(conf)
-            }
+    def iter_json_compatible_chunks(self, chunk_size: int = 10000):
+        """
+        Yields the points like as_json_compatible_list, but in lists of at most chunk_size points.
+        :param chunk_size:
+        :return:
+        """
+        ids = self._point_ids.ids().copy()
+        x, y = self._point_coordinates.x().copy(), self._point_coordinates.y().copy()
 
-            points.append(o)
+        for start in range(0, len(ids), chunk_size):
+            colors, sizes, flags = self._points_id_configuration.gather(ids[start:start + chunk_size])
+            yield columns_to_json_points(x[start:start + chunk_size], y[start:start + chunk_size],
+                                         colors, sizes, flags)
 
-        try:
-            json.dumps(points)
-        except Exception as e:
-            raise e
-        return points
+    def save_json(self, file, chunk_size: int = 10000):
+        """
+        Writes the points as json document {"points": as_json_compatible_list()} chunk by chunk.
+        :param file: A path or a text file object.
+        :param chunk_size:
+        :return:
+        """
+        write_json_points(file, self.iter_json_compatible_chunks(chunk_size))
+
+    def load_json(self, file, chunk_size: int = 10000):
+        """
+        Replaces all points and their configurations with the ones of the json document written by save_json.
+        Reads the points chunk by chunk into the coordinate buffer and the configuration store and pushes them to qt
+            once at the end.
+        Triggers pointsRemoved, pointsReplaced, and the points_inserted_signal once each.
+        :param file: A path or a text file object.
+        :param chunk_size:
+        :return:
+        """
+        with self.batch_updates():
+            self.remove_range(0, len(self._point_coordinates))
+            try:
+                for batch in iter_json_point_batches(file, chunk_size):
+                    columns = json_points_to_columns(batch)
+                    idx = len(self._point_coordinates)
+                    self._point_coordinates.insert(idx, columns["x"], columns["y"])
+                    new_ids = self._point_ids.insert(idx, len(columns["x"]))
+                    if self._point_spatial_index is not None:
+                        self._point_spatial_index.set(new_ids, columns["x"], columns["y"])
+                    self._points_id_configuration.set_columns(new_ids, columns["colors"], columns["sizes"],
+                                                              columns["flags"])
+            finally:
+                # keeps qt in sync with the points read so far if the document is broken
+                self._replace_qt_points_()
+                self.update_points_configuration()
+
+            self.points_inserted_signal.emit(0, len(self._point_coordinates))
 
     @staticmethod
     def json_compatible_list_to_regular_point_list(points):
@@ -123,7 +549,7 @@ class StaticConfigurableXYSeries:
         rp = []
 
         for p in points:
-            p["configuration"] = StaticConfigurableXYSeries._parse_json_comp_dict_to_point_configuration_(
+            p["configuration"] = ConfigurableXYSeriesMixin._parse_json_comp_dict_to_point_configuration_(
                 p["configuration"])
             rp.append(p.copy())
 
@@ -154,12 +580,10 @@ class StaticConfigurableXYSeries:
 
         return conf
 
-    @staticmethod
     def setPointConfiguration(self, index: int,
                               configuration: Dict[PySide6.QtCharts.QXYSeries.PointConfiguration, Any]) -> None:
         self.set_id_configuration_for_point_at_idx(index, configuration)
 
-    @staticmethod
     def setPointConfigurationKeyVal(self, index: int, key, val):
         """
         Sets only key and value of for the point at given index.
@@ -173,7 +597,6 @@ class StaticConfigurableXYSeries:
         conf[key] = val
         self.set_id_configuration_for_point_at_idx(index, conf)
 
-    @staticmethod
     def setPointsConfiguration(self, pointsConfiguration: Dict[
         int, Dict[PySide6.QtCharts.QXYSeries.PointConfiguration, Any]]) -> None:
         """
@@ -183,42 +606,36 @@ class StaticConfigurableXYSeries:
         :return:
         """
         if len(pointsConfiguration) == 0:
-            self._points_id_configuration = {}
+            self._points_id_configuration.clear()
             self.update_points_configuration()
 
         for idx in pointsConfiguration:
             self.setPointConfiguration(idx, pointsConfiguration[idx])
 
-    @staticmethod
     def clearPointConfiguration(self, index: int, key=None) -> None:
-        if self.get_id_of_point_idx(index) in self._points_id_configuration:
-            del self._points_id_configuration[self.get_id_of_point_idx(index)]
+        self._points_id_configuration.delete(self.get_id_of_point_idx(index))
         if key is None:
-            super(self.__class__, self).clearPointConfiguration(index)
+            super().clearPointConfiguration(index)
         else:
-            super(self.__class__, self).clearPointConfiguration(index, key)
+            super().clearPointConfiguration(index, key)
+        self.configuration_changed_signal.emit()
 
-    @staticmethod
     def clearPointsConfiguration(self, key=None) -> None:
+        self._points_id_configuration.clear(key)
         if key is None:
-            self._points_id_configuration = dict()
-            super(self.__class__, self).clearPointsConfiguration()
+            super().clearPointsConfiguration()
         else:
-            for idx in self._points_id_configuration:
-                if key in self._points_id_configuration[idx]:
-                    del self._points_id_configuration[idx][key]
-            super(self.__class__, self).clearPointsConfiguration(key)
+            super().clearPointsConfiguration(key)
+        self.configuration_changed_signal.emit()
 
-    @staticmethod
     def get_id_of_point_idx(self, idx: int):
         """
         Returns the id of the point idx.
         :param idx:
         :return:
         """
-        return int(self._point_id_series.at(idx).y())
+        return self._point_ids.id_at(idx)
 
-    @staticmethod
     def get_idx_of_point_id(self, point_id: int):
         """
         Returns the current index of the point with given id.
@@ -226,12 +643,8 @@ class StaticConfigurableXYSeries:
         :param point_id:
         :return:
         """
-        for i in range(self.count()):
-            if int(point_id) == self.get_id_of_point_idx(i):
-                return i
-        return -1
+        return self._point_ids.index_of(point_id)
 
-    @staticmethod
     def set_id_configuration_for_point_at_idx(self, idx: int, conf: dict):
         """
         Sets the configuration for the point at idx based on its id.
@@ -239,15 +652,26 @@ class StaticConfigurableXYSeries:
         :param idx:
         :return:
         """
-        if self.get_id_of_point_idx(idx) in self._points_id_configuration:
-            self._points_id_configuration[self.get_id_of_point_idx(idx)].update(conf.copy())
-        else:
-            self._points_id_configuration[self.get_id_of_point_idx(idx)] = conf.copy()
+        self._points_id_configuration.update(self.get_id_of_point_idx(idx), conf)
         self.update_points_configuration([idx])
 
-    @staticmethod
+    def set_ids_configuration_key_val(self, ids, key, values):
+        """
+        Sets key to values for all points with the given ids at once, e.g., the color of 10k points.
+        :param ids:
+        :param key: a qt point configuration key.
+        :param values: a single value for all ids or one value per id.
+            Colors are QColors or uint32 ARGB values, sizes are floats, and visibilities are bools.
+        :return:
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        self._points_id_configuration.set_key_for_ids(ids, key, values)
+
+        indices = [self.get_idx_of_point_id(point_id) for point_id in ids.tolist()]
+        self.update_points_configuration([i for i in indices if i != -1])
+
     def get_configuration_for_point_at_idx(self, idx: int):
-        return self._points_id_configuration[self.get_id_of_point_idx(idx)].copy()
+        return self._points_id_configuration.get(self.get_id_of_point_idx(idx))
 
     @staticmethod
     def get_qt_point_configuration_keys():
@@ -258,7 +682,6 @@ class StaticConfigurableXYSeries:
             QXYSeries.PointConfiguration.LabelVisibility
         ]
 
-    @staticmethod
     def get_points_configuration_with_limited_keys(self, conf: dict):
         d = dict()
         for k in self.get_qt_point_configuration_keys():
@@ -266,85 +689,174 @@ class StaticConfigurableXYSeries:
                 d.update({k: conf[k]})
         return d
 
-    @staticmethod
     def update_points_configuration(self, indices=None):
         """
-        Updates the configuration of scatterseries with the current points_id_configuration.
+        Marks the configuration of the given indices as changed.
+        The changes are pushed to qt once per event-loop iteration, or when leaving batch_updates().
+        Triggers configuration_changed_signal.
         :param indices: The indices to be updated. If not specified, updates all indices.
         :return:
         """
-        if self._block_qt_configuration_updates:
+        if not self._all_points_dirty:
+            if indices is None:
+                self._all_points_dirty = True
+                self._dirty_point_indices = set()
+            else:
+                self._dirty_point_indices.update(indices)
+                if len(self._dirty_point_indices) > len(self._point_ids) // 2:
+                    self._all_points_dirty = True
+                    self._dirty_point_indices = set()
+
+        self._schedule_flush_()
+        self.configuration_changed_signal.emit()
+
+    def _schedule_flush_(self):
+        if self._block_qt_configuration_updates or self._batch_updates_depth > 0:
             return
+        if (self._all_points_dirty or self._dirty_point_indices) and not self._flush_timer.isActive():
+            self._flush_timer.start()
 
-        update_batch = False
-        if indices is None:
-            update_batch = True
-            indices = range(self._point_id_series.count())
+    @Slot()
+    def flush_points_configuration(self):
+        """
+        Pushes the configurations of all changed indices to qt now.
+        Does nothing while configuration updates are blocked or inside of batch_updates().
+        :return:
+        """
+        if self._block_qt_configuration_updates or self._batch_updates_depth > 0:
+            return
+
+        self._flush_timer.stop()
 
-        conf = {}
+        count = len(self._point_ids)
+        keys = self.get_qt_point_configuration_keys()
 
-        for i in indices:
-            if self.get_id_of_point_idx(i) not in self._points_id_configuration:
-                continue
+        if self._all_points_dirty:
+            indices = np.arange(count)
+        else:
+            indices = np.fromiter((i for i in self._dirty_point_indices if i < count), dtype=np.int64)
+            indices.sort()
+
+        update_all = self._all_points_dirty
+        self._all_points_dirty = False
+        self._dirty_point_indices = set()
+
+        ids = self._point_ids.ids()[indices]
+        configured = self._points_id_configuration.configured(ids)
+
+        if not update_all and len(indices) <= self._MAX_SINGLE_CONFIGURATION_UPDATES:
+            for i, point_id, is_configured in zip(indices.tolist(), ids.tolist(), configured.tolist()):
+                if is_configured:
+                    super().setPointConfiguration(
+                        i, self._points_id_configuration.get(point_id, keys))
+                else:
+                    super().clearPointConfiguration(i)
+            return
 
-            conf_i = self.get_points_configuration_with_limited_keys(
-                self._points_id_configuration[self.get_id_of_point_idx(i)])
+        conf = {} if update_all else self.pointsConfiguration()
 
-            if not update_batch:
-                super(self.__class__, self).setPointConfiguration(i, conf_i)
-            else:
-                conf.update({i: conf_i})
+        for i in indices[~configured].tolist():
+            conf.pop(i, None)
+        conf.update(zip(indices[configured].tolist(), self._points_id_configuration.get_many(ids[configured], keys)))
 
-        if update_batch:
-            super(self.__class__, self).setPointsConfiguration(conf)
+        super().setPointsConfiguration(conf)
 
-    @staticmethod
     def get_points_id_configuration(self):
         """
         Returns the current points_id_configuration for all point of scatterseries.
-        The id's are the point's id's from point_id_series.
+        The id's are the point's id's from the point id store.
         :return:
         """
-        return self._points_id_configuration.copy()
+        return self._points_id_configuration.to_dict()
 
-    @staticmethod
     def set_points_id_configuration(self, conf: dict):
-        self._points_id_configuration = conf.copy()
+        self._points_id_configuration.set_from_dict(conf)
         self.update_points_configuration()
 
-    @staticmethod
+    @Slot(int)
     def id_series_added(self, idx: int):
         p = self.at(idx)
-        p.setY(self._next_point_id)
-
-        self._point_id_series.insert(idx, p)
+        self._point_coordinates.insert(idx, p.x(), p.y())
+        point_id = self._point_ids.insert(idx)
+        if self._point_spatial_index is not None:
+            self._point_spatial_index.set(point_id, p.x(), p.y())
+        self.update_points_configuration(range(idx, len(self._point_ids)))
 
-        self._next_point_id += 1
-        self.update_points_configuration(range(idx, self._point_id_series.count()))
-
-    @staticmethod
+    @Slot(int)
     def id_series_removed(self, idx: int):
         self.clearPointConfiguration(idx)
-        self._point_id_series.remove(idx)
-        self.update_points_configuration(range(idx, self._point_id_series.count()))
+        self._point_coordinates.remove(idx)
+        point_id = self._point_ids.remove(idx)
+        if self._point_spatial_index is not None:
+            self._point_spatial_index.remove(point_id)
+        self.update_points_configuration(range(idx, len(self._point_ids)))
 
-    @staticmethod
+    @Slot(int)
     def id_series_replaced(self, idx: int):
         # replacing does not change id, we only change values here.
         # to change id, implement it when replacing
-        # self._point_id_series.replace(idx, self._point_id_series.at(idx))
-        # self.update_points_configuration()
-        pass
+        p = self.at(idx)
+        self._point_coordinates.replace(idx, p.x(), p.y())
+        if self._point_spatial_index is not None:
+            self._point_spatial_index.set(self._point_ids.id_at(idx), p.x(), p.y())
 
-    @staticmethod
+    @Slot(int, int)
+    def id_series_points_removed(self, idx: int, count: int):
+        """
+        Removes the ids, coordinates, and configurations of count points starting at idx.
+        :param idx:
+        :param count:
+        :return:
+        """
+        removed_ids = self._point_ids.remove(idx, count)
+        self._points_id_configuration.delete_many(removed_ids)
+        self._point_coordinates.remove(idx, count)
+        if self._point_spatial_index is not None:
+            self._point_spatial_index.remove(removed_ids)
+        self.update_points_configuration()
+
+    @Slot()
+    def id_series_points_replaced(self):
+        """
+        Synchronizes coordinates after all points were replaced from outside, e.g., with replace(list).
+        If the number of points changed, all points get new ids and lose their configuration.
+        :return:
+        """
+        if self._bulk_update_in_progress:
+            return
+
+        x, y = self._points_to_xy_(self.points())
+
+        if len(x) != len(self._point_ids):
+            self._point_ids.remove(0, len(self._point_ids))
+            self._point_ids.insert(0, len(x))
+            self._points_id_configuration.clear()
+
+        self._point_coordinates.set(x, y)
+        if self._point_spatial_index is not None:
+            self._point_spatial_index.reset(self._point_ids.ids(), x, y)
+        self.update_points_configuration()
+
+    @Slot(int, int)
     def id_series_swapped(self, idx1: int, idx2: int):
         """
-        Swappes the id_series points.
+        Swappes the ids of the points.
         :param idx1:
         :param idx2:
         :return:
         """
-        tmp = self._point_id_series.at(idx1)
-        self._point_id_series.replace(idx1, self._point_id_series.at(idx2))
-        self._point_id_series.replace(idx2, tmp)
+        self._point_ids.swap(idx1, idx2)
+        self._point_coordinates.swap(idx1, idx2)
         self.update_points_configuration([idx1, idx2])
+
+    @Slot(int, int)
+    def id_series_moved(self, from_idx: int, to_idx: int):
+        """
+        Moves the id of the point at from_idx to to_idx and shifts the ids in between.
+        :param from_idx:
+        :param to_idx:
+        :return:
+        """
+        self._point_ids.move(from_idx, to_idx)
+        self._point_coordinates.move(from_idx, to_idx)
+        self.update_points_configuration(range(min(from_idx, to_idx), max(from_idx, to_idx) + 1))
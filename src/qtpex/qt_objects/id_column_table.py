@@ -0,0 +1,200 @@
+from typing import Dict
+
+import numpy as np
+
+
+class IdColumnTable:
+    """
+    Stores columns of values by id in dense slots, e.g., the configurations or coordinates of points.
+
+    The slots are sorted by id, thus, ids are looked up directly if the ids of the slots are contiguous and with a
+        binary search otherwise. Ids from a PointIdStore only increase, thus, new ids are usually appended.
+    Released slots are compacted away once fewer than half of the slots are live, s.t., the memory and passes over all
+        slots grow with the number of live ids and not with the number of ids ever allocated.
+    Compacting or inserting ids in the middle moves the slots, thus, do not keep slots across add and release.
+    """
+    # tables with fewer slots are not compacted
+    MIN_COMPACT_SIZE = 64
+
+    def __init__(self, dtypes: Dict[str, np.dtype], capacity: int = 16):
+        capacity = max(int(capacity), 1)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._live = np.zeros(capacity, dtype=bool)
+        self._columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+        self._size = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """
+        Returns the column name by slot. Writes to it are kept.
+        :param name:
+        :return:
+        """
+        return self._columns[name]
+
+    @property
+    def size(self) -> int:
+        """
+        The number of used slots, live or released.
+        :return:
+        """
+        return self._size
+
+    def live_slots(self) -> np.ndarray:
+        return np.flatnonzero(self._live[:self._size])
+
+    def ids_of(self, slots) -> np.ndarray:
+        return self._ids[slots]
+
+    def slot(self, point_id: int) -> int:
+        """
+        Returns the slot of point_id, -1 if it is not in the table. Faster than slots for a single id.
+        :param point_id:
+        :return:
+        """
+        size = self._size
+        if size == 0:
+            return -1
+
+        point_id, first = int(point_id), int(self._ids[0])
+        if int(self._ids[size - 1]) - first + 1 == size:
+            slot = point_id - first
+            if not 0 <= slot < size:
+                return -1
+        else:
+            slot = int(np.searchsorted(self._ids[:size], point_id))
+            if slot >= size or int(self._ids[slot]) != point_id:
+                return -1
+        return slot if self._live[slot] else -1
+
+    def slots(self, ids) -> np.ndarray:
+        """
+        Returns the slots of the given ids, -1 for ids that are not in the table.
+        :param ids:
+        :return:
+        """
+        slots, found = self._find_(ids)
+        if found.all():
+            return slots
+        return np.where(found, slots, -1)
+
+    def add(self, ids) -> np.ndarray:
+        """
+        Returns the slots of the given ids and adds the ids that are not in the table with zeros in all columns.
+        :param ids:
+        :return:
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        slots, found = self._find_(ids, live_only=False)
+        if found.all() and self._live[slots].all():
+            return slots
+
+        revived = np.unique(slots[found][~self._live[slots[found]]])
+        if len(revived) > 0:
+            self._live[revived] = True
+            for column in self._columns.values():
+                column[revived] = 0
+            self._count += len(revived)
+
+        new_ids = np.unique(ids[~found])
+        if len(new_ids) == 0:
+            return slots
+
+        size = self._size
+        self._reserve_(size + len(new_ids))
+        self._ids[size:size + len(new_ids)] = new_ids
+        self._live[size:size + len(new_ids)] = True
+        for column in self._columns.values():
+            column[size:size + len(new_ids)] = 0
+        self._size += len(new_ids)
+        self._count += len(new_ids)
+
+        if size > 0 and new_ids[0] < self._ids[size - 1]:
+            self._permute_(np.argsort(self._ids[:self._size], kind="stable"))
+        return self.slots(ids)
+
+    def release(self, ids) -> int:
+        """
+        Removes the given ids from the table if they are in it.
+        :param ids:
+        :return: The number of removed ids.
+        """
+        slots = self.slots(ids)
+        slots = np.unique(slots[slots >= 0])
+        if len(slots) == 0:
+            return 0
+
+        self._live[slots] = False
+        self._count -= len(slots)
+
+        if self._size > self.MIN_COMPACT_SIZE and self._count < self._size // 2:
+            self._permute_(self.live_slots())
+        return len(slots)
+
+    def clear(self):
+        self._live[:self._size] = False
+        self._size = 0
+        self._count = 0
+
+    def _find_(self, ids, live_only: bool = True):
+        """
+        Returns the slots of the given ids and a mask which of them were found.
+        :param ids:
+        :param live_only: Whether released slots count as not found.
+        :return:
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        size = self._size
+        if size == 0:
+            return np.zeros(ids.shape, dtype=np.int64), np.zeros(ids.shape, dtype=bool)
+
+        first = self._ids[0]
+        if self._ids[size - 1] - first + 1 == size:
+            slots = ids - first
+            if len(slots) > 0 and slots.min() >= 0 and slots.max() < size:
+                return slots, self._live[slots] if live_only else np.ones(ids.shape, dtype=bool)
+            found = (slots >= 0) & (slots < size)
+        else:
+            slots = np.searchsorted(self._ids[:size], ids)
+            found = slots < size
+            found[found] = self._ids[slots[found]] == ids[found]
+
+        if live_only:
+            found[found] = self._live[slots[found]]
+        slots[~found] = 0
+        return slots, found
+
+    def _permute_(self, order: np.ndarray):
+        """
+        Keeps the slots in order, e.g., the live slots to compact the table.
+        :param order:
+        :return:
+        """
+        capacity = max(2 * len(order), 16)
+        for name in ("_ids", "_live"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(order)] = old[order]
+            setattr(self, name, new)
+        for name, old in self._columns.items():
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(order)] = old[order]
+            self._columns[name] = new
+        self._size = len(order)
+
+    def _reserve_(self, capacity: int):
+        if capacity <= len(self._ids):
+            return
+        capacity = max(capacity, 2 * len(self._ids))
+        for name in ("_ids", "_live"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        for name, old in self._columns.items():
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            self._columns[name] = new
@@ -0,0 +1,198 @@
+"""
+Streaming import and export of points in the JSON format of the configurable series, i.e.,
+    {"points": [{"x": ..., "y": ..., "configuration": {"QXYSeries.PointConfiguration.Color": "#aarrggbb", ...}}, ...]}
+
+Points are processed in chunks, thus, the peak memory stays bounded by the chunk size instead of the number of points.
+"""
+import json
+import os
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+from PySide6.QtGui import QColor
+
+from qtpex.qt_objects.point_configuration_store import PointConfigurationStore
+
+
+COLOR_KEY = "QXYSeries.PointConfiguration.Color"
+SIZE_KEY = "QXYSeries.PointConfiguration.Size"
+VISIBILITY_KEY = "QXYSeries.PointConfiguration.Visibility"
+LABEL_VISIBILITY_KEY = "QXYSeries.PointConfiguration.LabelVisibility"
+
+
+def columns_to_json_points(x, y, colors, sizes, flags) -> List[dict]:
+    """
+    Returns the json compatible points of the given columns, see PointConfigurationStore for the flags.
+    :return:
+    """
+    points = []
+    for px, py, c, s, f in zip(np.asarray(x).tolist(), np.asarray(y).tolist(), np.asarray(colors).tolist(),
+                               np.asarray(sizes).tolist(), np.asarray(flags).tolist()):
+        conf = dict()
+        if f & PointConfigurationStore.HAS_COLOR:
+            conf[COLOR_KEY] = "#{:08x}".format(c)
+        if f & PointConfigurationStore.HAS_SIZE:
+            conf[SIZE_KEY] = s
+        if f & PointConfigurationStore.HAS_VISIBILITY:
+            conf[VISIBILITY_KEY] = bool(f & PointConfigurationStore.VISIBLE)
+        if f & PointConfigurationStore.HAS_LABEL_VISIBILITY:
+            conf[LABEL_VISIBILITY_KEY] = bool(f & PointConfigurationStore.LABEL_VISIBLE)
+
+        points.append({"x": px, "y": py, "configuration": conf})
+    return points
+
+
+def json_points_to_columns(points: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    Returns the columns x, y, colors, sizes, and flags of the json compatible points.
+    :param points:
+    :return:
+    """
+    count = len(points)
+    columns = dict(
+        x=np.fromiter((p["x"] for p in points), dtype=np.float64, count=count),
+        y=np.fromiter((p["y"] for p in points), dtype=np.float64, count=count),
+        colors=np.zeros(count, dtype=np.uint32),
+        sizes=np.zeros(count, dtype=np.float32),
+        flags=np.zeros(count, dtype=np.uint8),
+    )
+
+    colors, sizes, flags = columns["colors"], columns["sizes"], columns["flags"]
+
+    for i, p in enumerate(points):
+        conf = p.get("configuration", dict())
+        f = PointConfigurationStore.CONFIGURED
+
+        if COLOR_KEY in conf:
+            c = conf[COLOR_KEY]
+            colors[i] = int(c[1:], 16) if len(c) == 9 and c[0] == "#" else QColor(c).rgba()
+            f |= PointConfigurationStore.HAS_COLOR
+        if SIZE_KEY in conf:
+            sizes[i] = conf[SIZE_KEY]
+            f |= PointConfigurationStore.HAS_SIZE
+        if VISIBILITY_KEY in conf:
+            f |= PointConfigurationStore.HAS_VISIBILITY
+            if conf[VISIBILITY_KEY]:
+                f |= PointConfigurationStore.VISIBLE
+        if LABEL_VISIBILITY_KEY in conf:
+            f |= PointConfigurationStore.HAS_LABEL_VISIBILITY
+            if conf[LABEL_VISIBILITY_KEY]:
+                f |= PointConfigurationStore.LABEL_VISIBLE
+
+        flags[i] = f
+
+    return columns
+
+
+def iter_json_document(batches: Iterable[List[dict]]) -> Iterator[str]:
+    """
+    Yields the json document of the batches of json compatible points piece by piece.
+    The concatenation equals json.dumps({"points": [point for batch in batches for point in batch]}).
+    :param batches:
+    :return:
+    """
+    yield '{"points": ['
+    first = True
+    for batch in batches:
+        if len(batch) == 0:
+            continue
+        yield ("" if first else ", ") + ", ".join(json.dumps(p) for p in batch)
+        first = False
+    yield ']}'
+
+
+def write_json_points(file, batches: Iterable[List[dict]]):
+    """
+    Writes the batches of json compatible points as one json document to file.
+    :param file: A path or a text file object.
+    :param batches:
+    :return:
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "w") as f:
+            return write_json_points(f, batches)
+
+    for piece in iter_json_document(batches):
+        file.write(piece)
+
+
+def iter_json_point_batches(file, chunk_size: int = 10000, read_size: int = 1 << 16) -> Iterator[List[dict]]:
+    """
+    Reads the json compatible points of a json document incrementally and yields them in batches of chunk_size.
+    Only the "points" list of the document is read.
+    :param file: A path or a text file object.
+    :param chunk_size:
+    :param read_size: The number of characters read from file at once.
+    :return:
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "r") as f:
+            yield from iter_json_point_batches(f, chunk_size, read_size)
+        return
+
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def read_more():
+        nonlocal buffer, pos, eof
+        data = file.read(read_size)
+        if not data:
+            eof = True
+        buffer = buffer[pos:] + data
+        pos = 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            read_more()
+
+    # find the start of the points list
+    while True:
+        key = buffer.find('"points"', pos)
+        if key != -1:
+            pos = key + len('"points"')
+            break
+        if eof:
+            raise ValueError("no points in json document")
+        pos = max(pos, len(buffer) - len('"points"'))
+        read_more()
+
+    for expected in ":[":
+        skip_whitespace()
+        if pos >= len(buffer) or buffer[pos] != expected:
+            raise ValueError("expected '{}' after \"points\"".format(expected))
+        pos += 1
+
+    batch = []
+    while True:
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise ValueError("unexpected end of json document")
+        if buffer[pos] == "]":
+            break
+        if buffer[pos] == ",":
+            pos += 1
+            continue
+
+        try:
+            point, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            read_more()
+            continue
+
+        pos = end
+        batch.append(point)
+        if len(batch) >= chunk_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
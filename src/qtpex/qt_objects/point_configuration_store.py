@@ -0,0 +1,312 @@
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+from PySide6.QtCharts import QXYSeries
+from PySide6.QtGui import QColor
+
+from qtpex.qt_objects.id_column_table import IdColumnTable
+
+
+class PointConfigurationStore:
+    """
+    Stores the configurations of points by their id in a columnar layout.
+
+    The qt point configuration keys are stored in a uint32 ARGB color array, a float32 size array and an uint8 bitmask
+        that holds which keys are set as well as the visibility and label visibility values, i.e., 9 bytes per id.
+    Keys that are not qt point configuration keys are kept in a sparse dict.
+
+    The columns are kept in dense slots of an IdColumnTable, thus, they grow with the number of configured ids and not
+        with the largest id.
+    """
+    CONFIGURED = 1 << 0
+    HAS_COLOR = 1 << 1
+    HAS_SIZE = 1 << 2
+    HAS_VISIBILITY = 1 << 3
+    HAS_LABEL_VISIBILITY = 1 << 4
+    VISIBLE = 1 << 5
+    LABEL_VISIBLE = 1 << 6
+
+    _KEY_FLAGS = {
+        QXYSeries.PointConfiguration.Color: HAS_COLOR,
+        QXYSeries.PointConfiguration.Size: HAS_SIZE,
+        QXYSeries.PointConfiguration.Visibility: HAS_VISIBILITY | VISIBLE,
+        QXYSeries.PointConfiguration.LabelVisibility: HAS_LABEL_VISIBILITY | LABEL_VISIBLE,
+    }
+
+    def __init__(self, capacity: int = 16):
+        self._table = IdColumnTable({"colors": np.uint32, "sizes": np.float32, "flags": np.uint8}, capacity)
+
+        # configuration keys which are not qt point configuration keys, by id
+        self._extra = dict()
+
+    def __contains__(self, point_id) -> bool:
+        slot = self._table.slot(point_id)
+        return slot >= 0 and bool(self._table["flags"][slot] & self.CONFIGURED)
+
+    def __len__(self):
+        return int(np.count_nonzero(self._table["flags"][self._table.live_slots()] & self.CONFIGURED))
+
+    def ids(self) -> np.ndarray:
+        """
+        Returns the ids that have a configuration.
+        :return:
+        """
+        slots = self._table.live_slots()
+        return self._table.ids_of(slots[(self._table["flags"][slots] & self.CONFIGURED) != 0])
+
+    def configured(self, ids) -> np.ndarray:
+        """
+        Returns a boolean mask which of the given ids have a configuration.
+        :param ids:
+        :return:
+        """
+        slots = self._table.slots(ids)
+        mask = slots >= 0
+        mask[mask] = (self._table["flags"][slots[mask]] & self.CONFIGURED) != 0
+        return mask
+
+    def get(self, point_id: int, keys: Iterable = None) -> Dict[Any, Any]:
+        """
+        Returns the configuration of point_id as a new dict.
+        Raises a KeyError if point_id has no configuration.
+        :param point_id:
+        :param keys: If given, only returns these keys.
+        :return:
+        """
+        if point_id not in self:
+            raise KeyError(point_id)
+
+        point_id = int(point_id)
+        slot = self._table.slot(point_id)
+        flags = int(self._table["flags"][slot])
+        conf = dict()
+
+        if flags & self.HAS_COLOR:
+            conf[QXYSeries.PointConfiguration.Color] = QColor.fromRgba(int(self._table["colors"][slot]))
+        if flags & self.HAS_SIZE:
+            conf[QXYSeries.PointConfiguration.Size] = float(self._table["sizes"][slot])
+        if flags & self.HAS_VISIBILITY:
+            conf[QXYSeries.PointConfiguration.Visibility] = bool(flags & self.VISIBLE)
+        if flags & self.HAS_LABEL_VISIBILITY:
+            conf[QXYSeries.PointConfiguration.LabelVisibility] = bool(flags & self.LABEL_VISIBLE)
+        if point_id in self._extra:
+            conf.update(self._extra[point_id])
+
+        if keys is not None:
+            keys = list(keys)
+            conf = {k: v for k, v in conf.items() if k in keys}
+
+        return conf
+
+    def get_many(self, ids, keys: Iterable = None) -> List[Dict[Any, Any]]:
+        """
+        Returns the configurations of all given ids as new dicts.
+        Faster than calling get per id. Ids without a configuration get an empty dict.
+        :param ids:
+        :param keys: If given, only returns these keys.
+        :return:
+        """
+        keys = self._KEY_FLAGS.keys() if keys is None else set(keys)
+        colors, sizes, flags = self.gather(ids)
+
+        key_columns = []
+        if QXYSeries.PointConfiguration.Color in keys:
+            # usually few distinct colors, create one QColor per distinct color
+            unique_colors, inverse = np.unique(colors, return_inverse=True)
+            q_colors = [QColor.fromRgba(c) for c in unique_colors.tolist()]
+            key_columns.append((QXYSeries.PointConfiguration.Color, self.HAS_COLOR,
+                                [q_colors[i] for i in inverse.tolist()]))
+        if QXYSeries.PointConfiguration.Size in keys:
+            key_columns.append((QXYSeries.PointConfiguration.Size, self.HAS_SIZE, sizes.tolist()))
+        if QXYSeries.PointConfiguration.Visibility in keys:
+            key_columns.append((QXYSeries.PointConfiguration.Visibility, self.HAS_VISIBILITY,
+                                ((flags & self.VISIBLE) != 0).tolist()))
+        if QXYSeries.PointConfiguration.LabelVisibility in keys:
+            key_columns.append((QXYSeries.PointConfiguration.LabelVisibility, self.HAS_LABEL_VISIBILITY,
+                                ((flags & self.LABEL_VISIBLE) != 0).tolist()))
+
+        confs = [dict() for _ in range(len(flags))]
+        for key, has_flag, values in key_columns:
+            for i in np.flatnonzero(flags & has_flag).tolist():
+                confs[i][key] = values[i]
+
+        if self._extra:
+            for i, point_id in enumerate(np.asarray(ids).tolist()):
+                if point_id in self._extra:
+                    confs[i].update({k: v for k, v in self._extra[point_id].items() if k in keys})
+
+        return confs
+
+    def gather(self, ids):
+        """
+        Returns the colors, sizes and flags columns for the given ids.
+        Ids without a configuration have all flags unset.
+        :param ids:
+        :return: (colors, sizes, flags)
+        """
+        slots = self._table.slots(ids)
+        missing = slots < 0
+        if not missing.any():
+            return tuple(self._table[name][slots] for name in ("colors", "sizes", "flags"))
+
+        slots[missing] = 0
+        columns = tuple(self._table[name][slots] for name in ("colors", "sizes", "flags"))
+        for column in columns:
+            column[missing] = 0
+        return columns
+
+    def gather_extra(self, ids) -> Dict[int, Dict[Any, Any]]:
+        """
+        Returns the configuration entries that are not stored in the columns, e.g., custom keys, for the given ids.
+        :param ids:
+        :return: A dict of id -> configuration dict, only for ids that have such entries.
+        """
+        if not self._extra:
+            return dict()
+        return {point_id: dict(self._extra[point_id]) for point_id in np.asarray(ids).tolist()
+                if self._extra.get(point_id)}
+
+    def set_columns(self, ids, colors, sizes, flags):
+        """
+        Replaces the configurations of the given ids with the raw column values, e.g., as returned by gather.
+        :param ids:
+        :param colors: uint32 ARGB colors.
+        :param sizes: float32 sizes.
+        :param flags: uint8 bitmask of this class.
+        :return:
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return
+
+        self.delete_many(ids)
+        slots = self._table.add(ids)
+
+        self._table["colors"][slots] = colors
+        self._table["sizes"][slots] = sizes
+        self._table["flags"][slots] = flags
+
+        # ids without any flags have no configuration
+        self._table.release(ids[self._table["flags"][slots] == 0])
+
+    def set(self, point_id: int, conf: Dict[Any, Any]):
+        """
+        Replaces the configuration of point_id with conf.
+        :param point_id:
+        :param conf:
+        :return:
+        """
+        self.delete(point_id)
+        self.update(point_id, conf)
+
+    def update(self, point_id: int, conf: Dict[Any, Any]):
+        """
+        Updates the configuration of point_id with the keys and values of conf.
+        :param point_id:
+        :param conf:
+        :return:
+        """
+        point_id = int(point_id)
+        slot = self._table.slot(point_id)
+        if slot < 0:
+            slot = int(self._table.add([point_id])[0])
+        self._table["flags"][slot] |= self.CONFIGURED
+
+        for key, val in conf.items():
+            if key in self._KEY_FLAGS:
+                self._set_key_for_slots_(np.array([slot]), key, val)
+            else:
+                self._extra.setdefault(point_id, dict())[key] = val
+
+    def delete(self, point_id: int):
+        """
+        Deletes the configuration of point_id if it has one.
+        :param point_id:
+        :return:
+        """
+        self.delete_many([point_id])
+
+    def delete_many(self, ids):
+        """
+        Deletes the configurations of all given ids.
+        :param ids:
+        :return:
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        self._table.release(ids)
+
+        if self._extra:
+            for point_id in ids.tolist():
+                self._extra.pop(point_id, None)
+
+    def set_key_for_ids(self, ids, key, values):
+        """
+        Sets key to values for all given ids at once, e.g., the color of 10k ids.
+        Ids without a configuration get one.
+        :param ids:
+        :param key: a qt point configuration key.
+        :param values: a single value for all ids or one value per id.
+            Colors are QColors or uint32 ARGB values, sizes are floats, and visibilities are bools.
+        :return:
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return
+
+        if key not in self._KEY_FLAGS:
+            raise KeyError("not a qt point configuration key: {}".format(key))
+
+        self._set_key_for_slots_(self._table.add(ids), key, values)
+
+    def _set_key_for_slots_(self, slots: np.ndarray, key, values):
+        flags = self._table["flags"]
+
+        if key == QXYSeries.PointConfiguration.Color:
+            if isinstance(values, QColor):
+                values = values.rgba()
+            elif not isinstance(values, (int, np.integer, np.ndarray)):
+                values = [v.rgba() if isinstance(v, QColor) else v for v in values]
+            self._table["colors"][slots] = values
+            flags[slots] |= self.CONFIGURED | self.HAS_COLOR
+        elif key == QXYSeries.PointConfiguration.Size:
+            self._table["sizes"][slots] = values
+            flags[slots] |= self.CONFIGURED | self.HAS_SIZE
+        else:
+            has_flag, value_flag = (self.HAS_VISIBILITY, self.VISIBLE) \
+                if key == QXYSeries.PointConfiguration.Visibility else (self.HAS_LABEL_VISIBILITY, self.LABEL_VISIBLE)
+            values = np.broadcast_to(np.asarray(values, dtype=bool), slots.shape)
+            flags[slots] |= self.CONFIGURED | has_flag
+            flags[slots[values]] |= value_flag
+            flags[slots[~values]] &= np.uint8(~value_flag & 0xff)
+
+    def clear(self, key=None):
+        """
+        Clears all configurations, or only key for all configurations.
+        :param key:
+        :return:
+        """
+        if key is None:
+            self._table.clear()
+            self._extra = dict()
+        elif key in self._KEY_FLAGS:
+            self._table["flags"][:self._table.size] &= np.uint8(~self._KEY_FLAGS[key] & 0xff)
+        else:
+            for conf in self._extra.values():
+                conf.pop(key, None)
+
+    def to_dict(self) -> Dict[int, Dict[Any, Any]]:
+        """
+        Returns all configurations as a dict of id -> configuration dict.
+        :return:
+        """
+        return {point_id: self.get(point_id) for point_id in self.ids().tolist()}
+
+    def set_from_dict(self, confs: Dict[int, Dict[Any, Any]]):
+        """
+        Replaces all configurations with the ones of the dict of id -> configuration dict.
+        :param confs:
+        :return:
+        """
+        self.clear()
+        for point_id, conf in confs.items():
+            self.update(point_id, conf)
@@ -0,0 +1,148 @@
+import numpy as np
+
+
+class PointCoordinateBuffer:
+    """
+    Mirrors the x- and y-coordinates of the points of a series in contiguous float64 arrays.
+
+    Reading coordinates from here avoids crossing the Qt boundary for every point, and allows to pass them to
+        QXYSeries.replaceNp in one call.
+    """
+    def __init__(self, capacity: int = 16):
+        capacity = max(int(capacity), 1)
+        self._x = np.empty(capacity, dtype=np.float64)
+        self._y = np.empty(capacity, dtype=np.float64)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def x(self) -> np.ndarray:
+        """
+        Returns a read-only view of the x-coordinates ordered by point index.
+        :return:
+        """
+        v = self._x[:self._count]
+        v.flags.writeable = False
+        return v
+
+    def y(self) -> np.ndarray:
+        """
+        Returns a read-only view of the y-coordinates ordered by point index.
+        :return:
+        """
+        v = self._y[:self._count]
+        v.flags.writeable = False
+        return v
+
+    def at(self, idx: int):
+        """
+        Returns the (x, y) tuple of the point at idx.
+        :param idx:
+        :return:
+        """
+        if not 0 <= idx < self._count:
+            raise IndexError("point index out of range: {}".format(idx))
+        return float(self._x[idx]), float(self._y[idx])
+
+    def insert(self, idx: int, x, y):
+        """
+        Inserts the points with the given x- and y-coordinates at idx.
+        :param idx:
+        :param x: a scalar or 1d array.
+        :param y: a scalar or 1d array of the same length as x.
+        :return:
+        """
+        if not 0 <= idx <= self._count:
+            raise IndexError("point index out of range: {}".format(idx))
+
+        x, y = np.atleast_1d(x), np.atleast_1d(y)
+        count = len(x)
+
+        self._reserve(self._count + count)
+
+        if idx < self._count:
+            self._x[idx + count:self._count + count] = self._x[idx:self._count]
+            self._y[idx + count:self._count + count] = self._y[idx:self._count]
+
+        self._x[idx:idx + count] = x
+        self._y[idx:idx + count] = y
+        self._count += count
+
+    def remove(self, idx: int, count: int = 1):
+        """
+        Removes count points starting at idx.
+        :param idx:
+        :param count:
+        :return:
+        """
+        if count < 0 or not 0 <= idx <= self._count - count:
+            raise IndexError("point range out of range: {}, {}".format(idx, count))
+
+        if idx + count < self._count:
+            self._x[idx:self._count - count] = self._x[idx + count:self._count]
+            self._y[idx:self._count - count] = self._y[idx + count:self._count]
+
+        self._count -= count
+
+    def replace(self, idx: int, x, y):
+        """
+        Replaces the coordinates of the points starting at idx.
+        :param idx:
+        :param x: a scalar or 1d array.
+        :param y: a scalar or 1d array of the same length as x.
+        :return:
+        """
+        x, y = np.atleast_1d(x), np.atleast_1d(y)
+
+        if not 0 <= idx <= self._count - len(x):
+            raise IndexError("point range out of range: {}, {}".format(idx, len(x)))
+
+        self._x[idx:idx + len(x)] = x
+        self._y[idx:idx + len(x)] = y
+
+    def set(self, x, y):
+        """
+        Replaces all coordinates.
+        :param x: 1d array.
+        :param y: 1d array of the same length as x.
+        :return:
+        """
+        self._count = 0
+        self.insert(0, x, y)
+
+    def swap(self, idx1: int, idx2: int):
+        """
+        Swaps the coordinates of the points at idx1 and idx2.
+        :param idx1:
+        :param idx2:
+        :return:
+        """
+        (x1, y1), (x2, y2) = self.at(idx1), self.at(idx2)
+        self._x[idx1], self._y[idx1] = x2, y2
+        self._x[idx2], self._y[idx2] = x1, y1
+
+    def move(self, from_idx: int, to_idx: int):
+        """
+        Moves the coordinates of the point at from_idx to to_idx and shifts the points in between by one.
+        :param from_idx:
+        :param to_idx:
+        :return:
+        """
+        if not (0 <= from_idx < self._count and 0 <= to_idx < self._count):
+            raise IndexError("point index out of range: {}, {}".format(from_idx, to_idx))
+
+        lo, hi = min(from_idx, to_idx), max(from_idx, to_idx) + 1
+        shift = -1 if to_idx > from_idx else 1
+        self._x[lo:hi] = np.roll(self._x[lo:hi], shift)
+        self._y[lo:hi] = np.roll(self._y[lo:hi], shift)
+
+    def _reserve(self, capacity: int):
+        if capacity <= len(self._x):
+            return
+        capacity = max(capacity, 2 * len(self._x))
+        for name in ("_x", "_y"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=np.float64)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
@@ -0,0 +1,156 @@
+import numpy as np
+
+
+class PointIdStore:
+    """
+    Keeps track of the ids of the points of a series.
+
+    The ids are stored by index in a contiguous int64 array. Ids are handed out densely from next_id, thus, a second
+        int64 array maps each id to its current index, -1 for removed ids. Both lookups are O(1).
+    Inserting or removing points in the middle of the series shifts the indices of the following ids in one vectorized
+        pass.
+    """
+    def __init__(self, capacity: int = 16):
+        self._ids = np.empty(max(int(capacity), 1), dtype=np.int64)
+        self._count = 0
+        self._next_id = 0
+
+        self._positions = np.empty(max(int(capacity), 1), dtype=np.int64)
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def next_id(self) -> int:
+        return self._next_id
+
+    def ids(self) -> np.ndarray:
+        """
+        Returns a read-only view of the ids ordered by point index.
+        :return:
+        """
+        v = self._ids[:self._count]
+        v.flags.writeable = False
+        return v
+
+    def id_at(self, idx: int) -> int:
+        """
+        Returns the id of the point at idx.
+        :param idx:
+        :return:
+        """
+        if not 0 <= idx < self._count:
+            raise IndexError("point index out of range: {}".format(idx))
+        return int(self._ids[idx])
+
+    def index_of(self, point_id: int) -> int:
+        """
+        Returns the current index of the point with given id.
+        Returns -1 if not found.
+        :param point_id:
+        :return:
+        """
+        point_id = int(point_id)
+        if not 0 <= point_id < self._next_id:
+            return -1
+        return int(self._positions[point_id])
+
+    def insert(self, idx: int, count: int = 1) -> np.ndarray:
+        """
+        Inserts count new ids at idx.
+        :param idx:
+        :param count:
+        :return: the new ids.
+        """
+        if not 0 <= idx <= self._count:
+            raise IndexError("point index out of range: {}".format(idx))
+
+        self._reserve(self._count + count)
+        self._reserve_positions(self._next_id + count)
+
+        new_ids = np.arange(self._next_id, self._next_id + count, dtype=np.int64)
+        self._next_id += count
+
+        if idx < self._count:
+            self._positions[self._ids[idx:self._count]] += count
+            self._ids[idx + count:self._count + count] = self._ids[idx:self._count]
+
+        self._ids[idx:idx + count] = new_ids
+        self._positions[new_ids] = np.arange(idx, idx + count, dtype=np.int64)
+        self._count += count
+
+        return new_ids
+
+    def remove(self, idx: int, count: int = 1) -> np.ndarray:
+        """
+        Removes count ids starting at idx.
+        :param idx:
+        :param count:
+        :return: the removed ids.
+        """
+        if count < 0 or not 0 <= idx <= self._count - count:
+            raise IndexError("point range out of range: {}, {}".format(idx, count))
+
+        removed = self._ids[idx:idx + count].copy()
+        self._positions[removed] = -1
+
+        if idx + count < self._count:
+            self._positions[self._ids[idx + count:self._count]] -= count
+            self._ids[idx:self._count - count] = self._ids[idx + count:self._count]
+
+        self._count -= count
+
+        return removed
+
+    def swap(self, idx1: int, idx2: int):
+        """
+        Swaps the ids of the points at idx1 and idx2.
+        :param idx1:
+        :param idx2:
+        :return:
+        """
+        id1, id2 = self.id_at(idx1), self.id_at(idx2)
+
+        self._ids[idx1], self._ids[idx2] = id2, id1
+        self._positions[id1], self._positions[id2] = idx2, idx1
+
+    def move(self, from_idx: int, to_idx: int):
+        """
+        Moves the id of the point at from_idx to to_idx and shifts the ids in between by one.
+        :param from_idx:
+        :param to_idx:
+        :return:
+        """
+        if not (0 <= from_idx < self._count and 0 <= to_idx < self._count):
+            raise IndexError("point index out of range: {}, {}".format(from_idx, to_idx))
+
+        lo, hi = min(from_idx, to_idx), max(from_idx, to_idx) + 1
+        self._ids[lo:hi] = np.roll(self._ids[lo:hi], -1 if to_idx > from_idx else 1)
+        self._positions[self._ids[lo:hi]] = np.arange(lo, hi, dtype=np.int64)
+
+    def permute(self, order):
+        """
+        Rearranges the ids, s.t., the new id at index i is the old id at index order[i].
+        :param order: A permutation of all indices.
+        :return:
+        """
+        order = np.asarray(order, dtype=np.int64)
+        if len(order) != self._count:
+            raise ValueError("order has {} indices, expected {}".format(len(order), self._count))
+
+        self._ids[:self._count] = self._ids[:self._count][order]
+        self._positions[self._ids[:self._count]] = np.arange(self._count, dtype=np.int64)
+
+    def _reserve(self, capacity: int):
+        if capacity <= len(self._ids):
+            return
+        ids = np.empty(max(capacity, 2 * len(self._ids)), dtype=np.int64)
+        ids[:self._count] = self._ids[:self._count]
+        self._ids = ids
+
+    def _reserve_positions(self, capacity: int):
+        if capacity <= len(self._positions):
+            return
+        positions = np.empty(max(capacity, 2 * len(self._positions)), dtype=np.int64)
+        positions[:self._next_id] = self._positions[:self._next_id]
+        self._positions = positions
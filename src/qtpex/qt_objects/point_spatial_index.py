@@ -0,0 +1,230 @@
+import numpy as np
+
+from qtpex.qt_objects.id_column_table import IdColumnTable
+
+
+class PointSpatialIndex:
+    """
+    A uniform grid over the coordinates of points by their id for nearest point lookups within a tolerance.
+
+    The grid is stored as the point ids sorted by their cell, thus, the points of a range of cells are found with a
+        binary search per grid row.
+    Points that are added or moved after the grid was built are kept in a small overlay that is searched linearly and
+        invalidate their old grid entry. Once the overlay grows too large, it is merged into the sorted grid with the
+        next lookup. The grid is rebuilt lazily once too many points changed since it was built, e.g., to adapt the
+        cells to the new extent of the points.
+
+    The coordinates are kept in dense slots of an IdColumnTable, thus, memory and rebuilds grow with the number of
+        points and not with the largest id.
+    """
+    # average number of points per grid cell
+    POINTS_PER_CELL = 4
+
+    # the overlay is merged into the grid once it holds more than MAX_OVERLAY_SIZE points
+    MAX_OVERLAY_SIZE = 64
+
+    # the grid is rebuilt once more than max(MIN_REBUILD_SIZE, number of points // 8) points changed since it was built
+    MIN_REBUILD_SIZE = 1024
+
+    def __init__(self, capacity: int = 16):
+        # the coordinates by id, and whether the grid entry of an id is outdated since it was moved after the grid was
+        # built. The grid entries of removed ids are outdated, too, since they are no longer in the table.
+        self._points = IdColumnTable({"x": np.float64, "y": np.float64, "stale": bool}, capacity)
+        self._overlay = set()
+        self._changed_since_build = 0
+
+        self._grid_valid = False
+        self._origin = (0.0, 0.0)
+        self._cell_size = (1.0, 1.0)
+        self._shape = (1, 1)
+        self._cell_keys = np.empty(0, dtype=np.int64)
+        self._cell_ids = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self._points)
+
+    def set(self, ids, x, y):
+        """
+        Adds the points with the given ids or moves them if they exist.
+        :param ids:
+        :param x: a scalar or 1d array.
+        :param y: a scalar or 1d array of the same length as x.
+        :return:
+        """
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        if len(ids) == 0:
+            return
+
+        slots = self._points.add(ids)
+        self._points["x"][slots] = x
+        self._points["y"][slots] = y
+        self._changed_(ids)
+
+    def remove(self, ids):
+        """
+        Removes the points with the given ids if they exist.
+        :param ids:
+        :return:
+        """
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        if self._points.release(ids) > 0:
+            self._changed_(ids)
+
+    def reset(self, ids, x, y):
+        """
+        Replaces all points.
+        :param ids:
+        :param x: 1d array.
+        :param y: 1d array of the same length as x.
+        :return:
+        """
+        self._points.clear()
+        self.invalidate()
+        self.set(ids, x, y)
+
+    def invalidate(self):
+        """
+        Rebuilds the grid with the next lookup.
+        :return:
+        """
+        self._grid_valid = False
+        self._overlay = set()
+
+    def nearest(self, x: float, y: float, tolerance_x: float = 0.0, tolerance_y: float = None) -> int:
+        """
+        Returns the id of the point nearest to (x, y) within the tolerance ellipse around it.
+        The distance is measured relative to the tolerances, thus, they can be given in the different units of the
+            axes, e.g., from a tolerance in pixels.
+        Returns -1 if no point is within the tolerance.
+        :param x:
+        :param y:
+        :param tolerance_x:
+        :param tolerance_y: Defaults to tolerance_x.
+        :return:
+        """
+        if tolerance_y is None:
+            tolerance_y = tolerance_x
+        tolerance_x, tolerance_y = abs(float(tolerance_x)), abs(float(tolerance_y))
+
+        if not self._grid_valid:
+            self._build_grid_()
+        elif len(self._overlay) > self.MAX_OVERLAY_SIZE:
+            self._merge_overlay_()
+
+        slots = self._points.slots(
+            self._grid_candidates_(x - tolerance_x, x + tolerance_x, y - tolerance_y, y + tolerance_y))
+        slots = slots[slots >= 0]
+        slots = slots[~self._points["stale"][slots]]
+        if self._overlay:
+            overlay = self._points.slots(np.fromiter(self._overlay, dtype=np.int64, count=len(self._overlay)))
+            slots = np.concatenate((slots, overlay[overlay >= 0]))
+
+        candidates = self._points.ids_of(slots)
+        dx = np.abs(self._points["x"][slots] - x)
+        dy = np.abs(self._points["y"][slots] - y)
+        inside = (dx <= tolerance_x) & (dy <= tolerance_y)
+        candidates, dx, dy = candidates[inside], dx[inside], dy[inside]
+
+        # a zero tolerance only allows a zero distance on that axis, which is already ensured above
+        if tolerance_x > 0:
+            dx /= tolerance_x
+        if tolerance_y > 0:
+            dy /= tolerance_y
+        distances = dx * dx + dy * dy
+        if tolerance_x > 0 and tolerance_y > 0:
+            inside = distances <= 1
+            candidates, distances = candidates[inside], distances[inside]
+
+        if len(candidates) == 0:
+            return -1
+        return int(candidates[np.argmin(distances)])
+
+    def _changed_(self, ids):
+        if not self._grid_valid:
+            return
+        self._changed_since_build += len(ids)
+        if self._changed_since_build > max(self.MIN_REBUILD_SIZE, len(self._points) // 8):
+            self.invalidate()
+            return
+        slots = self._points.slots(ids)
+        self._points["stale"][slots[slots >= 0]] = True
+        self._overlay.update(ids.tolist())
+
+    def _build_grid_(self):
+        slots = self._points.live_slots()
+        x, y = self._points["x"][slots], self._points["y"][slots]
+        finite = np.isfinite(x) & np.isfinite(y)
+        ids, x, y = self._points.ids_of(slots[finite]), x[finite], y[finite]
+
+        if len(ids) > 0:
+            self._origin = (float(x.min()), float(y.min()))
+            extent = (float(x.max()) - self._origin[0], float(y.max()) - self._origin[1])
+        else:
+            self._origin, extent = (0.0, 0.0), (0.0, 0.0)
+
+        cells_per_axis = max(1, int(np.sqrt(len(ids) / self.POINTS_PER_CELL)))
+        self._shape = (cells_per_axis, cells_per_axis)
+        self._cell_size = tuple(e / cells_per_axis if e > 0 else 1.0 for e in extent)
+
+        keys = self._cell_key_(x, y)
+        order = np.argsort(keys, kind="stable")
+        self._cell_keys = keys[order]
+        self._cell_ids = ids[order]
+
+        self._points["stale"][:self._points.size] = False
+        self._overlay = set()
+        self._changed_since_build = 0
+        self._grid_valid = True
+
+    def _merge_overlay_(self):
+        """
+        Drops the outdated grid entries and inserts the points of the overlay into the sorted grid.
+        :return:
+        """
+        slots = self._points.slots(self._cell_ids)
+        keep = slots >= 0
+        keep[keep] = ~self._points["stale"][slots[keep]]
+        cell_keys, cell_ids = self._cell_keys[keep], self._cell_ids[keep]
+
+        slots = self._points.slots(np.fromiter(self._overlay, dtype=np.int64, count=len(self._overlay)))
+        slots = slots[slots >= 0]
+        self._points["stale"][slots] = False
+        x, y = self._points["x"][slots], self._points["y"][slots]
+        finite = np.isfinite(x) & np.isfinite(y)
+        ids, keys = self._points.ids_of(slots[finite]), self._cell_key_(x[finite], y[finite])
+
+        order = np.argsort(keys, kind="stable")
+        positions = np.searchsorted(cell_keys, keys[order], side="right")
+        self._cell_keys = np.insert(cell_keys, positions, keys[order])
+        self._cell_ids = np.insert(cell_ids, positions, ids[order])
+        self._overlay = set()
+
+    def _cell_of_(self, x, y):
+        cx = np.clip(np.floor((x - self._origin[0]) / self._cell_size[0]), 0, self._shape[0] - 1)
+        cy = np.clip(np.floor((y - self._origin[1]) / self._cell_size[1]), 0, self._shape[1] - 1)
+        return cx.astype(np.int64), cy.astype(np.int64)
+
+    def _cell_key_(self, x, y):
+        cx, cy = self._cell_of_(x, y)
+        return cx * self._shape[1] + cy
+
+    def _grid_candidates_(self, x_min, x_max, y_min, y_max) -> np.ndarray:
+        """
+        Returns the ids of the grid cells that intersect the given rectangle.
+        :return:
+        """
+        (cx0, cx1), (cy0, cy1) = self._cell_of_(np.array([x_min, x_max]), np.array([y_min, y_max]))
+
+        # the cells of one grid row are contiguous in the sorted keys
+        rows = np.arange(cx0, cx1 + 1, dtype=np.int64) * self._shape[1]
+        starts = np.searchsorted(self._cell_keys, rows + cy0, side="left")
+        ends = np.searchsorted(self._cell_keys, rows + cy1, side="right")
+        lengths = ends - starts
+
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # concatenates the ranges [starts[i], ends[i]) without a python loop
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self._cell_ids[offsets + np.arange(total)]
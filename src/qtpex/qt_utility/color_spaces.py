@@ -0,0 +1,123 @@
+"""
+Vectorized conversions of float RGBA colors in [0, 1] between sRGB and other color spaces, e.g., to interpolate
+perceptually. The alpha channel is passed through unchanged.
+
+Color spaces:
+    "srgb": gamma encoded sRGB, as of QColor.
+    "linear_srgb": sRGB without the gamma, i.e., proportional to light intensity.
+    "lab": CIELAB with the D65 white point, L in [0, 100].
+    "oklab": OKLab, L in [0, 1].
+"""
+import numpy as np
+
+SRGB = "srgb"
+LINEAR_SRGB = "linear_srgb"
+LAB = "lab"
+OKLAB = "oklab"
+
+COLOR_SPACES = (SRGB, LINEAR_SRGB, LAB, OKLAB)
+
+_LINEAR_SRGB_TO_XYZ = np.array([[0.4124564, 0.3575761, 0.1804375],
+                                [0.2126729, 0.7151522, 0.0721750],
+                                [0.0193339, 0.1191920, 0.9503041]])
+_XYZ_TO_LINEAR_SRGB = np.linalg.inv(_LINEAR_SRGB_TO_XYZ)
+
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+_LAB_DELTA = 6 / 29
+
+_LINEAR_SRGB_TO_LMS = np.array([[0.4122214708, 0.5363325363, 0.0514459929],
+                                [0.2119034982, 0.6806995451, 0.1073969566],
+                                [0.0883024619, 0.2817188376, 0.6299787005]])
+_LMS_TO_LINEAR_SRGB = np.linalg.inv(_LINEAR_SRGB_TO_LMS)
+
+_LMS_TO_OKLAB = np.array([[0.2104542553, 0.7936177850, -0.0040720468],
+                          [1.9779984951, -2.4285922050, 0.4505937099],
+                          [0.0259040371, 0.7827717662, -0.8086757660]])
+_OKLAB_TO_LMS = np.linalg.inv(_LMS_TO_OKLAB)
+
+
+def srgb_to_linear(rgb: np.ndarray) -> np.ndarray:
+    rgb = np.asarray(rgb, dtype=np.float64)
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((np.maximum(rgb, 0.04045) + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(rgb: np.ndarray) -> np.ndarray:
+    rgb = np.asarray(rgb, dtype=np.float64)
+    return np.where(rgb <= 0.0031308, rgb * 12.92, 1.055 * np.maximum(rgb, 0.0031308) ** (1 / 2.4) - 0.055)
+
+
+def linear_to_lab(rgb: np.ndarray) -> np.ndarray:
+    t = (rgb @ _LINEAR_SRGB_TO_XYZ.T) / _D65_WHITE
+    f = np.where(t > _LAB_DELTA ** 3, np.cbrt(t), t / (3 * _LAB_DELTA ** 2) + 4 / 29)
+    return np.stack((116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])), axis=-1)
+
+
+def lab_to_linear(lab: np.ndarray) -> np.ndarray:
+    fy = (lab[..., 0] + 16) / 116
+    f = np.stack((fy + lab[..., 1] / 500, fy, fy - lab[..., 2] / 200), axis=-1)
+    t = np.where(f > _LAB_DELTA, f ** 3, 3 * _LAB_DELTA ** 2 * (f - 4 / 29))
+    return (t * _D65_WHITE) @ _XYZ_TO_LINEAR_SRGB.T
+
+
+def linear_to_oklab(rgb: np.ndarray) -> np.ndarray:
+    return np.cbrt(rgb @ _LINEAR_SRGB_TO_LMS.T) @ _LMS_TO_OKLAB.T
+
+
+def oklab_to_linear(lab: np.ndarray) -> np.ndarray:
+    return ((lab @ _OKLAB_TO_LMS.T) ** 3) @ _LMS_TO_LINEAR_SRGB.T
+
+
+def rgba_to_color_space(rgba: np.ndarray, space: str) -> np.ndarray:
+    """
+    Converts float sRGB colors with alpha to space.
+    :param rgba: (..., 4) array in [0, 1].
+    :param space: One of COLOR_SPACES.
+    :return: (..., 4) float64 array.
+    """
+    rgba = np.asarray(rgba, dtype=np.float64)
+    if space == SRGB:
+        return rgba.copy()
+
+    out = np.empty(rgba.shape, dtype=np.float64)
+    out[..., 3] = rgba[..., 3]
+    linear = srgb_to_linear(rgba[..., :3])
+
+    if space == LINEAR_SRGB:
+        out[..., :3] = linear
+    elif space == LAB:
+        out[..., :3] = linear_to_lab(linear)
+    elif space == OKLAB:
+        out[..., :3] = linear_to_oklab(linear)
+    else:
+        raise ValueError("unknown color space: {}".format(space))
+    return out
+
+
+def color_space_to_rgba(values: np.ndarray, space: str, out: np.ndarray = None) -> np.ndarray:
+    """
+    Converts colors with alpha in space back to float sRGB, the inverse of rgba_to_color_space.
+    Colors outside of the sRGB gamut are clipped to [0, 1].
+    :param values: (..., 4) array.
+    :param space: One of COLOR_SPACES.
+    :param out: Optional float array of the shape of values for the result, may be values itself.
+    :return: (..., 4) array.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if out is None:
+        out = np.empty(values.shape, dtype=np.float64)
+
+    if space == SRGB:
+        out[...] = values
+    elif space == LINEAR_SRGB:
+        out[..., :3] = linear_to_srgb(values[..., :3])
+    elif space == LAB:
+        out[..., :3] = linear_to_srgb(lab_to_linear(values[..., :3]))
+    elif space == OKLAB:
+        out[..., :3] = linear_to_srgb(oklab_to_linear(values[..., :3]))
+    else:
+        raise ValueError("unknown color space: {}".format(space))
+
+    if out is not values:
+        out[..., 3] = values[..., 3]
+    np.clip(out, 0, 1, out=out)
+    return out
@@ -0,0 +1,84 @@
+import numpy as np
+
+
+def minmax_indices(bins: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Returns the sorted indices of the first, last, minimum, and maximum point of each bin (M4 downsampling).
+    Drawing the lines between only these points looks the same as drawing all points if each bin is one pixel wide.
+    :param bins: The non-decreasing bin of each point.
+    :param y:
+    :return:
+    """
+    if len(bins) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bins)) + 1))
+    ends = np.concatenate((starts[1:], [len(bins)]))
+
+    # sorted by bin, then by y, thus, each bin covers the same range as before with its minimum first
+    order = np.lexsort((y, bins))
+
+    return np.unique(np.concatenate((starts, ends - 1, order[starts], order[ends - 1])))
+
+
+def pixel_minmax_indices(x: np.ndarray, y: np.ndarray, x_min: float, x_max: float, width: int) -> np.ndarray:
+    """
+    Returns the sorted indices of the points to draw for a line over x-sorted points in the x-range [x_min, x_max]
+        that is width pixels wide.
+    Keeps the first, last, minimum, and maximum point of each pixel column, and the nearest point on each side outside
+        of the range, s.t., the lines to the borders stay the same.
+    :param x: Sorted x-coordinates.
+    :param y:
+    :param x_min:
+    :param x_max:
+    :param width:
+    :return:
+    """
+    lo = max(int(np.searchsorted(x, x_min, side="left")) - 1, 0)
+    hi = min(int(np.searchsorted(x, x_max, side="right")) + 1, len(x))
+
+    if hi - lo <= 4 * width:
+        return np.arange(lo, hi)
+
+    scale = width / (x_max - x_min) if x_max > x_min else 0.0
+    bins = np.clip(((x[lo:hi] - x_min) * scale).astype(np.int64), -1, width)
+
+    return minmax_indices(bins, y[lo:hi]) + lo
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Returns the sorted indices of n_out points selected with the largest triangle three buckets algorithm.
+    The first and last point are always kept.
+    :param x: Sorted x-coordinates.
+    :param y:
+    :param n_out:
+    :return:
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("n_out must be at least 3: {}".format(n_out))
+
+    # the inner points are split in n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # the average point of the next bucket, or the last point
+        if i + 2 < len(edges):
+            next_x, next_y = x[end:edges[i + 2]].mean(), y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[n - 1], y[n - 1]
+
+        areas = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return selected
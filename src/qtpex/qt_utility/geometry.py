@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def points_in_rect(x: np.ndarray, y: np.ndarray, x_min: float, y_min: float, x_max: float, y_max: float) -> np.ndarray:
+    """
+    Returns a boolean mask which of the points lie in the rectangle, including its border.
+    The corners may be given in any order.
+    :param x:
+    :param y:
+    :param x_min:
+    :param y_min:
+    :param x_max:
+    :param y_max:
+    :return:
+    """
+    x_min, x_max = min(x_min, x_max), max(x_min, x_max)
+    y_min, y_max = min(y_min, y_max), max(y_min, y_max)
+    return (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+
+
+def points_in_polygon(x: np.ndarray, y: np.ndarray, polygon) -> np.ndarray:
+    """
+    Returns a boolean mask which of the points lie in the polygon with the even-odd rule, e.g., of a lasso.
+    Loops over the edges of the polygon and tests all points at once per edge.
+    :param x:
+    :param y:
+    :param polygon: A (N, 2) array or a list of QPointF of the vertices. The polygon is closed implicitly.
+    :return:
+    """
+    if not isinstance(polygon, np.ndarray):
+        polygon = np.array([(p.x(), p.y()) for p in polygon], dtype=np.float64).reshape(-1, 2)
+
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    inside = np.zeros(len(x), dtype=bool)
+    if len(polygon) < 3:
+        return inside
+
+    # only test the points in the bounding box of the polygon
+    candidates = np.flatnonzero(points_in_rect(x, y, *polygon.min(axis=0), *polygon.max(axis=0)))
+    cx, cy = x[candidates], y[candidates]
+    crossings = np.zeros(len(candidates), dtype=bool)
+
+    px, py = polygon[:, 0], polygon[:, 1]
+    qx, qy = np.roll(px, 1), np.roll(py, 1)
+
+    for x1, y1, x2, y2 in zip(px.tolist(), py.tolist(), qx.tolist(), qy.tolist()):
+        # the edge crosses the horizontal ray to the right of the point
+        spans = (y1 > cy) != (y2 > cy)
+        if not spans.any():
+            continue
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_cross = x1 + (cy - y1) * (x2 - x1) / (y2 - y1)
+        crossings ^= spans & (cx < x_cross)
+
+    inside[candidates] = crossings
+    return inside
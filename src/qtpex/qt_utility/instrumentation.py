@@ -0,0 +1,180 @@
+"""
+Opt-in latency instrumentation of event handlers and slots.
+
+Decorate a handler with instrumented to record the number of calls and a latency histogram per handler, e.g.:
+    @Slot()
+    @instrumented
+    def chart_moved(self, event):
+        ...
+Recording is disabled by default, then the decorator only costs a flag check per call.
+Enable it with enable_instrumentation, or with the environment variable QTPEX_INSTRUMENT=1.
+
+The statistics are available with get_latency_stats, and can be dumped to a json file with dump_latency_stats, or
+periodically with start_periodic_dump.
+"""
+import functools
+import json
+import os
+import time
+from typing import Dict
+
+from PySide6.QtCore import QTimer
+
+# the upper bounds of the histogram buckets in microseconds, the last bucket holds all larger latencies
+BUCKET_BOUNDS_US = tuple(2 ** k for k in range(24))
+
+
+class LatencyHistogram:
+    """
+    Counts latencies in buckets with exponentially growing bounds, see BUCKET_BOUNDS_US.
+    """
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_US) + 1)
+
+    def record(self, seconds: float):
+        """
+        Records one latency.
+        :param seconds:
+        :return:
+        """
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+        # bucket k holds latencies in (2^(k-1), 2^k] us
+        us = int(seconds * 1e6)
+        self.buckets[min(max(us - 1, 0).bit_length(), len(BUCKET_BOUNDS_US))] += 1
+
+    def percentile(self, q: float) -> float:
+        """
+        Returns an upper bound of the q-th percentile in seconds, i.e., the upper bound of its bucket.
+        :param q: In [0, 100].
+        :return:
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, n in zip(BUCKET_BOUNDS_US, self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(bound * 1e-6, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return dict(
+            count=self.count,
+            total_s=self.total,
+            mean_s=self.total / self.count if self.count > 0 else 0.0,
+            min_s=self.min if self.count > 0 else 0.0,
+            max_s=self.max,
+            p50_s=self.percentile(50),
+            p90_s=self.percentile(90),
+            p99_s=self.percentile(99),
+            bucket_bounds_us=list(BUCKET_BOUNDS_US),
+            buckets=list(self.buckets),
+        )
+
+
+_enabled = os.environ.get("QTPEX_INSTRUMENT", "") not in ("", "0")
+_histograms: Dict[str, LatencyHistogram] = dict()
+_dump_timer = None
+
+
+def instrumented(func=None, *, name: str = None):
+    """
+    Records the latency of each call of func under name, which defaults to the qualified name of func.
+    :param func:
+    :param name:
+    :return:
+    """
+    if func is None:
+        return functools.partial(instrumented, name=name)
+
+    key = func.__qualname__ if name is None else name
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+
+        t0 = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            histogram = _histograms.get(key)
+            if histogram is None:
+                histogram = _histograms[key] = LatencyHistogram()
+            histogram.record(time.perf_counter() - t0)
+
+    return wrapper
+
+
+def enable_instrumentation(enabled: bool = True):
+    global _enabled
+    _enabled = enabled
+
+
+def instrumentation_enabled() -> bool:
+    return _enabled
+
+
+def get_latency_stats() -> Dict[str, dict]:
+    """
+    Returns the statistics of all instrumented handlers that were called, by name, see LatencyHistogram.as_dict.
+    :return:
+    """
+    return {key: histogram.as_dict() for key, histogram in sorted(_histograms.items())}
+
+
+def reset_latency_stats():
+    _histograms.clear()
+
+
+def dump_latency_stats(file):
+    """
+    Writes the statistics with a timestamp as json to file.
+    :param file: A path or a text file object.
+    :return:
+    """
+    if isinstance(file, (str, os.PathLike)):
+        # write to a temporary file first, s.t., readers never see a partial dump
+        tmp = "{}.tmp".format(os.fspath(file))
+        with open(tmp, "w") as f:
+            dump_latency_stats(f)
+        os.replace(tmp, file)
+        return
+
+    json.dump(dict(time=time.time(), handlers=get_latency_stats()), file, indent=1)
+
+
+def start_periodic_dump(file, interval: float = 60.0):
+    """
+    Dumps the statistics to file every interval seconds from the qt event loop, see dump_latency_stats.
+    Replaces a running periodic dump.
+    :param file: A path.
+    :param interval: In seconds.
+    :return:
+    """
+    global _dump_timer
+    stop_periodic_dump()
+
+    _dump_timer = QTimer()
+    _dump_timer.setInterval(max(1, round(interval * 1000)))
+    _dump_timer.timeout.connect(lambda: dump_latency_stats(file))
+    _dump_timer.start()
+
+
+def stop_periodic_dump():
+    global _dump_timer
+    if _dump_timer is not None:
+        _dump_timer.stop()
+        _dump_timer = None
@@ -1,4 +1,8 @@
+import numpy as np
 from PySide6.QtGui import QColor
+from scipy.interpolate import CubicSpline, PchipInterpolator
+
+from qtpex.qt_utility.color_spaces import COLOR_SPACES, SRGB, color_space_to_rgba, rgba_to_color_space
 
 
 def interpolate_colors(q1: QColor, q2: QColor, t: float, method="linear") -> QColor:
@@ -15,5 +19,135 @@ def interpolate_colors(q1: QColor, q2: QColor, t: float, method="linear") -> QCo
         qi.setAlphaF(ai)
 
         return qi
+    elif method in COLOR_SPACES:
+        rgba = interpolate_color_array(np.array([t]), None, np.array([q1.getRgbF(), q2.getRgbF()]), space=method)
+        return QColor.fromRgbF(*rgba[0].tolist())
     else:
         raise NotImplementedError()
+
+
+def unpack_argb(colors) -> np.ndarray:
+    """
+    Converts uint32 ARGB colors, as of QColor.rgba, to float RGBA values in [0, 1].
+    :param colors: (N,) array.
+    :return: (N, 4) float64 array.
+    """
+    colors = np.asarray(colors, dtype=np.uint32)
+    shifts = np.array([16, 8, 0, 24], dtype=np.uint32)
+    return ((colors[:, None] >> shifts) & 0xff) / 255.0
+
+
+def interpolate_color_array(samples: np.ndarray, x: np.ndarray, colors: np.ndarray, out: np.ndarray = None,
+                            space: str = SRGB) -> np.ndarray:
+    """
+    Interpolates the colors linearly at the samples, e.g., to evaluate a transfer function for many values at once.
+    Samples outside of x get the color of the closest end. At duplicate x, the first of the duplicates is used.
+    :param samples: (M,) array.
+    :param x: (N,) sorted array of the positions of the colors, or None for N positions evenly spaced over [0, 1].
+    :param colors: (N, C) array, e.g., float RGBA values. (N, 4) float RGBA values in [0, 1] for spaces other than
+        SRGB.
+    :param out: Optional (M, C) float array for the result.
+    :param space: The color space to interpolate in, see qtpex.qt_utility.color_spaces, e.g., OKLAB for perceptually
+        even steps. The result is converted back to sRGB and clipped to its gamut.
+    :return: (M, C) array.
+    """
+    if x is None:
+        x = np.linspace(0, 1, len(colors))
+
+    if space == SRGB:
+        return evaluate_piecewise_polynomial(samples, *piecewise_polynomial(x, colors, "linear"), out=out)
+
+    values = evaluate_piecewise_polynomial(samples, *piecewise_polynomial(x, rgba_to_color_space(colors, space)))
+    return color_space_to_rgba(values, space, out=values if out is None else out)
+
+
+def piecewise_polynomial(x: np.ndarray, values: np.ndarray, mode: str = "linear"):
+    """
+    Returns the breakpoints and coefficients of a piecewise polynomial through the values at x, to evaluate it with
+        evaluate_piecewise_polynomial.
+    Duplicate x split the curve, i.e., it jumps from the values of the first to the values of the last duplicate.
+    :param x: (N,) sorted array.
+    :param values: (N, C) array.
+    :param mode: "linear", "pchip" for monotone cubic interpolation, "cubic" for a natural cubic spline, "step" for
+        the values of the point on the left or at the same x, or "nearest" for the values of the closest point.
+    :return: (breakpoints (B,), coefficients (K, B - 1, C)), the coefficients of each piece are in powers of the
+        offset to its left breakpoint, highest first.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+
+    if len(x) == 1:
+        return np.repeat(x, 2), values[None, :1]
+
+    if mode == "step":
+        # right-continuous, i.e., each point holds its own value from its x on, and the last point gets its own piece.
+        # evaluate_piecewise_polynomial uses the piece left of a breakpoint equal to a sample, thus, the breakpoints
+        # are moved to the closest smaller float.
+        return np.append(np.nextafter(x, -np.inf), x[-1]), values[None]
+
+    if mode == "nearest":
+        breakpoints = np.empty(2 * len(x) - 1, dtype=np.float64)
+        breakpoints[0::2] = x
+        breakpoints[1::2] = (x[:-1] + x[1:]) / 2
+        coefficients = np.empty((1, 2 * len(x) - 2, values.shape[1]), dtype=np.float64)
+        coefficients[0, 0::2] = values[:-1]
+        coefficients[0, 1::2] = values[1:]
+        return breakpoints, coefficients
+
+    width = np.diff(x)
+
+    if mode == "linear":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = np.where(width[:, None] > 0, np.diff(values, axis=0) / width[:, None], 0.0)
+        return x, np.stack((slope, values[:-1]))
+
+    if mode in ("pchip", "cubic"):
+        coefficients = np.zeros((4, len(x) - 1, values.shape[1]), dtype=np.float64)
+        coefficients[3] = values[:-1]
+
+        # fit the runs between duplicate x separately, the pieces between duplicates stay constant
+        bounds = np.concatenate(([0], np.flatnonzero(width == 0) + 1, [len(x)]))
+        for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            if stop - start < 2:
+                continue
+            if mode == "pchip":
+                spline = PchipInterpolator(x[start:stop], values[start:stop], axis=0)
+            else:
+                spline = CubicSpline(x[start:stop], values[start:stop], axis=0, bc_type="natural")
+            coefficients[:, start:stop - 1] = spline.c
+        return x, coefficients
+
+    raise ValueError("unknown interpolation mode: {}".format(mode))
+
+
+def evaluate_piecewise_polynomial(samples: np.ndarray, breakpoints: np.ndarray, coefficients: np.ndarray,
+                                  out: np.ndarray = None) -> np.ndarray:
+    """
+    Evaluates a piecewise polynomial of piecewise_polynomial at the samples.
+    Samples outside of the breakpoints are clamped to the closest end. At duplicate breakpoints, the piece left of the
+        first duplicate is used.
+    :param samples: (M,) array.
+    :param breakpoints: (B,) sorted array.
+    :param coefficients: (K, B - 1, C) array.
+    :param out: Optional (M, C) float array for the result.
+    :return: (M, C) array.
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+
+    if out is None:
+        out = np.empty((len(samples), coefficients.shape[2]), dtype=np.float64)
+
+    # clamp to the ends, then use the piece left of the first breakpoint that is not less than the sample
+    samples = np.clip(samples, breakpoints[0], breakpoints[-1])
+    left = np.searchsorted(breakpoints, samples, side="left") - 1
+    np.clip(left, 0, len(breakpoints) - 2, out=left)
+
+    # horner's method channel by channel, which is faster than broadcasting over the rows
+    offset = samples - np.take(breakpoints, left)
+    for c in range(coefficients.shape[2]):
+        channel = np.take(coefficients[0, :, c], left)
+        for k in range(1, len(coefficients)):
+            channel *= offset
+            channel += np.take(coefficients[k, :, c], left)
+        out[:, c] = channel
+    return out
@@ -0,0 +1,142 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# elements per chunk, s.t., the data, index, and color slices of one chunk stay in the cache
+DEFAULT_CHUNK_SIZE = 2 ** 18
+
+
+def lut_indices(values: np.ndarray, lut_size: int, lo: float, hi: float) -> np.ndarray:
+    """
+    Returns the indices of the entries of a lookup table with lut_size entries evenly spaced over [lo, hi] that are
+        closest to the values. The indices are not clipped, use np.take with mode="clip".
+    Integer values index the table directly if it has one entry per integer in [lo, hi], e.g., 65536 entries for
+        16-bit data in [0, 65535].
+    :param values:
+    :param lut_size:
+    :param lo:
+    :param hi:
+    :return:
+    """
+    if np.can_cast(values.dtype, np.intp) and float(lo).is_integer() and hi - lo + 1 == lut_size:
+        if lo == 0:
+            return values
+        return np.subtract(values, int(lo), dtype=np.int64)
+
+    indices = np.subtract(values, lo, dtype=np.float64)
+    indices *= (lut_size - 1) / (hi - lo)
+    np.rint(indices, out=indices)
+    return indices.astype(np.intp)
+
+
+def apply_lut(data: np.ndarray, lut: np.ndarray, lo: float, hi: float, out: np.ndarray = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = None) -> np.ndarray:
+    """
+    Maps each value of data to the closest entry of lut, e.g., a scalar volume to RGBA, see lut_indices.
+    Values outside of [lo, hi] get the first or last entry.
+    Processes the data in chunks of about chunk_size elements along its first axis on a thread pool, since numpy
+        releases the GIL while indexing. Works with memory-mapped data and output.
+    :param data: An array of any shape, e.g., a np.memmap.
+    :param lut: (n, C) lookup table with entries evenly spaced over [lo, hi].
+    :param lo:
+    :param hi:
+    :param out: Optional array of the shape of data plus the last axis of lut and the dtype of lut, e.g., a np.memmap.
+    :param chunk_size:
+    :param workers: The number of threads. Defaults to the number of cpus.
+    :return: out
+    """
+    if data.ndim == 0:
+        result = apply_lut(data.reshape(1), lut, lo, hi, None if out is None else out.reshape((1,) + out.shape))
+        return result[0] if out is None else out
+
+    if out is None:
+        out = np.empty(data.shape + lut.shape[1:], dtype=lut.dtype)
+    elif out.shape != data.shape + lut.shape[1:] or out.dtype != lut.dtype:
+        raise ValueError("out has to have shape {} and dtype {}, got: {}, {}".format(
+            data.shape + lut.shape[1:], lut.dtype, out.shape, out.dtype))
+
+    if len(data) == 0:
+        return out
+
+    rows = max(1, chunk_size // max(1, data[0].size))
+    chunks = [(start, min(start + rows, len(data))) for start in range(0, len(data), rows)]
+
+    def apply_chunk(chunk):
+        start, stop = chunk
+        indices = lut_indices(np.asarray(data[start:stop]), len(lut), lo, hi)
+        np.take(lut, indices, axis=0, out=out[start:stop], mode="clip")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if len(chunks) == 1 or workers <= 1:
+        for chunk in chunks:
+            apply_chunk(chunk)
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            # list() re-raises exceptions of the threads
+            list(executor.map(apply_chunk, chunks))
+
+    return out
+
+
+def changed_x_range(old, new, reach: int = 1):
+    """
+    Returns the x-interval in which an interpolation through the points differs between two states of the points.
+    Points are matched by id. Added, removed, moved, or otherwise changed points affect the interval between their
+        reach-th neighbors on each side, e.g., 1 for linear and 2 for PCHIP interpolation. A changed first or last
+        point also affects all x beyond it.
+    :param old: (ids, x, values) of the old state, values is an (N,) or (N, C) array, e.g., colors.
+    :param new: (ids, x, values) of the new state.
+    :param reach: The number of neighbors on each side that a point affects, or None for all points, e.g., for cubic
+        splines.
+    :return: (x_min, x_max), which may be infinite, or None if nothing changed.
+    """
+    (ids_old, x_old, values_old), (ids_new, x_new, values_new) = old, new
+
+    _, in_old, in_new = np.intersect1d(ids_old, ids_new, assume_unique=True, return_indices=True)
+    if len(in_old) == 0:
+        # no common points, e.g., after all points were replaced
+        return None if len(ids_old) == len(ids_new) == 0 else (-np.inf, np.inf)
+
+    values_old = np.asarray(values_old).reshape(len(ids_old), -1)
+    values_new = np.asarray(values_new).reshape(len(ids_new), -1)
+    same = x_old[in_old] == x_new[in_new]
+    same &= (values_old[in_old] == values_new[in_new]).all(axis=1)
+
+    x_min, x_max = np.inf, -np.inf
+    for x, matched in ((x_old, in_old), (x_new, in_new)):
+        changed = np.ones(len(x), dtype=bool)
+        changed[matched[same]] = False
+        indices = np.flatnonzero(changed)
+        if len(indices) == 0:
+            continue
+        if reach is None:
+            return -np.inf, np.inf
+
+        # the values beyond the ends only depend on the first and last point
+        first, last = max(indices[0] - reach, 0), min(indices[-1] + reach, len(x) - 1)
+        x_min = min(x_min, -np.inf if indices[0] == 0 else x[first])
+        x_max = max(x_max, np.inf if indices[-1] == len(x) - 1 else x[last])
+
+    if x_min > x_max:
+        return None
+    return x_min, x_max
+
+
+def lut_index_range(x_min: float, x_max: float, lut_size: int, lo: float, hi: float):
+    """
+    Returns the range [i0, i1) of the entries of a lookup table with lut_size entries evenly spaced over [lo, hi]
+        that lie in [x_min, x_max], including the closest entry outside on each side.
+    :param x_min:
+    :param x_max:
+    :param lut_size:
+    :param lo:
+    :param hi:
+    :return: (i0, i1)
+    """
+    step = (hi - lo) / max(lut_size - 1, 1)
+    i0 = 0 if x_min <= lo else int(np.floor((x_min - lo) / step))
+    i1 = lut_size if x_max >= hi else int(np.ceil((x_max - lo) / step)) + 1
+    return max(0, min(i0, lut_size)), max(0, min(i1, lut_size))
@@ -1,8 +1,20 @@
+import numpy as np
 from PySide6.QtCharts import QXYSeries
 from PySide6.QtCore import QPoint
 
 
 def find_point_idx(point: QPoint, series: QXYSeries) -> int:
+    """
+    Returns the index of a point in series that equals point, or -1 if there is none.
+    Uses the spatial index of the series if it has one, e.g., a ConfigurableScatterSeries, and scans all points
+        otherwise.
+    :param point:
+    :param series:
+    :return:
+    """
+    if hasattr(series, "find_point_idx_near"):
+        return series.find_point_idx_near(point.x(), point.y())
+
     idx = -1
 
     for i in range(series.count()):
@@ -10,3 +22,51 @@ def find_point_idx(point: QPoint, series: QXYSeries) -> int:
             idx = i
             break
     return idx
+
+
+def set_series_points(series: QXYSeries, x, y, append: bool = False):
+    """
+    Replaces all points of series with the x- and y-coordinates, or appends them, with one bulk call.
+    Uses the buffers of configurable series, e.g., ConfigurableLineSeries, and replaceNp/appendNp otherwise, thus,
+        there is no python work per point.
+    The points of configurable series keep their configurations by index, e.g., their colors. If the number of points
+        stays the same, they keep their ids and all configurations, otherwise, only the qt compatible configurations of
+        the first points are kept, and additional points have none.
+    :param series:
+    :param x: 1d array, converted to contiguous float64 if it is not already.
+    :param y: 1d array of the same length as x.
+    :param append: Appends the points instead of replacing all points.
+    :return:
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+
+    if x.shape != y.shape or x.ndim != 1:
+        raise ValueError("x and y must be 1d arrays of the same length: {}, {}".format(x.shape, y.shape))
+
+    if hasattr(series, "set_points_from_columns"):
+        if append:
+            series.append_many((x, y))
+        elif len(x) == len(series.get_point_ids()):
+            series.replace_many(0, (x, y))
+        else:
+            series.set_points_from_columns(x, y, *_resized_configuration_columns_(series, len(x)))
+    elif append:
+        series.appendNp(x, y)
+    else:
+        series.replaceNp(x, y)
+
+
+def _resized_configuration_columns_(series, count: int):
+    """
+    Returns the configuration columns of the first count points of a configurable series, padded with unconfigured
+        points.
+    :param series:
+    :param count:
+    :return: (colors, sizes, flags)
+    """
+    resized = []
+    for column in series.get_configuration_columns():
+        column = column[:count]
+        resized.append(np.concatenate((column, np.zeros(count - len(column), dtype=column.dtype))))
+    return resized
@@ -0,0 +1,94 @@
+"""
+Debug tracing by category.
+
+Get a tracer per module with get_tracer(category) and enable categories with enable_tracing, or with the environment
+variable QTPEX_TRACE, e.g., QTPEX_TRACE=interactive_chart,transferfunction_widget or QTPEX_TRACE=* for all.
+
+Disabled tracers cost one attribute check if the call is guarded:
+    if _trace.enabled:
+        _trace("point_removed", self.tf_as_json())
+Unguarded calls cost a function call, and arguments wrapped with lazy are only evaluated if the tracer is enabled:
+    _trace("point_removed", lazy(self.tf_as_json))
+"""
+import os
+from typing import Dict
+
+ALL_CATEGORIES = "*"
+
+
+class lazy:
+    """
+    An argument of a tracer call that is only evaluated if the tracer is enabled.
+    """
+    __slots__ = ("func", "args")
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def evaluate(self):
+        return self.func(*self.args)
+
+
+class Tracer:
+    """
+    Prints its arguments with the category as prefix if enabled, see the module docstring.
+    """
+    __slots__ = ("category", "enabled")
+
+    def __init__(self, category: str, enabled: bool = False):
+        self.category = category
+        self.enabled = enabled
+
+    def __call__(self, *args, **kwargs):
+        if not self.enabled:
+            return
+        print("[{}]".format(self.category), *(a.evaluate() if isinstance(a, lazy) else a for a in args), **kwargs)
+
+
+_tracers: Dict[str, Tracer] = dict()
+_enabled_categories = set(c.strip() for c in os.environ.get("QTPEX_TRACE", "").split(",") if c.strip())
+
+
+def _is_enabled_(category: str) -> bool:
+    return ALL_CATEGORIES in _enabled_categories or category in _enabled_categories
+
+
+def get_tracer(category: str) -> Tracer:
+    """
+    Returns the tracer of category.
+    :param category:
+    :return:
+    """
+    if category not in _tracers:
+        _tracers[category] = Tracer(category, _is_enabled_(category))
+    return _tracers[category]
+
+
+def enable_tracing(*categories: str, enabled: bool = True):
+    """
+    Enables or disables tracing for the categories.
+    :param categories: The categories, or ALL_CATEGORIES.
+    :param enabled:
+    :return:
+    """
+    for category in categories:
+        if enabled:
+            _enabled_categories.add(category)
+        else:
+            _enabled_categories.discard(category)
+
+    if ALL_CATEGORIES in categories and not enabled:
+        _enabled_categories.clear()
+
+    for tracer in _tracers.values():
+        tracer.enabled = _is_enabled_(tracer.category)
+
+
+def disable_tracing(*categories: str):
+    """
+    Disables tracing for the categories, see enable_tracing.
+    :param categories:
+    :return:
+    """
+    enable_tracing(*categories, enabled=False)
@@ -1,16 +1,17 @@
-from PySide6.QtCharts import QChart, QValueAxis
-from PySide6.QtGui import QPainter, QMouseEvent
-from PySide6.QtWidgets import QSizePolicy
+import numpy as np
+from PySide6.QtCharts import QChart, QValueAxis, QXYSeries
+from PySide6.QtGui import QPainter, QMouseEvent, QColor, QPainterPath, QPen, QKeyEvent
+from PySide6.QtWidgets import QSizePolicy, QRubberBand, QGraphicsPathItem
 from qtpex.qt_objects.configurable_scatter_series import ConfigurableScatterSeries
-from qtpex.qt_utility.series import find_point_idx
+from qtpex.qt_utility.geometry import points_in_polygon, points_in_rect
+from qtpex.qt_utility.instrumentation import instrumented
+from qtpex.qt_utility.tracing import get_tracer
 
 from qtpex.qt_widgets.iqchartview import IQChartView
-from PySide6.QtCore import Slot, QPoint, Qt, Signal
+from PySide6.QtCore import Slot, QPoint, QPointF, QRect, Qt, Signal
 
 
-def printd(*args, **kwargs):
-    if not True:
-        print(*args, **kwargs)
+_trace = get_tracer("interactive_chart")
 
 
 class InteractiveChartWidget(IQChartView):
@@ -24,8 +25,15 @@ class InteractiveChartWidget(IQChartView):
     Add points by left-clicking in chart.
     Delete points by clicking them.
     Move points by dragging them.
+
+    Select points with a rectangle by shift-dragging, or with a lasso by ctrl-dragging.
+    Dragging a selected point moves all selected points, delete removes them, and escape clears the selection.
+
+    With coalesce_mouse_moves, mouse moves are delivered at most once per display frame, see
+        IQChartView.set_mouse_move_coalescing. This keeps dragging many points responsive, but drops the mouse moves in
+        between. It is disabled by default.
     """
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, coalesce_mouse_moves: bool = False):
         super().__init__(QChart(), parent)
 
         self.mouse_clicked_signal.connect(self.chart_clicked)
@@ -33,6 +41,10 @@ class InteractiveChartWidget(IQChartView):
         self.mouse_moved_signal.connect(self.chart_moved)
         self.mouse_pressed_signal.connect(self.chart_pressed)
 
+        # moving points is expensive, optionally deliver mouse moves at most once per display frame
+        if coalesce_mouse_moves:
+            self.set_mouse_move_coalescing(True)
+
         # Get Chart
         chart = self.chart()
         # chart.setAnimationOptions(QChart.AllAnimations)
@@ -72,6 +84,56 @@ class InteractiveChartWidget(IQChartView):
         # at any time, if this is != -1, then the current execution of chart events was induced by this point idx
         self.point_was_pressed_idx = -1
 
+        # the selected points by id, s.t., the selection survives inserting and removing other points
+        self.selected_point_ids = np.empty(0, dtype=np.int64)
+
+        # the id of the pressed point, to drag the selection with it
+        self._pressed_point_id = -1
+
+        # "rect" or "lasso" while selecting, and the mouse positions of the selection in widget coordinates
+        self._selection_mode = None
+        self._selection_path = []
+
+        self._rubber_band = QRubberBand(QRubberBand.Rectangle, self.viewport())
+        self._lasso_item = QGraphicsPathItem()
+        self._lasso_item.setPen(QPen(QColor(Qt.darkGray), 1, Qt.DashLine))
+        self._lasso_item.setZValue(1000)
+        self._lasso_item.setVisible(False)
+        self.scene().addItem(self._lasso_item)
+
+        if not self.scatterseries.selectedColor().isValid():
+            self.scatterseries.setSelectedColor(QColor(Qt.blue))
+
+    def point_idx_at(self, pos: QPointF, tolerance: float = 5.0, series=None) -> int:
+        """
+        Returns the index of the point of series nearest to the widget position pos within tolerance pixels.
+        Returns -1 if there is no point within the tolerance.
+        :param pos: A position in widget coordinates, e.g., event.localPos() of a mouse event.
+        :param tolerance: In pixels.
+        :param series: A ConfigurableXYSeries attached to the chart.
+        :return:
+        """
+        if series is None:
+            series = self.scatterseries
+
+        value = self.chart().mapToValue(pos, series)
+        corner = self.chart().mapToValue(pos + QPointF(tolerance, tolerance), series)
+
+        return series.find_point_idx_near(value.x(), value.y(), abs(corner.x() - value.x()),
+                                          abs(corner.y() - value.y()))
+
+    @staticmethod
+    def _sorted_x_coordinates_(series) -> np.ndarray:
+        """
+        Returns the x-coordinates of the points of a sorted series.
+        Uses the cached coordinates of configurable series, otherwise reads them from series.
+        :param series:
+        :return:
+        """
+        if hasattr(series, "get_points_as_arrays"):
+            return series.get_points_as_arrays()[0]
+        return np.fromiter((p.x() for p in series.points()), dtype=np.float64, count=series.count())
+
     def sorted_insert(self, point, series=None):
         """
         Insert the point into series, s.t., the series stays sorted.
@@ -83,17 +145,19 @@ class InteractiveChartWidget(IQChartView):
         if series is None:
             series = self.scatterseries
 
-        for i in range(series.count()):
-            if series.at(i).x() >= point.x():
-                series.insert(i, point)
-                return
+        i = int(np.searchsorted(self._sorted_x_coordinates_(series), point.x(), side="left"))
 
-        series.append(point)
+        if i < series.count():
+            series.insert(i, point)
+        else:
+            series.append(point)
 
     def sorted_replace(self, idx_to_replace, new_point: QPoint, series=None):
         """
         Replace point of idx_to_replace with new_point but keeps ordering in series.
-        Uses swap for the first replace if available (otherwise 2 replace), thus, does not call replace signal.
+        If the order changes, the point is moved to its new index first, with move if available (otherwise replace
+            for each shifted point), thus, does not call replace signal for the shifted points.
+        Points with the same x-coordinate as new_point are not passed.
         :param series:
         :param idx_to_replace:
         :param new_point:
@@ -102,37 +166,213 @@ class InteractiveChartWidget(IQChartView):
         if series is None:
             series = self.scatterseries
 
-        # check if order changes
-        if idx_to_replace < series.count() - 1 and new_point.x() > series.at(idx_to_replace + 1).x():
-            # swap index with next one
-            if hasattr(series, "swap"):
-                series.swap(idx_to_replace, idx_to_replace+1)
+        x = self._sorted_x_coordinates_(series)
+        new_idx = idx_to_replace
+
+        # the point itself is left of new_point when moving right, and right of it when moving left
+        if idx_to_replace < len(x) - 1 and new_point.x() > x[idx_to_replace + 1]:
+            new_idx = int(np.searchsorted(x, new_point.x(), side="left")) - 1
+        elif idx_to_replace > 0 and new_point.x() < x[idx_to_replace - 1]:
+            new_idx = int(np.searchsorted(x, new_point.x(), side="right"))
+
+        if new_idx != idx_to_replace:
+            if hasattr(series, "move"):
+                series.move(idx_to_replace, new_idx)
             else:
-                series.replace(idx_to_replace, series.at(idx_to_replace+1))
-            series.replace(idx_to_replace + 1, new_point)
+                step = 1 if new_idx > idx_to_replace else -1
+                for i in range(idx_to_replace, new_idx, step):
+                    series.replace(i, series.at(i + step))
+
+        series.replace(new_idx, new_point)
+        return new_idx
+
+    def selected_point_indices(self) -> np.ndarray:
+        """
+        Returns the sorted indices of the selected points.
+        :return:
+        """
+        selected = np.isin(self.scatterseries.get_point_ids(), self.selected_point_ids)
+        return np.flatnonzero(selected)
+
+    def set_selected_point_indices(self, indices, extend: bool = False):
+        """
+        Selects the points with the given indices.
+        :param indices:
+        :param extend: Adds the points to the selection instead of replacing it.
+        :return:
+        """
+        ids = self.scatterseries.get_point_ids()[np.asarray(indices, dtype=np.int64)]
+        if extend:
+            ids = np.union1d(self.selected_point_ids, ids)
+        self.selected_point_ids = np.unique(ids)
+        self._sync_selection_()
+
+    def select_points_in_rect(self, corner1: QPointF, corner2: QPointF, extend: bool = False):
+        """
+        Selects the points in the rectangle between the two corners in value coordinates.
+        :param corner1:
+        :param corner2:
+        :param extend: Adds the points to the selection instead of replacing it.
+        :return:
+        """
+        x, y = self.scatterseries.get_points_as_arrays()
+        inside = points_in_rect(x, y, corner1.x(), corner1.y(), corner2.x(), corner2.y())
+        self.set_selected_point_indices(np.flatnonzero(inside), extend)
+
+    def select_points_in_polygon(self, polygon, extend: bool = False):
+        """
+        Selects the points in the polygon in value coordinates, e.g., of a lasso.
+        :param polygon: A (N, 2) array or a list of QPointF.
+        :param extend: Adds the points to the selection instead of replacing it.
+        :return:
+        """
+        x, y = self.scatterseries.get_points_as_arrays()
+        self.set_selected_point_indices(np.flatnonzero(points_in_polygon(x, y, polygon)), extend)
+
+    def clear_selection(self):
+        self.selected_point_ids = np.empty(0, dtype=np.int64)
+        self._sync_selection_()
 
-            return idx_to_replace + 1
-        if idx_to_replace > 0 and new_point.x() < series.at(idx_to_replace - 1).x():
-            if hasattr(series, "swap"):
-                series.swap(idx_to_replace, idx_to_replace-1)
+    def move_selected_points(self, dx: float, dy: float):
+        """
+        Moves all selected points by (dx, dy) with one series update and keeps the series sorted.
+        :param dx:
+        :param dy:
+        :return:
+        """
+        indices = self.selected_point_indices()
+        if len(indices) == 0:
+            return
+
+        x, y = self.scatterseries.get_points_as_arrays()
+        x, y = x.copy(), y.copy()
+        x[indices] += dx
+        y[indices] += dy
+        x, y = self._constrain_points_(x, y, indices)
+
+        order = np.argsort(x, kind="stable")
+        self.scatterseries.reorder(order, (x[order], y[order]))
+        self._sync_selection_()
+
+    def delete_selected_points(self):
+        """
+        Removes all selected points with one series update.
+        :return:
+        """
+        indices = self.selected_point_indices()
+        count = self.scatterseries.count()
+        if len(indices) == 0:
+            return
+
+        # move the selected points to the end first, s.t., they are removed as one range
+        keep = np.ones(count, dtype=bool)
+        keep[indices] = False
+
+        with self.scatterseries.batch_updates():
+            self.scatterseries.reorder(np.concatenate((np.flatnonzero(keep), indices)))
+            self.scatterseries.remove_range(count - len(indices), len(indices))
+
+        self.clear_selection()
+
+    def recolor_selected_points(self, color: QColor):
+        """
+        Sets the color of all selected points with one configuration update.
+        :param color:
+        :return:
+        """
+        self.scatterseries.set_ids_configuration_key_val(self.scatterseries.get_point_ids()[
+                                                             self.selected_point_indices()],
+                                                         QXYSeries.PointConfiguration.Color, color)
+
+    def _constrain_points_(self, x: np.ndarray, y: np.ndarray, indices: np.ndarray):
+        """
+        Returns the coordinates of all points after moving the points at indices, e.g., clamped to a range.
+        :param x:
+        :param y:
+        :param indices:
+        :return: (x, y)
+        """
+        return x, y
+
+    def _sync_selection_(self):
+        """
+        Shows the current selection in the scatter series.
+        :return:
+        """
+        self.scatterseries.deselectAllPoints()
+        indices = self.selected_point_indices()
+        if len(indices) > 0:
+            self.scatterseries.selectPoints(indices.tolist())
+
+    def _selection_mouse_moved_(self, event: QMouseEvent) -> bool:
+        """
+        Updates the rectangle or lasso while selecting, or drags the selection with the pressed point.
+        Returns True if the event was handled.
+        :param event:
+        :return:
+        """
+        if self._selection_mode is not None:
+            self._selection_path.append(event.localPos())
+            if self._selection_mode == "rect":
+                self._rubber_band.setGeometry(
+                    QRect(self._selection_path[0].toPoint(), event.localPos().toPoint()).normalized())
             else:
-                series.replace(idx_to_replace, series.at(idx_to_replace-1))
-            series.replace(idx_to_replace-1, new_point)
+                path = QPainterPath(self.mapToScene(self._selection_path[0].toPoint()))
+                for pos in self._selection_path[1:]:
+                    path.lineTo(self.mapToScene(pos.toPoint()))
+                self._lasso_item.setPath(path)
+            return True
+
+        if self.point_is_pressed_idx != -1 and event.buttons() == Qt.LeftButton and \
+                len(self.selected_point_ids) > 1 and self._pressed_point_id in self.selected_point_ids:
+            value = self.chart().mapToValue(event.localPos())
+            x, y = self.scatterseries.get_points_as_arrays()
+            self.move_selected_points(value.x() - x[self.point_is_pressed_idx],
+                                      value.y() - y[self.point_is_pressed_idx])
+
+            self.point_is_pressed_idx = self.scatterseries.get_idx_of_point_id(self._pressed_point_id)
+            self.point_was_pressed_idx = self.point_is_pressed_idx
+            return True
 
-            return idx_to_replace-1
+        return False
 
-        # no order changes necessary
-        series.replace(idx_to_replace, new_point)
-        return idx_to_replace
+    def _finish_selection_(self, event: QMouseEvent):
+        """
+        Selects the points in the rectangle or lasso.
+        :param event:
+        :return:
+        """
+        mode, path = self._selection_mode, self._selection_path + [event.localPos()]
+        self._selection_mode, self._selection_path = None, []
+        self._rubber_band.hide()
+        self._lasso_item.setVisible(False)
+
+        values = [self.chart().mapToValue(pos) for pos in path]
+        if mode == "rect":
+            self.select_points_in_rect(values[0], values[-1])
+        else:
+            self.select_points_in_polygon(values)
+
+    def keyPressEvent(self, event: QKeyEvent) -> None:
+        if event.key() in (Qt.Key_Delete, Qt.Key_Backspace) and len(self.selected_point_ids) > 0:
+            self.delete_selected_points()
+        elif event.key() == Qt.Key_Escape and len(self.selected_point_ids) > 0:
+            self.clear_selection()
+        else:
+            super().keyPressEvent(event)
 
     @Slot()
+    @instrumented
     def chart_moved(self, event: QMouseEvent):
         """
         Moves a point. Does not allow moving over other points.
         :param event:
         :return:
         """
-        printd("chart_moved:", self.point_is_pressed_idx, event)
+        if _trace.enabled:
+            _trace("chart_moved:", self.point_is_pressed_idx, event)
+        if self._selection_mouse_moved_(event):
+            return
         if self.point_is_pressed_idx != -1 and event.buttons() == Qt.LeftButton:
             # move point
             value = self.chart().mapToValue(event.localPos())
@@ -145,17 +385,25 @@ class InteractiveChartWidget(IQChartView):
             self.point_is_pressed_idx = -1
 
     @Slot()
+    @instrumented
     def chart_clicked(self, event):
-        printd("chart_clicked:", self.point_is_pressed_idx, self.point_was_pressed_idx, event)
+        if _trace.enabled:
+            _trace("chart_clicked:", self.point_is_pressed_idx, self.point_was_pressed_idx, event)
+        # clicks with the selection modifiers only select
+        if event.modifiers() & (Qt.ShiftModifier | Qt.ControlModifier):
+            return
+
         # add point at position (if click was not induced by point click)
         if self.point_was_pressed_idx == -1 and event.button() == Qt.LeftButton:
             value = self.chart().mapToValue(event.localPos())
             self.sorted_insert(value)
-            printd("added point", value, "\n")
+            if _trace.enabled:
+                _trace("added point", value, "\n")
         elif self.point_was_pressed_idx != -1 and event.button() == Qt.LeftButton:
             # remove point
             self.scatterseries.remove(self.point_was_pressed_idx)
-            printd("removed point idx", self.point_was_pressed_idx, "\n")
+            if _trace.enabled:
+                _trace("removed point idx", self.point_was_pressed_idx, "\n")
         else:
             # may need this since point_released is somehow not triggered with right-click
             if event.button() == Qt.RightButton:
@@ -164,33 +412,61 @@ class InteractiveChartWidget(IQChartView):
         # self.point_was_pressed_idx = -1  # chart_clicked is last execution of events, reset point was pressed
 
     @Slot()
+    @instrumented
     def chart_released(self, event):
         # self.point_is_pressed_idx = -1
-        printd("chart_released")
-        pass
+        if _trace.enabled:
+            _trace("chart_released")
+        if self._selection_mode is not None:
+            self._finish_selection_(event)
+        else:
+            # indices of the selected points may have changed
+            self._sync_selection_()
 
     @Slot()
+    @instrumented
     def chart_pressed(self, event):
-        printd("chart_pressed")
+        if _trace.enabled:
+            _trace("chart_pressed")
         self.point_was_pressed_idx = self.point_is_pressed_idx
+        self._pressed_point_id = -1 if self.point_is_pressed_idx == -1 else \
+            self.scatterseries.get_id_of_point_idx(self.point_is_pressed_idx)
+
+        if self.point_is_pressed_idx == -1 and event.button() == Qt.LeftButton and \
+                event.modifiers() & (Qt.ShiftModifier | Qt.ControlModifier):
+            self._selection_mode = "rect" if event.modifiers() & Qt.ShiftModifier else "lasso"
+            self._selection_path = [event.localPos()]
+            if self._selection_mode == "rect":
+                self._rubber_band.setGeometry(QRect(event.localPos().toPoint(), event.localPos().toPoint()))
+                self._rubber_band.show()
+            else:
+                self._lasso_item.setPath(QPainterPath())
+                self._lasso_item.setVisible(True)
 
     @Slot()
+    @instrumented
     def point_clicked(self, point: QPoint):
         """
         :param point:
         :return:
         """
-        printd("point_clicked:", point, self._moved, find_point_idx(point, self.scatterseries))
+        if _trace.enabled:
+            _trace("point_clicked:", point, self._moved, self.point_was_pressed_idx)
 
     @Slot()
+    @instrumented
     def point_pressed(self, point):
         # print("point_pressed", point)
-        idx = find_point_idx(point, self.scatterseries)
-        printd("point idx pressed:", point, idx)
+        # resolve the point within a few pixels, its coordinates may differ slightly from the stored ones
+        idx = self.point_idx_at(self.chart().mapToPosition(point, self.scatterseries))
+        if _trace.enabled:
+            _trace("point idx pressed:", point, idx)
         self.point_is_pressed_idx = idx
         self.point_was_pressed_idx = self.point_is_pressed_idx
 
     @Slot()
+    @instrumented
     def point_released(self, point):
-        printd("point released", point, find_point_idx(point, self.scatterseries))
+        if _trace.enabled:
+            _trace("point released", point, self.point_is_pressed_idx)
         self.point_is_pressed_idx = -1
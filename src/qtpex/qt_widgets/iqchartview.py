@@ -1,13 +1,18 @@
 import PySide6
 from PySide6.QtCharts import QChartView
-from PySide6.QtCore import Signal
+from PySide6.QtCore import QElapsedTimer, QTimer, Signal
 from PySide6.QtGui import QMouseEvent
 
+from qtpex.qt_utility.instrumentation import instrumented
+
 
 class IQChartView(QChartView):
     """
     A QChartView widget which exposes mouse_pressed, mouse_releases, and mouse_moved Signals that are triggered whenever
     the mouseMoveEvent, mousePressEvent, or mouseReleaseEvent listeners are called.
+
+    With mouse move coalescing enabled, mouse_moved_signal is triggered at most max_rate times per second with the
+    latest mouse move event, the ones in between are dropped. A pending move is delivered before press and release.
     """
     mouse_pressed_signal = Signal(QMouseEvent)
     mouse_released_signal = Signal(QMouseEvent)
@@ -19,16 +24,91 @@ class IQChartView(QChartView):
 
         self._moved = False
 
+        # mouse move coalescing, see set_mouse_move_coalescing
+        self._coalesce_mouse_moves = False
+        self._pending_mouse_move = None
+        self._dropped_mouse_moves = 0
+        self._last_mouse_move = QElapsedTimer()
+        self._mouse_move_interval = 16  # ms
+        self._mouse_move_timer = QTimer(self)
+        self._mouse_move_timer.setSingleShot(True)
+        self._mouse_move_timer.timeout.connect(self.flush_mouse_move)
+
+    def set_mouse_move_coalescing(self, enabled: bool = True, max_rate: float = None):
+        """
+        Enables or disables mouse move coalescing.
+        :param enabled:
+        :param max_rate: The maximum number of mouse_moved_signal per second.
+            Defaults to the refresh rate of the screen, i.e., once per display frame.
+        :return:
+        """
+        if max_rate is None:
+            max_rate = self.screen().refreshRate() if self.screen() is not None else 60.0
+        if max_rate <= 0:
+            raise ValueError("max_rate must be positive: {}".format(max_rate))
+
+        self._mouse_move_interval = max(1, round(1000 / max_rate))
+        self._coalesce_mouse_moves = enabled
+
+        if not enabled:
+            self.flush_mouse_move()
+
+    def mouse_move_coalescing(self) -> bool:
+        return self._coalesce_mouse_moves
+
+    def dropped_mouse_moves(self) -> int:
+        """
+        Returns the number of mouse move events that were dropped by coalescing since the last reset.
+        :return:
+        """
+        return self._dropped_mouse_moves
+
+    def reset_dropped_mouse_moves(self):
+        self._dropped_mouse_moves = 0
+
+    @instrumented
+    def flush_mouse_move(self):
+        """
+        Triggers mouse_moved_signal with the pending mouse move event, if there is one.
+        :return:
+        """
+        self._mouse_move_timer.stop()
+        event, self._pending_mouse_move = self._pending_mouse_move, None
+
+        if event is not None:
+            self._last_mouse_move.start()
+            self.mouse_moved_signal.emit(event)
+
+    @instrumented
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
         self._moved = True
         super().mouseMoveEvent(event)
-        self.mouse_moved_signal.emit(event)
 
+        if not self._coalesce_mouse_moves:
+            self.mouse_moved_signal.emit(event)
+            return
+
+        if self._pending_mouse_move is not None:
+            self._dropped_mouse_moves += 1
+        # qt reuses the event after this handler returns
+        self._pending_mouse_move = event.clone()
+
+        if not self._mouse_move_timer.isActive():
+            elapsed = self._last_mouse_move.elapsed() if self._last_mouse_move.isValid() \
+                else self._mouse_move_interval
+            if elapsed >= self._mouse_move_interval:
+                self.flush_mouse_move()
+            else:
+                self._mouse_move_timer.start(self._mouse_move_interval - elapsed)
+
+    @instrumented
     def mousePressEvent(self, event: QMouseEvent) -> None:
         self._moved = False
+        self.flush_mouse_move()
         super().mousePressEvent(event)
         self.mouse_pressed_signal.emit(event)
 
+    @instrumented
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         """
         Need to call super() before my own signal.
@@ -36,6 +116,7 @@ class IQChartView(QChartView):
         :param event:
         :return:
         """
+        self.flush_mouse_move()
         super().mouseReleaseEvent(event)
         self.mouse_released_signal.emit(event)
 
@@ -1,20 +1,26 @@
 import json
 
+import numpy as np
 import PySide6
-from PySide6.QtCharts import QXYSeries
-from PySide6.QtCore import Slot, QMargins, Qt, Signal
+from PySide6.QtCharts import QLineSeries, QXYSeries
+from PySide6.QtCore import Slot, QMargins, Qt, QTimer, Signal
 from PySide6.QtGui import QMouseEvent, QColor
 from PySide6.QtWidgets import QWidget, QColorDialog
 from typing import Union, Any
 
-from qtpex.qt_utility.interpolation import interpolate_colors
+from qtpex.qt_utility.color_spaces import COLOR_SPACES, SRGB, color_space_to_rgba, rgba_to_color_space
+from qtpex.qt_utility.instrumentation import instrumented
+from qtpex.qt_utility.interpolation import evaluate_piecewise_polynomial, piecewise_polynomial, unpack_argb
+from qtpex.qt_utility.lut import DEFAULT_CHUNK_SIZE, apply_lut, changed_x_range, lut_index_range
+from qtpex.qt_utility.series import set_series_points
+from qtpex.qt_utility.tracing import get_tracer
 from qtpex.qt_widgets.interactive_chart import InteractiveChartWidget
 from qtpex.qt_objects.configurable_line_series import ConfigurableLineSeries
+from qtpex.qt_objects.json_point_stream import json_points_to_columns
+from qtpex.qt_objects.point_configuration_store import PointConfigurationStore
 
 
-def printd(*args, **kwargs):
-    if not True:
-        print(*args, **kwargs)
+_trace = get_tracer("transferfunction_widget")
 
 
 class Interpolation:
@@ -27,15 +33,63 @@ class Interpolation:
 
 class InterpolationModes:
     LINEAR = Interpolation("linear")
+    PCHIP = Interpolation("pchip")  # monotone cubic, does not overshoot the points
+    CUBIC = Interpolation("cubic")  # natural cubic spline
+    STEP = Interpolation("step")  # the color of the point on the left
+    NEAREST = Interpolation("nearest")  # the color of the closest point
+
+    @staticmethod
+    def modes():
+        return [str(m) for m in vars(InterpolationModes).values() if isinstance(m, Interpolation)]
+
+
+class TransferFunctionChange:
+    """
+    Summarizes the changes of a TransferFunctionWidget between two emissions of its color_map_changed_signal.
+    The points are matched by id, e.g., a dragged point counts as moved, and also as recolored if its alpha changed.
+    """
+    __slots__ = ("points_added", "points_removed", "points_moved", "points_recolored", "settings_changed",
+                 "since_version", "version")
+
+    def __init__(self, points_added: int = 0, points_removed: int = 0, points_moved: int = 0,
+                 points_recolored: int = 0, settings_changed: bool = False, since_version: int = 0, version: int = 0):
+        self.points_added = points_added
+        self.points_removed = points_removed
+        self.points_moved = points_moved
+        self.points_recolored = points_recolored
+        # e.g., the color space changed
+        self.settings_changed = settings_changed
+        # the lut versions before and after the changes, e.g., for get_lut_update(since_version)
+        self.since_version = since_version
+        self.version = version
+
+    def is_empty(self) -> bool:
+        return self.points_added == self.points_removed == self.points_moved == self.points_recolored == 0 and \
+            not self.settings_changed
+
+    def __repr__(self):
+        return "TransferFunctionChange({})".format(", ".join("{}={}".format(k, getattr(self, k)) for k in self.__slots__))
 
 
 class TransferFunctionWidget(InteractiveChartWidget):
     changed_signal = Signal()  # fired when the something was changed that affects the resulting color map
+    # (TransferFunctionChange, whether the user is still interacting, e.g., dragging a point), fired at most once per
+    # event-loop iteration with the changes since the last time, and once more after the interaction ended
+    color_map_changed_signal = Signal(object, bool)
+
+    # the largest lookup table used by apply, e.g., one entry per value of 16-bit data
+    MAX_APPLY_LUT_SIZE = 2 ** 16
+
+    # the number of changes of the color map that are kept for get_changed_x_range
+    MAX_LUT_LOG_SIZE = 64
+
+    # the number of neighbors on each side whose segments change with a point, per interpolation mode
+    _CHANGE_REACH = {"linear": 1, "pchip": 2, "cubic": None, "step": 1, "nearest": 1}
 
     def __init__(self, interpolation_mode: Union[Interpolation, str], x_range=None, y_range=None, *, parent: QWidget = None):
         super().__init__(parent=parent)
 
-        if str(interpolation_mode) == str(InterpolationModes.LINEAR):
+        if str(interpolation_mode) in InterpolationModes.modes():
             self.interpolation_mode = str(interpolation_mode)
         else:
             self.interpolation_mode = InterpolationModes.LINEAR.mode
@@ -43,13 +97,14 @@ class TransferFunctionWidget(InteractiveChartWidget):
         # remove scatter series first to plot it above the others later
         self.chart().removeSeries(self.scatterseries)
 
-        self.line_series = None
-
+        # in linear mode, the line series mirrors the points, otherwise, it is sampled from the interpolation curve
         if self.interpolation_mode == InterpolationModes.LINEAR.mode:
             self.line_series = ConfigurableLineSeries()
-            self.chart().addSeries(self.line_series)
-            self.line_series.attachAxis(self.axis_x)
-            self.line_series.attachAxis(self.axis_y)
+        else:
+            self.line_series = QLineSeries()
+        self.chart().addSeries(self.line_series)
+        self.line_series.attachAxis(self.axis_x)
+        self.line_series.attachAxis(self.axis_y)
 
         # x and y range
         self.x_range = (0, 255) if x_range is None else x_range
@@ -93,11 +148,58 @@ class TransferFunctionWidget(InteractiveChartWidget):
         # default color
         self._default_color = QColor(Qt.black)
 
+        # the lookup tables by size and dtype, and the interpolation curve through the colors and y-coordinates of
+        # the points, see _get_curve_, cleared whenever the points or their colors change
+        self._lut_cache = dict()
+        self._lut_version = 0
+        self._curve = None
+
+        # the colors are interpolated in this color space, see set_color_space
+        self.color_space = SRGB
+
+        # the x-intervals of the changes of the color map after _lut_log_base as (version, x_min, x_max), and the
+        # points at the last logged version, see get_changed_x_range
+        self._lut_log = []
+        self._lut_log_base = 0
+        self._lut_snapshot = None
+        self._lut_snapshot_version = 0
+        self._lut_full_change = False
+
+        # samples the curve to the line series once per event-loop iteration
+        self._curve_timer = QTimer(self)
+        self._curve_timer.setSingleShot(True)
+        self._curve_timer.setInterval(0)
+        self._curve_timer.timeout.connect(self.update_curve)
+
+        # aggregates the changes for color_map_changed_signal, the points at its last emission are in _changed_state
+        self._changed_state = None
+        self._changed_version = 0
+        self._changed_settings = False
+        self._interacting = False
+        self._changed_while_interacting = False
+
+        self._changed_timer = QTimer(self)
+        self._changed_timer.setSingleShot(True)
+        self._changed_timer.setInterval(0)
+        self._changed_timer.timeout.connect(self._emit_color_map_changed_)
+
+        for signal in (self.scatterseries.pointAdded, self.scatterseries.pointRemoved,
+                       self.scatterseries.pointReplaced, self.scatterseries.pointsReplaced,
+                       self.scatterseries.pointsRemoved, self.scatterseries.swapped_signal,
+                       self.scatterseries.moved_signal, self.scatterseries.points_reordered_signal,
+                       self.scatterseries.points_inserted_signal, self.scatterseries.configuration_changed_signal):
+            signal.connect(self._invalidate_lut_)
+
         # connect signal to slots
         self.scatterseries.pointAdded.connect(self.point_added)
         self.scatterseries.pointRemoved.connect(self.point_removed)
         self.scatterseries.pointReplaced.connect(self.point_replaced)
         self.scatterseries.swapped_signal.connect(self.points_swapped)
+        self.scatterseries.moved_signal.connect(self.point_moved)
+        self.scatterseries.points_reordered_signal.connect(self.points_reordered)
+        self.scatterseries.points_inserted_signal.connect(self.points_inserted)
+        self.scatterseries.points_replaced_signal.connect(self.points_replaced)
+        self.scatterseries.pointsRemoved.connect(self.points_removed)
 
         # set default points (they are not deletable)
         ok = self._add_default_points_()
@@ -112,6 +214,15 @@ class TransferFunctionWidget(InteractiveChartWidget):
         # color selector
         self.mouse_clicked_signal.connect(self.open_color_picker)
 
+        self.changed_signal.connect(self._schedule_color_map_changed_)
+        self.mouse_pressed_signal.connect(self._interaction_started_)
+        self.mouse_released_signal.connect(self._interaction_finished_)
+
+        # the changes while setting up are not reported
+        self._changed_state = self._points_state_()
+        self._changed_version = self.lut_version()
+        self._changed_timer.stop()
+
     def _add_default_points_(self) -> bool:
         """
         Adds default points.
@@ -139,47 +250,85 @@ class TransferFunctionWidget(InteractiveChartWidget):
         Triggers changed_signal only once.
         :return:
         """
-        self.blockSignals(True)
-        for i in reversed(range(self.scatterseries.count())):
-            self.scatterseries.remove(i)
-
-        self._add_default_points_()
-        self.blockSignals(False)
-        self.changed_signal.emit()
+        self.set_tf_state(np.array(self.x_range, dtype=np.float64), np.array(self.y_range, dtype=np.float64))
 
-    def copy_from_other_tf_widget(self, other):
+    def get_tf_state(self):
+        """
+        Returns copies of the points and their QT compatible configurations as columns, see set_tf_state.
+        :return: (x, y, colors, sizes, flags)
         """
-        Removes own values, then adds the values from the other transfer function widget.
+        x, y = self.scatterseries.get_points_as_arrays()
+        return (x.copy(), y.copy()) + tuple(self.scatterseries.get_configuration_columns())
 
-        Triggers changed signal only once.
-        :param other:
+    def set_tf_state(self, x, y, colors=None, sizes=None, flags=None, extra_configurations=None):
+        """
+        Replaces all points and their configurations in one operation, e.g., to restore or synchronize transfer
+            functions. Points without a color get the default color.
+        If the number of points stays the same, the points keep their ids, s.t., synchronizing linked transfer functions
+            does not allocate new ids and get_changed_x_range stays narrow.
+        Triggers changed_signal only once.
+        :param x: The sorted x-coordinates.
+        :param y:
+        :param colors: Optional uint32 ARGB colors, see ConfigurableXYSeriesMixin.set_points_from_columns.
+        :param sizes: Optional float32 sizes.
+        :param flags: Optional uint8 flags, see PointConfigurationStore. Required to use colors and sizes.
+        :param extra_configurations: Optional dict of point index -> configuration dict with further entries, see
+            ConfigurableXYSeriesMixin.get_extra_configurations.
         :return:
         """
         prev_block_state = self.signalsBlocked()
         self.blockSignals(True)
-        for i in reversed(range(self.scatterseries.count())):
-            self.scatterseries.remove(i)
-
-        for idx in range(other.scatterseries.count()):
-            self.scatterseries.append(other.scatterseries.at(idx))
-            self.scatterseries.setPointConfiguration(idx, other.scatterseries.get_configuration_for_point_at_idx(idx))
+        with self.scatterseries.batch_updates():
+            if len(x) == self.scatterseries.count():
+                self._replace_tf_state_(x, y, colors, sizes, flags)
+            else:
+                self.scatterseries.set_points_from_columns(x, y, colors, sizes, flags)
+            for idx, conf in (extra_configurations or dict()).items():
+                self.scatterseries.set_id_configuration_for_point_at_idx(idx, conf)
         self.blockSignals(prev_block_state)
         self.changed_signal.emit()
 
-    def tf_from_json(self, json_string: str):
-        d = json.loads(json_string)
-        d["points"] = self.scatterseries.json_compatible_list_to_regular_point_list(d["points"])
+    def _replace_tf_state_(self, x, y, colors, sizes, flags):
+        """
+        Replaces the coordinates and configurations of the points in place, see set_tf_state.
+        :return:
+        """
+        count = len(x)
+        colors = np.zeros(count, dtype=np.uint32) if colors is None else np.array(colors, dtype=np.uint32)
+        sizes = np.zeros(count, dtype=np.float32) if sizes is None else np.asarray(sizes, dtype=np.float32)
+        flags = np.zeros(count, dtype=np.uint8) if flags is None else np.array(flags, dtype=np.uint8)
 
-        prev_block_state = self.signalsBlocked()
-        self.blockSignals(True)
-        for i in reversed(range(self.scatterseries.count())):
-            self.scatterseries.remove(i)
+        self.scatterseries.replace_many(0, (x, y))
 
-        for idx in range(len(d["points"])):
-            self.scatterseries.append(d["points"][idx]["x"], d["points"][idx]["y"])
-            self.scatterseries.setPointConfiguration(idx, d["points"][idx]["configuration"])
-        self.blockSignals(prev_block_state)
-        self.changed_signal.emit()
+        # the same default color with the alpha of the y-coordinate as for inserted points
+        without_color = np.flatnonzero((flags & PointConfigurationStore.HAS_COLOR) == 0)
+        alpha = np.round(self.get_points_alpha(without_color) * 255).astype(np.uint32)
+        colors[without_color] = (np.uint32(self._default_color.rgb()) & 0xffffff) | (alpha << 24)
+        flags[without_color] |= PointConfigurationStore.CONFIGURED | PointConfigurationStore.HAS_COLOR
+
+        self.scatterseries.set_configuration_columns(colors, sizes, flags)
+
+    def copy_from_other_tf_widget(self, other):
+        """
+        Replaces own values with the values from the other transfer function widget in one operation.
+
+        Triggers changed signal only once.
+        :param other:
+        :return:
+        """
+        self.set_tf_state(*other.get_tf_state(),
+                          extra_configurations=other.scatterseries.get_extra_configurations())
+
+    def tf_from_json(self, json_string: str):
+        """
+        Replaces the points of this transferfunction with the ones of a json representation as of tf_as_json in one
+            operation.
+        Triggers changed signal only once.
+        :param json_string:
+        :return:
+        """
+        columns = json_points_to_columns(json.loads(json_string)["points"])
+        self.set_tf_state(columns["x"], columns["y"], columns["colors"], columns["sizes"], columns["flags"])
 
     def tf_as_json(self) -> str:
         """
@@ -195,8 +344,57 @@ class TransferFunctionWidget(InteractiveChartWidget):
 
         return json.dumps(j)
 
+    def tf_save_json(self, file, chunk_size: int = 10000):
+        """
+        Writes the same json representation as tf_as_json to file, but chunk by chunk.
+        Keeps the peak memory bounded for transfer functions with many points.
+        :param file: A path or a text file object.
+        :param chunk_size:
+        :return:
+        """
+        self.scatterseries.save_json(file, chunk_size)
+
+    def tf_load_json(self, file, chunk_size: int = 10000):
+        """
+        Replaces the points of this transferfunction with the ones of a json representation as of tf_as_json.
+        Reads the file chunk by chunk and feeds the points in batches.
+        Triggers changed signal only once.
+        :param file: A path or a text file object.
+        :param chunk_size:
+        :return:
+        """
+        prev_block_state = self.signalsBlocked()
+        self.blockSignals(True)
+        self.scatterseries.load_json(file, chunk_size)
+        self.blockSignals(prev_block_state)
+        self.changed_signal.emit()
+
+    def tf_save_binary(self, file):
+        """
+        Saves the points of this transferfunction and their QT compatible configurations in a binary columnar format.
+        Much faster than tf_as_json for many points.
+        :param file: A path or a binary file object.
+        :return:
+        """
+        self.scatterseries.save_binary(file)
+
+    def tf_load_binary(self, file, mmap: bool = True):
+        """
+        Replaces the points of this transferfunction with the ones saved with tf_save_binary.
+        Triggers changed signal only once.
+        :param file: A path or a binary file object.
+        :param mmap: Memory-maps the file instead of reading it, if file is a path.
+        :return:
+        """
+        prev_block_state = self.signalsBlocked()
+        self.blockSignals(True)
+        self.scatterseries.load_binary(file, mmap)
+        self.blockSignals(prev_block_state)
+        self.changed_signal.emit()
+
     def resizeEvent(self, event:PySide6.QtGui.QResizeEvent) -> None:
         super(TransferFunctionWidget, self).resizeEvent(event)
+        self._schedule_curve_update_()
 
         size = event.size()
 
@@ -220,12 +418,296 @@ class TransferFunctionWidget(InteractiveChartWidget):
         """
         return self.scatterseries.get_configuration_for_point_at_idx(point_idx)[QXYSeries.PointConfiguration.Color]
 
+    def get_points_rgba(self) -> np.ndarray:
+        """
+        Returns the colors of all points ordered by index as float RGBA values in [0, 1].
+        Points without a color get the default color.
+        :return: (count, 4) float64 array.
+        """
+        return unpack_argb(self._get_points_argb_())
+
+    def _get_points_argb_(self) -> np.ndarray:
+        colors, _, flags = self.scatterseries.get_configuration_columns()
+        return np.where(flags & PointConfigurationStore.HAS_COLOR, colors, np.uint32(self._default_color.rgba()))
+
+    def lut_version(self) -> int:
+        """
+        Returns the version of the color map, which increases whenever the points or their colors change.
+        Consumers can skip updates, e.g., texture uploads, while the version stays the same, or update only what
+            changed since their version, see get_changed_x_range and get_lut_update.
+        :return:
+        """
+        self._update_lut_log_()
+        return self._lut_version
+
+    def _update_lut_log_(self):
+        """
+        Logs the x-interval of the changes since the last logged version by comparing the points to their snapshot.
+        :return:
+        """
+        if self._lut_snapshot is not None and self._lut_snapshot_version == self._lut_version:
+            return
+
+        state = (self.scatterseries.get_point_ids().copy(), self.scatterseries.get_points_as_arrays()[0].copy(),
+                 self.get_points_rgba())
+
+        # advance the snapshot first, s.t., a failing diff is not repeated on every call
+        snapshot, full_change = self._lut_snapshot, self._lut_full_change
+        self._lut_full_change = False
+        self._lut_snapshot, self._lut_snapshot_version = state, self._lut_version
+
+        if snapshot is None:
+            self._lut_log_base = self._lut_version
+            return
+
+        x_range = (-np.inf, np.inf)
+        if not full_change:
+            try:
+                x_range = changed_x_range(snapshot, state, self._CHANGE_REACH[self.interpolation_mode])
+            except ValueError:
+                pass
+
+        if x_range is not None:
+            self._lut_log.append((self._lut_version,) + tuple(x_range))
+        if len(self._lut_log) > self.MAX_LUT_LOG_SIZE:
+            self._lut_log_base = self._lut_log.pop(0)[0]
+
+    def get_changed_x_range(self, since_version: int):
+        """
+        Returns the x-interval in which the color map changed since a version of lut_version, e.g., to re-colorize only
+            the voxels with values in it.
+        :param since_version: A version of lut_version, or None for the whole color map.
+        :return: (x_min, x_max), the ends are infinite if the values beyond x_range changed too, or None if nothing
+            changed.
+        """
+        self._update_lut_log_()
+        if since_version is None or since_version < self._lut_log_base:
+            return -np.inf, np.inf
+
+        ranges = [(x_min, x_max) for version, x_min, x_max in self._lut_log if version > since_version]
+        if len(ranges) == 0:
+            return None
+        return min(r[0] for r in ranges), max(r[1] for r in ranges)
+
+    def get_lut_update(self, since_version: int, n: int = 256, dtype=np.uint8):
+        """
+        Returns the entries of the lookup table that changed since a version of lut_version, e.g., to upload only the
+            changed texels while the user drags a point.
+        :param since_version: A version of lut_version, or None for the whole table.
+        :param n: See get_lut.
+        :param dtype: See get_lut.
+        :return: (version, i0, i1, entries), the current version to pass next time, and the entries lut[i0:i1].
+        """
+        version = self.lut_version()
+        x_range = self.get_changed_x_range(since_version)
+        i0, i1 = (0, 0) if x_range is None else lut_index_range(x_range[0], x_range[1], n, *self.x_range)
+        return version, i0, i1, self.get_lut(n, dtype)[i0:i1]
+
+    @Slot()
+    def _invalidate_lut_(self):
+        self._lut_version += 1
+        self._lut_cache.clear()
+        self._curve = None
+        self._schedule_curve_update_()
+        self._schedule_color_map_changed_()
+
+    @Slot()
+    def _schedule_color_map_changed_(self):
+        if not self._changed_timer.isActive():
+            self._changed_timer.start()
+
+    @Slot()
+    def _interaction_started_(self):
+        self._interacting = True
+
+    @Slot()
+    def _interaction_finished_(self):
+        self._interacting = False
+        # listeners get a final emission without interaction, e.g., for a full-quality pass after previews
+        if self._changed_while_interacting:
+            self._schedule_color_map_changed_()
+
+    def _points_state_(self):
+        """
+        Returns copies of the ids, coordinates, and colors of the points to compare them later.
+        :return: (ids, x, y, uint32 ARGB colors)
+        """
+        x, y = self.scatterseries.get_points_as_arrays()
+        return self.scatterseries.get_point_ids().copy(), x.copy(), y.copy(), self._get_points_argb_()
+
+    @Slot()
+    def _emit_color_map_changed_(self):
+        """
+        Summarizes the changes since the last emission of color_map_changed_signal and emits it.
+        Does not emit without changes unless an interaction ended since the last emission.
+        :return:
+        """
+        # clear the pending state first, s.t., a failure here does not suppress later emissions
+        self._changed_timer.stop()
+        settings_changed, self._changed_settings = self._changed_settings, False
+
+        version = self.lut_version()
+        state = self._points_state_()
+        (ids_old, x_old, y_old, colors_old), (ids_new, x_new, y_new, colors_new) = self._changed_state, state
+
+        _, in_old, in_new = np.intersect1d(ids_old, ids_new, assume_unique=True, return_indices=True)
+        change = TransferFunctionChange(
+            points_added=len(ids_new) - len(in_new),
+            points_removed=len(ids_old) - len(in_old),
+            points_moved=int(np.count_nonzero((x_old[in_old] != x_new[in_new]) | (y_old[in_old] != y_new[in_new]))),
+            points_recolored=int(np.count_nonzero(colors_old[in_old] != colors_new[in_new])),
+            settings_changed=settings_changed,
+            since_version=self._changed_version,
+            version=version)
+
+        if change.is_empty() and (self._interacting or not self._changed_while_interacting):
+            return
+
+        self._changed_state, self._changed_version = state, version
+        self._changed_while_interacting = self._interacting
+        self.color_map_changed_signal.emit(change, self._interacting)
+
+    def set_color_space(self, space: str):
+        """
+        Sets the color space to interpolate the colors in, e.g., OKLAB or LAB for perceptually even color maps.
+        Triggers changed_signal.
+        :param space: One of qtpex.qt_utility.color_spaces.COLOR_SPACES.
+        :return:
+        """
+        if space not in COLOR_SPACES:
+            raise ValueError("unknown color space: {}".format(space))
+        self.color_space = space
+        self._lut_full_change = True
+        self._changed_settings = True
+        self._invalidate_lut_()
+        self.changed_signal.emit()
+
+    def _schedule_curve_update_(self):
+        if self.interpolation_mode != InterpolationModes.LINEAR.mode and not self._curve_timer.isActive():
+            self._curve_timer.start()
+
+    def _get_curve_(self):
+        """
+        Returns the piecewise polynomial of the interpolation mode through the colors and y-coordinates of the points.
+        It is computed once per change of the points or their colors.
+        :return: (breakpoints, coefficients) with the four channels of the colors in color_space and y, see
+            piecewise_polynomial.
+        """
+        if self._curve is None:
+            x, y = self.scatterseries.get_points_as_arrays()
+            colors = rgba_to_color_space(self.get_points_rgba(), self.color_space)
+            self._curve = piecewise_polynomial(x, np.column_stack((colors, y)), self.interpolation_mode)
+        return self._curve
+
+    @Slot()
+    def update_curve(self):
+        """
+        Samples the interpolation curve to the line series at about one point per pixel.
+        Does nothing in linear mode, where the line series mirrors the points.
+        :return:
+        """
+        self._curve_timer.stop()
+        if self.interpolation_mode == InterpolationModes.LINEAR.mode:
+            return
+
+        x = self.scatterseries.get_points_as_arrays()[0]
+        width = max(int(self.chart().plotArea().width()), 256)
+        samples = np.union1d(np.linspace(self.x_range[0], self.x_range[1], width), x)
+
+        breakpoints, coefficients = self._get_curve_()
+        y = evaluate_piecewise_polynomial(samples, breakpoints, coefficients[:, :, 4:])[:, 0]
+        set_series_points(self.line_series, samples, np.clip(y, self.y_range[0], self.y_range[1]))
+
+    def get_lut(self, n: int = 256, dtype=np.uint8) -> np.ndarray:
+        """
+        Returns the color map as lookup table with n entries, evenly spaced over x_range.
+        Evaluates the interpolation curve of all channels at once.
+        The tables are cached per size and dtype until the points or their colors change, see lut_version.
+        Any size works, e.g., 4096 or 65536 entries for 12-bit or 16-bit data.
+        :param n:
+        :param dtype: An integer type for values in [0, its maximum], e.g., np.uint8, or a float type for values in
+            [0, 1].
+        :return: (n, 4) RGBA array. It is read-only, since it is shared between calls.
+        """
+        key = (n, np.dtype(dtype).str)
+        lut = self._lut_cache.get(key)
+        if lut is None:
+            lut = self._compute_lut_(n, dtype)
+            lut.setflags(write=False)
+            self._lut_cache[key] = lut
+        return lut
+
+    def _compute_lut_(self, n: int, dtype) -> np.ndarray:
+        return self.map_values(np.linspace(self.x_range[0], self.x_range[1], n), dtype)
+
+    def map_values(self, values: np.ndarray, dtype=np.float32, out: np.ndarray = None) -> np.ndarray:
+        """
+        Maps data values in the units of x_range straight to colors of the transfer function, without a lookup table.
+        E.g., for 16-bit or float data, set x_range to the range of the data and map the data as it is.
+        Values outside of x_range get the color of the closest default point.
+        :param values: An array of any shape.
+        :param dtype: An integer type for values in [0, its maximum], e.g., np.uint8, or a float type for values in
+            [0, 1]. Ignored if out is given.
+        :param out: Optional C-contiguous array with the shape of values plus a last axis of 4 for the result.
+        :return: RGBA array with the shape of values plus a last axis of 4.
+        """
+        values = np.asarray(values)
+        if out is None:
+            out = np.empty(values.shape + (4,), dtype=dtype)
+        elif out.shape != values.shape + (4,) or not out.flags.c_contiguous:
+            raise ValueError("out has to be C-contiguous with shape {}, got: {}".format(values.shape + (4,), out.shape))
+
+        integer = np.issubdtype(out.dtype, np.integer)
+        direct = not integer and self.color_space == SRGB
+        breakpoints, coefficients = self._get_curve_()
+        colors = evaluate_piecewise_polynomial(values.ravel(), breakpoints, coefficients[:, :, :4],
+                                               out=out.reshape(-1, 4) if direct else None)
+
+        if self.color_space == SRGB:
+            # splines may overshoot
+            np.clip(colors, 0, 1, out=colors)
+        else:
+            color_space_to_rgba(colors, self.color_space, out=colors)
+
+        if integer:
+            colors *= np.iinfo(out.dtype).max
+            np.rint(colors, out=colors)
+            out.reshape(-1, 4)[:] = colors
+        elif not direct:
+            out.reshape(-1, 4)[:] = colors
+        return out
+
+    def apply(self, data: np.ndarray, out: np.ndarray = None, dtype=np.uint8, lut_size: int = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = None) -> np.ndarray:
+        """
+        Maps scalar data in the units of x_range, e.g., an image or a volume, to RGBA through the lookup table.
+        Works in chunks on a thread pool, also for memory-mapped data and output, see apply_lut.
+        :param data: An array of any shape, e.g., a np.memmap.
+        :param out: Optional array of the shape of data plus a last axis of 4, e.g., a np.memmap. Its dtype
+            overrides dtype.
+        :param dtype: The dtype of the colors, see get_lut.
+        :param lut_size: The number of entries of the lookup table. Defaults to one entry per integer in x_range for
+            integer data if there are at most MAX_APPLY_LUT_SIZE of them, otherwise to MAX_APPLY_LUT_SIZE.
+        :param chunk_size: The number of elements per chunk.
+        :param workers: The number of threads. Defaults to the number of cpus.
+        :return: out
+        """
+        lo, hi = self.x_range
+        if lut_size is None:
+            lut_size = self.MAX_APPLY_LUT_SIZE
+            if np.issubdtype(data.dtype, np.integer) and float(lo).is_integer() and float(hi).is_integer() and \
+                    hi - lo + 1 <= self.MAX_APPLY_LUT_SIZE:
+                lut_size = int(hi - lo) + 1
+
+        lut = self.get_lut(lut_size, dtype if out is None else out.dtype)
+        return apply_lut(data, lut, lo, hi, out, chunk_size, workers)
+
     def get_current_color_map(self):
         """
         Returns a list of colors for each value between 0 and 255.
         :return:
         """
-        return [self.get_current_color_for(x / 255) for x in range(256)]  # x takes 256 from [0, 1]
+        return [QColor.fromRgbF(*rgba) for rgba in self.get_lut(256, np.float64).tolist()]
 
     def get_current_color_for(self, x):
         """
@@ -233,35 +715,12 @@ class TransferFunctionWidget(InteractiveChartWidget):
         :param x: some values between including [0, 1].
         :return:
         """
-        left, right = 0, self.scatterseries.count() - 1
-
         assert 0 <= x <= 1, "x has to be between 0 and 1, got: {}".format(x)
 
         # map x to values from x_range
-        x = self.x_range[0] + x * self.x_range[1]
-
-        if x <= self.x_range[0]:
-            return self.get_point_color_with_idx(left)
-        if x >= self.x_range[1]:
-            return self.get_point_color_with_idx(right)
-
-        # get left and right of x
-        for i in range(0, self.scatterseries.count()):
-            if self.scatterseries.at(i).x() >= x:
-                left, right = (i - 1), i
-                break
-
-        left_color = self.get_point_color_with_idx(left)
-        right_color = self.get_point_color_with_idx(right)
+        x = self.x_range[0] + x * (self.x_range[1] - self.x_range[0])
 
-        # TODO: other interpolation methods
-        printd(left, right)
-        l = self.scatterseries.at(right).x() - self.scatterseries.at(left).x()
-        if l == 0:
-            l = 1
-        t = (x - self.scatterseries.at(left).x()) / float(l)
-
-        return interpolate_colors(left_color, right_color, t)
+        return QColor.fromRgbF(*self.map_values(np.float64(x), np.float64).tolist())
 
     def adjust_point_color_with_alpha(self, color: QColor, point_idx: int):
         """
@@ -283,7 +742,54 @@ class TransferFunctionWidget(InteractiveChartWidget):
         alpha = point.y() / (self.y_range[1] - self.y_range[0])
         return alpha
 
+    def get_points_alpha(self, indices) -> np.ndarray:
+        """
+        Returns the alpha values [0, 1] of the points at indices, see get_point_alpha.
+        :param indices:
+        :return:
+        """
+        y = self.scatterseries.get_points_as_arrays()[1][indices]
+        return np.clip(y / (self.y_range[1] - self.y_range[0]), 0, 1)
+
+    def _update_points_color_(self, indices, rgb) -> None:
+        """
+        Sets the color of the points at indices to rgb with the alpha value of their y-coordinate at once.
+        :param indices:
+        :param rgb: One uint32 RGB value for all points or one per point.
+        :return:
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        alpha = np.round(self.get_points_alpha(indices) * 255).astype(np.uint32)
+        colors = (np.asarray(rgb, dtype=np.uint32) & 0xffffff) | (alpha << 24)
+
+        self.scatterseries.set_ids_configuration_key_val(self.scatterseries.get_point_ids()[indices],
+                                                         QXYSeries.PointConfiguration.Color, colors)
+
+    def recolor_selected_points(self, color: QColor):
+        self._update_points_color_(self.selected_point_indices(), color.rgb())
+        self.changed_signal.emit()
+
+    def delete_selected_points(self):
+        # the default points are not deletable
+        indices = self.selected_point_indices()
+        self.set_selected_point_indices(indices[(indices > 0) & (indices < self.scatterseries.count() - 1)])
+        super().delete_selected_points()
+
+    def _constrain_points_(self, x: np.ndarray, y: np.ndarray, indices: np.ndarray):
+        """
+        Keeps the points in range and the x-coordinates of the default points.
+        :param x:
+        :param y:
+        :param indices:
+        :return:
+        """
+        x = np.clip(x, self.x_range[0], self.x_range[1])
+        y = np.clip(y, self.y_range[0], self.y_range[1])
+        x[0], x[-1] = self.x_range[0], self.x_range[1]
+        return x, y
+
     @Slot()
+    @instrumented
     def update_point_color(self, color: QColor, point_idx: int):
         """
         Updates the point color and y-value (transparency) based on the selected color.
@@ -319,7 +825,10 @@ class TransferFunctionWidget(InteractiveChartWidget):
 
             v = self.point_was_pressed_idx
 
-            color_picker.colorSelected.connect(lambda c: self.update_point_color(c, v))
+            if len(self.selected_point_ids) > 1 and self.scatterseries.get_id_of_point_idx(v) in self.selected_point_ids:
+                color_picker.colorSelected.connect(self.recolor_selected_points)
+            else:
+                color_picker.colorSelected.connect(lambda c: self.update_point_color(c, v))
 
             color_picker.show()
 
@@ -329,6 +838,7 @@ class TransferFunctionWidget(InteractiveChartWidget):
         # printd(self.get_current_color_for(155))
 
     @Slot(int)
+    @instrumented
     def point_added(self, idx: int):
         if self.interpolation_mode == InterpolationModes.LINEAR.mode:
             self.line_series.insert(idx, self.scatterseries.at(idx))
@@ -339,24 +849,107 @@ class TransferFunctionWidget(InteractiveChartWidget):
         # self.scatterseries.setPointConfiguration(idx, {"lolol": True})
         self.update_point_color(self.default_color, idx)
 
-        printd("point_added", idx, self.scatterseries.get_id_of_point_idx(idx))
-        printd(self.scatterseries.get_points_id_configuration())
+        if _trace.enabled:
+            _trace("point_added", idx, self.scatterseries.get_id_of_point_idx(idx))
+            _trace(self.scatterseries.get_points_id_configuration())
 
     @Slot(int)
+    @instrumented
     def point_removed(self, idx: int):
         if self.interpolation_mode == InterpolationModes.LINEAR.mode:
             self.line_series.remove(idx)
 
         self.changed_signal.emit()
         # printd("point_removed")
-        printd(self.tf_as_json())
+        if _trace.enabled:
+            _trace(self.tf_as_json())
 
     @Slot(int, int)
+    @instrumented
+    def points_inserted(self, idx: int, count: int):
+        """
+        Handles the bulk insertion of points into the scatter series.
+        Sets the default color for all new points without a color and triggers changed_signal once.
+        :param idx:
+        :param count:
+        :return:
+        """
+        if self.interpolation_mode == InterpolationModes.LINEAR.mode:
+            x, y = self.scatterseries.get_points_as_arrays()
+            self.line_series.insert_many(idx, (x[idx:idx + count], y[idx:idx + count]))
+
+        flags = self.scatterseries.get_configuration_columns()[2][idx:idx + count]
+        without_color = np.flatnonzero((flags & PointConfigurationStore.HAS_COLOR) == 0) + idx
+
+        # an empty dict would delete all configurations
+        if len(without_color) > 0:
+            self.scatterseries.setPointsConfiguration({
+                i: {QXYSeries.PointConfiguration.Color: self.adjust_point_color_with_alpha(self.default_color, i)}
+                for i in without_color.tolist()})
+
+        self.changed_signal.emit()
+
+    @Slot(int, int)
+    @instrumented
+    def points_replaced(self, idx: int, count: int):
+        """
+        Handles the bulk replacement of the coordinates of points of the scatter series.
+        Updates the alpha values of the replaced point colors and triggers changed_signal once.
+        :param idx:
+        :param count:
+        :return:
+        """
+        if self.interpolation_mode == InterpolationModes.LINEAR.mode:
+            x, y = self.scatterseries.get_points_as_arrays()
+            self.line_series.replace_many(idx, (x[idx:idx + count], y[idx:idx + count]))
+
+        colors, _, flags = self.scatterseries.get_configuration_columns()
+        colored = np.flatnonzero(flags[idx:idx + count] & PointConfigurationStore.HAS_COLOR) + idx
+        if len(colored) > 0:
+            self._update_points_color_(colored, colors[colored])
+
+        self.changed_signal.emit()
+
+    @Slot(int, int)
+    @instrumented
+    def points_removed(self, idx: int, count: int):
+        if self.interpolation_mode == InterpolationModes.LINEAR.mode:
+            self.line_series.remove_range(idx, count)
+
+        self.changed_signal.emit()
+
+    @Slot(int, int)
+    @instrumented
     def points_swapped(self, idx1: int, idx2: int):
         if self.interpolation_mode == InterpolationModes.LINEAR.mode:
             self.line_series.swap(idx1, idx2)
 
+    @Slot(int, int)
+    @instrumented
+    def point_moved(self, from_idx: int, to_idx: int):
+        if self.interpolation_mode == InterpolationModes.LINEAR.mode:
+            self.line_series.move(from_idx, to_idx)
+
+    @Slot(object)
+    @instrumented
+    def points_reordered(self, order):
+        """
+        Handles bulk moves and removals of the points of the scatter series.
+        Updates the alpha values of all point colors and triggers changed_signal once.
+        :param order:
+        :return:
+        """
+        if self.interpolation_mode == InterpolationModes.LINEAR.mode:
+            self.line_series.reorder(order, self.scatterseries.get_points_as_arrays())
+
+        colors, _, flags = self.scatterseries.get_configuration_columns()
+        colored = np.flatnonzero(flags & PointConfigurationStore.HAS_COLOR)
+        self._update_points_color_(colored, colors[colored])
+
+        self.changed_signal.emit()
+
     @Slot(int)
+    @instrumented
     def point_replaced(self, idx: int):
         if self.interpolation_mode == InterpolationModes.LINEAR.mode:
             self.line_series.replace(idx, self.scatterseries.at(idx))
@@ -366,11 +959,13 @@ class TransferFunctionWidget(InteractiveChartWidget):
         #                                                        self.get_point_color_with_idx(idx), idx)})
 
         self.update_point_color(self.get_point_color_with_idx(idx), idx)
-        printd("point_replaced", idx, self.scatterseries.get_id_of_point_idx(idx), self.adjust_point_color_with_alpha(
-                                                               self.get_point_color_with_idx(idx), idx))
-        printd(self.scatterseries.get_points_id_configuration())
+        if _trace.enabled:
+            _trace("point_replaced", idx, self.scatterseries.get_id_of_point_idx(idx), self.adjust_point_color_with_alpha(
+                   self.get_point_color_with_idx(idx), idx))
+            _trace(self.scatterseries.get_points_id_configuration())
 
     @Slot()
+    @instrumented
     def chart_clicked(self, event: QMouseEvent):
         """
         Don't allow values out of range.
@@ -390,6 +985,7 @@ class TransferFunctionWidget(InteractiveChartWidget):
             super().chart_clicked(event)
 
     @Slot()
+    @instrumented
     def chart_moved(self, event: QMouseEvent):
         """
         Don't allow values out of range.
@@ -398,6 +994,9 @@ class TransferFunctionWidget(InteractiveChartWidget):
         :param event:
         :return:
         """
+        if self._selection_mouse_moved_(event):
+            return
+
         value = self.chart().mapToValue(event.localPos())
 
         # adjust value to be still in range
@@ -0,0 +1,94 @@
+import io
+import struct
+
+import numpy as np
+import pytest
+
+from qtpex.qt_objects.binary_point_format import MAGIC, VERSION, read_point_columns, write_point_columns
+from qtpex.qt_objects.configurable_scatter_series import ConfigurableScatterSeries
+from qtpex.qt_objects.point_configuration_store import PointConfigurationStore
+
+
+@pytest.fixture
+def series(qapp):
+    n = 500
+    rng = np.random.default_rng(0)
+    flags = np.where(rng.random(n) < 0.7, PointConfigurationStore.CONFIGURED | PointConfigurationStore.HAS_COLOR
+                     | PointConfigurationStore.HAS_SIZE | PointConfigurationStore.HAS_VISIBILITY, 0).astype(np.uint8)
+    flags[::3] |= np.where(flags[::3] > 0, PointConfigurationStore.VISIBLE, 0).astype(np.uint8)
+
+    series = ConfigurableScatterSeries()
+    series.set_points_from_columns(rng.random(n), rng.random(n), rng.integers(0, 2 ** 32, n, dtype=np.uint32),
+                                   rng.uniform(1, 10, n).astype(np.float32), flags)
+    # the points are saved in index order, not in id order
+    series.move(0, n - 1)
+    series.reorder(rng.permutation(n))
+    return series
+
+
+def _assert_same_points_(expected, actual):
+    for e, a in zip(expected.get_points_as_arrays(), actual.get_points_as_arrays()):
+        np.testing.assert_array_equal(e, a)
+    for e, a in zip(expected.get_configuration_columns(), actual.get_configuration_columns()):
+        np.testing.assert_array_equal(e, a)
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip_through_a_path(series, tmp_path, mmap):
+    path = tmp_path / "points.qtpex"
+    series.save_binary(str(path))
+
+    loaded = ConfigurableScatterSeries()
+    loaded.load_binary(str(path), mmap=mmap)
+    _assert_same_points_(series, loaded)
+    assert np.all(np.diff(loaded.get_point_ids()) > 0)
+
+
+def test_round_trip_through_a_file_object(series):
+    buffer = io.BytesIO()
+    series.save_binary(buffer)
+    buffer.seek(0)
+
+    loaded = ConfigurableScatterSeries()
+    loaded.load_binary(buffer)
+    _assert_same_points_(series, loaded)
+
+
+def test_read_memory_maps_the_columns(tmp_path):
+    path = tmp_path / "points.qtpex"
+    x = np.arange(10, dtype=np.float64)
+    write_point_columns(str(path), x, -x, np.arange(10, dtype=np.uint32), np.ones(10, dtype=np.float32),
+                        np.zeros(10, dtype=np.uint8))
+
+    columns = read_point_columns(str(path))
+    assert all(isinstance(column, np.memmap) for column in columns.values())
+    np.testing.assert_array_equal(columns["y"], -x)
+    np.testing.assert_array_equal(columns["colors"], np.arange(10))
+
+    empty = tmp_path / "empty.qtpex"
+    write_point_columns(str(empty), [], [], [], [], [])
+    assert all(len(column) == 0 for column in read_point_columns(str(empty)).values())
+
+
+@pytest.mark.parametrize("header", [
+    struct.pack("<8sIQ12x", b"NOTQTPEX", VERSION, 0),
+    struct.pack("<8sIQ12x", MAGIC, VERSION + 1, 0),
+    MAGIC,
+])
+def test_rejects_invalid_headers(tmp_path, header):
+    path = tmp_path / "points.qtpex"
+    path.write_bytes(header)
+
+    with pytest.raises(ValueError):
+        read_point_columns(str(path))
+    with pytest.raises(ValueError):
+        read_point_columns(io.BytesIO(header))
+
+
+def test_rejects_truncated_columns():
+    buffer = io.BytesIO()
+    write_point_columns(buffer, np.arange(4.0), np.arange(4.0), np.zeros(4, np.uint32), np.zeros(4, np.float32),
+                        np.zeros(4, np.uint8))
+
+    with pytest.raises(ValueError):
+        read_point_columns(io.BytesIO(buffer.getvalue()[:-1]))
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from qtpex.qt_utility.color_spaces import COLOR_SPACES, LAB, LINEAR_SRGB, OKLAB, SRGB, color_space_to_rgba, \
+    rgba_to_color_space
+
+
+@pytest.mark.parametrize("space, rgba, expected", [
+    (LAB, [1.0, 1.0, 1.0, 1.0], [100.0, 0.0, 0.0, 1.0]),
+    (LAB, [0.0, 0.0, 0.0, 0.5], [0.0, 0.0, 0.0, 0.5]),
+    (LAB, [1.0, 0.0, 0.0, 1.0], [53.24, 80.09, 67.20, 1.0]),
+    (OKLAB, [1.0, 1.0, 1.0, 1.0], [1.0, 0.0, 0.0, 1.0]),
+    (OKLAB, [1.0, 0.0, 0.0, 1.0], [0.628, 0.225, 0.126, 1.0]),
+    (OKLAB, [0.0, 0.0, 1.0, 0.25], [0.452, -0.032, -0.312, 0.25]),
+    (LINEAR_SRGB, [0.5, 0.5, 0.5, 1.0], [0.214, 0.214, 0.214, 1.0]),
+    (SRGB, [0.2, 0.4, 0.6, 0.8], [0.2, 0.4, 0.6, 0.8]),
+])
+def test_reference_values(space, rgba, expected):
+    np.testing.assert_allclose(rgba_to_color_space(np.array([rgba]), space)[0], expected, atol=5e-3)
+
+
+@pytest.mark.parametrize("space", COLOR_SPACES)
+def test_round_trip(space):
+    rgba = np.random.default_rng(0).random((1000, 4))
+    rgba[:4, :3] = [[0, 0, 0], [1, 1, 1], [1, 0, 0], [0.04, 0.003, 0.5]]
+
+    values = rgba_to_color_space(rgba, space)
+    np.testing.assert_allclose(color_space_to_rgba(values, space), rgba, atol=1e-9)
+
+    out = np.empty_like(rgba)
+    assert color_space_to_rgba(values, space, out=out) is out
+    np.testing.assert_allclose(out, rgba, atol=1e-9)
+
+    in_place = values.copy()
+    assert color_space_to_rgba(in_place, space, out=in_place) is in_place
+    np.testing.assert_allclose(in_place, rgba, atol=1e-9)
+
+
+def test_unknown_color_space():
+    with pytest.raises(ValueError):
+        rgba_to_color_space(np.ones((1, 4)), "hsv")
+    with pytest.raises(ValueError):
+        color_space_to_rgba(np.ones((1, 4)), "hsv")
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from PySide6.QtCharts import QXYSeries
+from PySide6.QtGui import QColor
+
+from qtpex.qt_objects.configurable_line_series import ConfigurableLineSeries
+
+
+@pytest.fixture
+def series(qapp):
+    series = ConfigurableLineSeries()
+    x = np.arange(100000, dtype=np.float64)
+    series.append_many((x, np.sin(x)))
+    return series
+
+
+@pytest.mark.parametrize("method", [ConfigurableLineSeries.LOD_MINMAX, ConfigurableLineSeries.LOD_LTTB])
+def test_lod_displays_configured_points(series, method):
+    series.set_lod(True, method)
+    series.setPointConfiguration(12345, {QXYSeries.PointConfiguration.Color: QColor(255, 0, 0)})
+    series.update_lod()
+    series.flush_points_configuration()
+
+    displayed = series.get_displayed_point_indices()
+    assert len(displayed) < 100000
+    assert 12345 in displayed
+
+    displayed_idx = int(np.searchsorted(displayed, 12345))
+    conf = QXYSeries.pointConfiguration(series, displayed_idx)
+    assert conf[QXYSeries.PointConfiguration.Color] == QColor(255, 0, 0)
+
+
+def test_single_point_methods_raise_in_lod_mode(series):
+    series.set_lod(True)
+    ids = series.get_point_ids().copy()
+
+    with pytest.raises(RuntimeError):
+        series.append(1.0, 2.0)
+    with pytest.raises(RuntimeError):
+        series.remove(0)
+    with pytest.raises(RuntimeError):
+        series.replace(0, 1.0, 2.0)
+
+    np.testing.assert_array_equal(series.get_point_ids(), ids)
+
+    series.set_lod(False)
+    series.append(1.0, 2.0)
+    assert len(series.get_point_ids()) == 100001
@@ -0,0 +1,185 @@
+import numpy as np
+import pytest
+from PySide6.QtCharts import QXYSeries
+from PySide6.QtGui import QColor
+
+from qtpex.qt_objects.configurable_line_series import ConfigurableLineSeries
+from qtpex.qt_objects.configurable_scatter_series import ConfigurableScatterSeries
+from qtpex.qt_objects.point_configuration_store import PointConfigurationStore
+
+
+@pytest.fixture
+def series(qapp):
+    return ConfigurableScatterSeries()
+
+
+def _columns_(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    bits = rng.integers(0, 2, (5, n)).astype(bool)
+    flags = (PointConfigurationStore.CONFIGURED
+             | bits[0] * PointConfigurationStore.HAS_COLOR
+             | bits[1] * PointConfigurationStore.HAS_SIZE
+             | bits[2] * PointConfigurationStore.HAS_VISIBILITY
+             | (bits[2] & bits[3]) * PointConfigurationStore.VISIBLE)
+    flags = np.where(bits[4], flags, 0).astype(np.uint8)
+    colors = rng.integers(0, 2 ** 32, n, dtype=np.uint32)
+    sizes = rng.uniform(1, 10, n).astype(np.float32)
+    return colors, sizes, flags
+
+
+def _masked_columns_(series):
+    colors, sizes, flags = series.get_configuration_columns()
+    colors = np.where(flags & PointConfigurationStore.HAS_COLOR, colors, 0)
+    sizes = np.where(flags & PointConfigurationStore.HAS_SIZE, sizes, 0)
+    # json keeps an empty configuration for every point
+    return colors, sizes, flags & ~np.uint8(PointConfigurationStore.CONFIGURED)
+
+
+def _assert_qt_in_sync_(series):
+    x, y = series.get_points_as_arrays()
+    points = series.points()
+    np.testing.assert_array_equal([p.x() for p in points], x)
+    np.testing.assert_array_equal([p.y() for p in points], y)
+
+    keys = series.get_qt_point_configuration_keys()
+    expected = dict()
+    for idx in range(len(points)):
+        point_id = series.get_id_of_point_idx(idx)
+        if series._points_id_configuration.configured([point_id])[0]:
+            expected[idx] = series._points_id_configuration.get(point_id, keys)
+    assert QXYSeries.pointsConfiguration(series) == expected
+
+
+def test_chunked_appends_and_mid_inserts_keep_qt_in_sync(series):
+    added, replaced = [], []
+    series.pointAdded.connect(added.append)
+    series.pointsReplaced.connect(lambda: replaced.append(True))
+
+    x = np.arange(300, dtype=np.float64)
+    colors, sizes, flags = _columns_(300, 0)
+    for start in range(0, 300, 70):
+        chunk = slice(start, start + 70)
+        series.append_many((x[chunk], -x[chunk]))
+        series.set_ids_configuration_key_val(series.get_point_ids()[chunk], QXYSeries.PointConfiguration.Size,
+                                             sizes[chunk].tolist())
+        series.flush_points_configuration()
+        _assert_qt_in_sync_(series)
+
+    series.insert_many(5, (x[:3] + 0.5, x[:3]), (colors[:3], sizes[:3], flags[:3]))
+    series.flush_points_configuration()
+    _assert_qt_in_sync_(series)
+
+    assert added == []
+    assert len(replaced) == 6
+    assert len(series.points()) == 303
+
+
+def test_append_many_falls_back_for_non_finite_points(series):
+    series.append_many((np.arange(3.0), np.zeros(3)))
+    series.append_many((np.array([3.0, np.nan]), np.zeros(2)))
+
+    assert series.count() == len(series.get_point_ids()) == 5
+    assert np.isnan(series.get_points_as_arrays()[0][4])
+
+
+def test_append_many_in_lod_mode_updates_the_displayed_points(qapp):
+    series = ConfigurableLineSeries()
+    series.append_many((np.arange(10.0), np.zeros(10)))
+    series.set_lod(True)
+    series.append_many((np.arange(10.0, 20.0), np.ones(10)))
+
+    assert len(series.get_point_ids()) == 20
+    assert series.get_displayed_point_indices()[-1] == 19
+
+
+def test_chunked_json_round_trip(series, qapp, tmp_path):
+    n = 1000
+    x = np.linspace(0, 1, n)
+    series.set_points_from_columns(x, x ** 2, *_columns_(n, 1))
+    path = tmp_path / "points.json"
+    series.save_json(str(path), chunk_size=64)
+
+    loaded = ConfigurableScatterSeries()
+    replaced, inserted = [], []
+    loaded.pointsReplaced.connect(lambda: replaced.append(True))
+    loaded.points_inserted_signal.connect(lambda idx, count: inserted.append((idx, count)))
+    loaded.load_json(str(path), chunk_size=37)
+
+    assert len(replaced) == 1
+    assert inserted == [(0, n)]
+    np.testing.assert_array_equal(loaded.get_points_as_arrays()[0], x)
+    np.testing.assert_array_equal(loaded.get_points_as_arrays()[1], x ** 2)
+    for expected, actual in zip(_masked_columns_(series), _masked_columns_(loaded)):
+        np.testing.assert_array_equal(expected, actual)
+    assert np.count_nonzero(loaded.get_configuration_columns()[2] & PointConfigurationStore.HAS_VISIBILITY) > 0
+    _assert_qt_in_sync_(loaded)
+
+
+@pytest.mark.parametrize("from_idx, to_idx", [(3, 10), (10, 3), (0, 199), (199, 0)])
+def test_move_keeps_qt_in_sync(series, from_idx, to_idx):
+    x = np.arange(200, dtype=np.float64)
+    series.set_points_from_columns(x, -x, *_columns_(200, 2))
+    ids = series.get_point_ids().tolist()
+    columns = series.get_configuration_columns()
+
+    replaced, single = [], []
+    series.pointsReplaced.connect(lambda: replaced.append(True))
+    series.pointReplaced.connect(single.append)
+    series.move(from_idx, to_idx)
+    series.flush_points_configuration()
+
+    ids.insert(to_idx, ids.pop(from_idx))
+    assert series.get_point_ids().tolist() == ids
+    expected_x = x.tolist()
+    expected_x.insert(to_idx, expected_x.pop(from_idx))
+    np.testing.assert_array_equal(series.get_points_as_arrays()[0], expected_x)
+
+    order = np.arange(200).tolist()
+    order.insert(to_idx, order.pop(from_idx))
+    for expected, actual in zip(columns, series.get_configuration_columns()):
+        np.testing.assert_array_equal(expected[order], actual)
+
+    assert len(replaced) == 1 and single == []
+    _assert_qt_in_sync_(series)
+
+
+@pytest.mark.parametrize("n_changes", [5, 32, 33, 80, 150])
+def test_batched_changes_are_flushed_once_like_per_point_updates(series, qapp, n_changes):
+    # up to _MAX_SINGLE_CONFIGURATION_UPDATES changed indices are pushed one by one, more with one bulk update.
+    # The reference pushes every change right away.
+    reference = ConfigurableScatterSeries()
+    x = np.arange(200, dtype=np.float64)
+    series.append_many((x, x))
+    reference.append_many((x, x))
+
+    color, size = QXYSeries.PointConfiguration.Color, QXYSeries.PointConfiguration.Size
+    for idx in range(0, 200, 10):
+        for s in (series, reference):
+            s.setPointConfiguration(idx, {color: QColor(0, 255, 0), size: 4.0})
+    series.flush_points_configuration()
+    reference.flush_points_configuration()
+
+    rng = np.random.default_rng(n_changes)
+    changed = rng.choice(200, n_changes, replace=False).tolist()
+    pushes, flushes = [], []
+    series.pointsConfigurationChanged.connect(lambda: pushes.append(True))
+    flush = series.flush_points_configuration
+    series.flush_points_configuration = lambda: (flushes.append(True), flush())
+
+    with series.batch_updates():
+        for i, idx in enumerate(changed):
+            conf = {color: QColor(i, 0, 255 - i)} if i % 3 else {size: float(i), color: QColor(255, i, 0)}
+            series.setPointConfiguration(idx, conf)
+            reference.setPointConfiguration(idx, conf)
+            reference.flush_points_configuration()
+        for idx in changed[:3]:
+            series.setPointConfigurationKeyVal(idx, size, 9.0)
+            reference.setPointConfigurationKeyVal(idx, size, 9.0)
+            reference.flush_points_configuration()
+        assert pushes == []
+
+    assert len(flushes) == 1
+    assert len(pushes) == (n_changes if n_changes <= ConfigurableScatterSeries._MAX_SINGLE_CONFIGURATION_UPDATES
+                           else 1)
+    assert QXYSeries.pointsConfiguration(series) == QXYSeries.pointsConfiguration(reference)
+    _assert_qt_in_sync_(series)
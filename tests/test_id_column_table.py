@@ -0,0 +1,60 @@
+import numpy as np
+from PySide6.QtCharts import QXYSeries
+
+from qtpex.qt_objects.id_column_table import IdColumnTable
+from qtpex.qt_objects.point_configuration_store import PointConfigurationStore
+from qtpex.qt_objects.point_spatial_index import PointSpatialIndex
+
+
+def test_slots_follow_adds_and_releases():
+    table = IdColumnTable({"value": np.int64})
+    rng = np.random.default_rng(0)
+    reference = dict()
+
+    for _ in range(200):
+        ids = rng.integers(0, 500, 20)
+        slots = table.add(ids)
+        table["value"][slots] = ids * 2
+        reference.update((i, i * 2) for i in ids.tolist())
+
+        released = rng.integers(0, 500, 20)
+        table.release(released)
+        for i in released.tolist():
+            reference.pop(i, None)
+
+        queried = np.arange(500)
+        slots = table.slots(queried)
+        assert len(table) == len(reference)
+        assert set(queried[slots >= 0].tolist()) == set(reference)
+        np.testing.assert_array_equal(table["value"][slots[slots >= 0]], queried[slots >= 0] * 2)
+        assert all(table.slot(i) == s for i, s in zip(queried.tolist(), slots.tolist()))
+
+
+def test_store_compacts_with_increasing_ids():
+    store = PointConfigurationStore()
+    color = QXYSeries.PointConfiguration.Color
+
+    for start in range(0, 100000, 100):
+        ids = np.arange(start, start + 100)
+        store.set_key_for_ids(ids, color, 0xff00ff00)
+        store.delete_many(ids[:-1] if start < 99900 else [])
+
+    assert len(store) == 999 + 100
+    assert store._table.size < 4 * len(store)
+    assert 99950 in store and 99899 in store and 99898 not in store
+    assert store.get(99950)[color].rgba() == 0xff00ff00
+
+
+def test_spatial_index_compacts_with_increasing_ids():
+    index = PointSpatialIndex()
+
+    for start in range(0, 100000, 100):
+        ids = np.arange(start, start + 100)
+        index.set(ids, ids.astype(np.float64), np.zeros(100))
+        assert index.nearest(start + 50.2, 0, 0.5) == start + 50
+        index.remove(ids)
+
+    index.set([5, 100005], [5.0, 6.0], [0.0, 0.0])
+    assert len(index) == 2
+    assert index._points.size < 64
+    assert index.nearest(5.9, 0, 0.5) == 100005
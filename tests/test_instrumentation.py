@@ -0,0 +1,85 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from qtpex.qt_utility.instrumentation import BUCKET_BOUNDS_US, dump_latency_stats, enable_instrumentation, \
+    get_latency_stats, instrumentation_enabled, instrumented, reset_latency_stats
+
+
+@pytest.fixture
+def instrumentation():
+    enabled = instrumentation_enabled()
+    reset_latency_stats()
+    yield
+    enable_instrumentation(enabled)
+    reset_latency_stats()
+
+
+@instrumented
+def _handler_(value):
+    return value + 1
+
+
+@instrumented(name="test_instrumentation.named")
+def _named_handler_():
+    pass
+
+
+def test_records_only_while_enabled(instrumentation):
+    enable_instrumentation(False)
+    assert _handler_(1) == 2
+    assert get_latency_stats() == {}
+
+    enable_instrumentation(True)
+    for i in range(5):
+        _handler_(i)
+    _named_handler_()
+
+    stats = get_latency_stats()
+    assert set(stats) == {_handler_.__qualname__, "test_instrumentation.named"}
+    handler = stats[_handler_.__qualname__]
+    assert handler["count"] == 5
+    assert sum(handler["buckets"]) == 5
+    assert len(handler["buckets"]) == len(BUCKET_BOUNDS_US) + 1
+    assert 0 <= handler["min_s"] <= handler["p50_s"] <= handler["max_s"]
+
+
+def test_records_calls_that_raise(instrumentation):
+    enable_instrumentation(True)
+
+    @instrumented(name="test_instrumentation.raises")
+    def raises():
+        raise RuntimeError()
+
+    with pytest.raises(RuntimeError):
+        raises()
+    assert get_latency_stats()["test_instrumentation.raises"]["count"] == 1
+
+
+def test_dump_writes_valid_json(instrumentation, tmp_path):
+    enable_instrumentation(True)
+    _handler_(1)
+
+    path = tmp_path / "latency.json"
+    dump_latency_stats(str(path))
+    with open(path) as f:
+        dumped = json.load(f)
+    assert dumped["handlers"][_handler_.__qualname__]["count"] == 1
+    assert isinstance(dumped["time"], float)
+    assert not os.path.exists("{}.tmp".format(path))
+
+    buffer = io.StringIO()
+    dump_latency_stats(buffer)
+    assert json.loads(buffer.getvalue())["handlers"] == dumped["handlers"]
+
+
+@pytest.mark.parametrize("value, expected", [("1", True), ("0", False), ("", False)])
+def test_environment_enables_instrumentation(value, expected):
+    code = "from qtpex.qt_utility.instrumentation import instrumentation_enabled\nprint(instrumentation_enabled())"
+    env = dict(os.environ, QTPEX_INSTRUMENT=value, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == str(expected)
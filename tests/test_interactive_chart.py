@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from PySide6.QtCharts import QXYSeries
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QColor
+
+from qtpex.qt_objects.point_configuration_store import PointConfigurationStore
+from qtpex.qt_widgets.interactive_chart import InteractiveChartWidget
+
+
+def test_point_pressed_resolves_nearby_point(qapp):
+    chart = InteractiveChartWidget()
+    chart.axis_x.setRange(0, 100)
+    chart.axis_y.setRange(0, 100)
+    chart.resize(400, 300)
+    chart.show()
+    qapp.processEvents()
+
+    for x in (10, 50, 90):
+        chart.scatterseries.append(x, 50)
+
+    chart.scatterseries.pressed.emit(QPointF(50.01, 49.99))
+    assert chart.point_is_pressed_idx == 1
+
+    chart.scatterseries.pressed.emit(QPointF(70, 50))
+    assert chart.point_is_pressed_idx == -1
+
+
+@pytest.fixture
+def grid_chart(qapp):
+    chart = InteractiveChartWidget()
+    x, y = np.meshgrid(np.arange(10, dtype=np.float64), np.arange(10, dtype=np.float64), indexing="ij")
+    chart.scatterseries.append_many((x.ravel(), y.ravel()))
+    return chart
+
+
+def test_lasso_selects_with_the_even_odd_rule(grid_chart):
+    # a U shape whose notch covers x in (3, 6) for y > 3
+    u_shape = np.array([[0.5, 0.5], [8.5, 0.5], [8.5, 8.5], [6.5, 8.5], [6.5, 3.5], [2.5, 3.5], [2.5, 8.5],
+                        [0.5, 8.5]])
+    grid_chart.select_points_in_polygon(u_shape)
+
+    x, y = grid_chart.scatterseries.get_points_as_arrays()
+    selected = np.zeros(len(x), dtype=bool)
+    selected[grid_chart.selected_point_indices()] = True
+    in_bounds = (x >= 1) & (x <= 8) & (y >= 1) & (y <= 8)
+    in_notch = (x >= 3) & (x <= 6) & (y >= 4)
+    np.testing.assert_array_equal(selected, in_bounds & ~in_notch)
+
+    # the center of a pentagram is enclosed twice, thus, outside with the even-odd rule
+    angles = np.pi / 2 + np.arange(5) * 4 * np.pi / 5
+    star = np.column_stack((4.5 + 4.4 * np.cos(angles), 4.5 + 4.4 * np.sin(angles)))
+    grid_chart.select_points_in_polygon([QPointF(px, py) for px, py in star])
+    selected = grid_chart.selected_point_indices()
+    assert len(selected) > 0
+    assert not np.any((np.abs(x[selected] - 4.5) < 1) & (np.abs(y[selected] - 4.5) < 1))
+
+
+def test_recolor_selected_points(grid_chart):
+    grid_chart.set_selected_point_indices([3, 17, 42])
+    grid_chart.recolor_selected_points(QColor(255, 0, 0))
+    grid_chart.scatterseries.flush_points_configuration()
+
+    colors, _, flags = grid_chart.scatterseries.get_configuration_columns()
+    assert np.flatnonzero(flags & PointConfigurationStore.HAS_COLOR).tolist() == [3, 17, 42]
+    assert np.all(colors[[3, 17, 42]] == QColor(255, 0, 0).rgba())
+    for idx in (3, 17, 42):
+        conf = QXYSeries.pointConfiguration(grid_chart.scatterseries, idx)
+        assert conf[QXYSeries.PointConfiguration.Color] == QColor(255, 0, 0)
+
+
+def test_selection_survives_deleting_unselected_points(grid_chart):
+    series = grid_chart.scatterseries
+    grid_chart.set_selected_point_indices([20, 55, 90])
+    x, y = series.get_points_as_arrays()
+    selected_points = [(x[i], y[i]) for i in (20, 55, 90)]
+
+    series.remove_range(0, 10)
+    series.remove(30)
+
+    indices = grid_chart.selected_point_indices()
+    assert indices.tolist() == [10, 44, 79]
+    x, y = series.get_points_as_arrays()
+    assert [(x[i], y[i]) for i in indices] == selected_points
+
+    grid_chart.delete_selected_points()
+    assert series.count() == 86
+    assert len(grid_chart.selected_point_ids) == 0
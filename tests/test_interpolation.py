@@ -0,0 +1,21 @@
+import numpy as np
+
+from qtpex.qt_utility.interpolation import evaluate_piecewise_polynomial, piecewise_polynomial
+
+
+def test_step_is_right_continuous():
+    x = np.array([0.0, 10.0, 20.0, 30.0])
+    values = np.array([[0.0], [1.0], [2.0], [3.0]])
+
+    samples = np.array([-5.0, 0.0, 9.999, 10.0, 15.0, 20.0, 29.999, 30.0, 35.0])
+    result = evaluate_piecewise_polynomial(samples, *piecewise_polynomial(x, values, "step"))[:, 0]
+    np.testing.assert_array_equal(result, [0, 0, 0, 1, 1, 2, 2, 3, 3])
+
+
+def test_step_with_duplicate_x_jumps_to_the_last_duplicate():
+    x = np.array([0.0, 0.0, 10.0, 10.0, 20.0])
+    values = np.array([[0.0], [1.0], [2.0], [3.0], [4.0]])
+
+    samples = np.array([0.0, 5.0, 10.0, 15.0, 20.0])
+    result = evaluate_piecewise_polynomial(samples, *piecewise_polynomial(x, values, "step"))[:, 0]
+    np.testing.assert_array_equal(result, [1, 1, 3, 3, 4])
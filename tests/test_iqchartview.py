@@ -0,0 +1,50 @@
+from PySide6.QtCharts import QChart
+from PySide6.QtCore import QEvent, QPointF, Qt
+from PySide6.QtGui import QMouseEvent
+
+from qtpex.qt_widgets.interactive_chart import InteractiveChartWidget
+from qtpex.qt_widgets.iqchartview import IQChartView
+
+
+def _move_event_(x: float, y: float) -> QMouseEvent:
+    return QMouseEvent(QEvent.MouseMove, QPointF(x, y), QPointF(x, y), Qt.NoButton, Qt.NoButton, Qt.NoModifier)
+
+
+def test_coalescing_drops_moves_and_flush_delivers_the_latest(qapp):
+    view = IQChartView(QChart())
+    moves = []
+    view.mouse_moved_signal.connect(lambda event: moves.append(event.position()))
+    view.set_mouse_move_coalescing(True, max_rate=1)
+
+    for i in range(5):
+        view.mouseMoveEvent(_move_event_(i, 2 * i))
+
+    # the first move is delivered right away, the next one is pending and replaces the three in between
+    assert moves == [QPointF(0, 0)]
+    assert view.dropped_mouse_moves() == 3
+
+    view.flush_mouse_move()
+    assert moves == [QPointF(0, 0), QPointF(4, 8)]
+
+    view.flush_mouse_move()
+    assert len(moves) == 2
+
+    view.reset_dropped_mouse_moves()
+    assert view.dropped_mouse_moves() == 0
+
+
+def test_moves_are_delivered_without_coalescing(qapp):
+    view = IQChartView(QChart())
+    moves = []
+    view.mouse_moved_signal.connect(lambda event: moves.append(event.position()))
+
+    for i in range(5):
+        view.mouseMoveEvent(_move_event_(i, i))
+
+    assert len(moves) == 5
+    assert view.dropped_mouse_moves() == 0
+
+
+def test_interactive_chart_coalescing_is_opt_in(qapp):
+    assert not InteractiveChartWidget().mouse_move_coalescing()
+    assert InteractiveChartWidget(coalesce_mouse_moves=True).mouse_move_coalescing()
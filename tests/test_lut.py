@@ -0,0 +1,17 @@
+import numpy as np
+
+from qtpex.qt_utility.lut import changed_x_range
+
+
+def test_changed_x_range_without_common_ids():
+    old = (np.array([0, 1]), np.array([0.0, 255.0]), np.zeros((2, 4)))
+    new = (np.array([2, 3]), np.array([0.0, 255.0]), np.zeros((2, 4)))
+    assert changed_x_range(old, new) == (-np.inf, np.inf)
+
+
+def test_changed_x_range_of_moved_point():
+    ids = np.array([0, 1, 2, 3])
+    old = (ids, np.array([0.0, 10.0, 20.0, 30.0]), np.zeros((4, 4)))
+    new = (ids, np.array([0.0, 12.0, 20.0, 30.0]), np.zeros((4, 4)))
+    assert changed_x_range(old, new, reach=1) == (0.0, 20.0)
+    assert changed_x_range(old, old, reach=1) is None
@@ -0,0 +1,43 @@
+import numpy as np
+
+from qtpex.qt_objects.point_id_store import PointIdStore
+
+
+def _assert_lookups_(store: PointIdStore, removed=()):
+    ids = store.ids()
+    assert [store.index_of(i) for i in ids.tolist()] == list(range(len(store)))
+    for point_id in removed:
+        assert store.index_of(point_id) == -1
+
+
+def test_lookups_after_mid_inserts_and_removes():
+    store = PointIdStore(capacity=4)
+    store.insert(0, 10)
+    store.insert(3, 5)
+    _assert_lookups_(store)
+    assert store.index_of(10) == 3 and store.index_of(3) == 8
+
+    removed = store.remove(2, 4)
+    _assert_lookups_(store, removed.tolist())
+
+    store.insert(len(store), 3)
+    store.remove(0, 1)
+    store.insert(1, 2)
+    _assert_lookups_(store, [0] + removed.tolist())
+    assert store.index_of(store.next_id) == -1
+    assert store.index_of(-1) == -1
+
+
+def test_lookups_after_swap_move_and_permute():
+    store = PointIdStore()
+    store.insert(0, 8)
+    store.swap(1, 6)
+    store.move(0, 5)
+    store.move(7, 2)
+    _assert_lookups_(store)
+
+    order = np.random.default_rng(0).permutation(len(store))
+    expected = store.ids()[order].copy()
+    store.permute(order)
+    assert np.array_equal(store.ids(), expected)
+    _assert_lookups_(store)
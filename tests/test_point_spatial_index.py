@@ -0,0 +1,45 @@
+import numpy as np
+
+from qtpex.qt_objects.point_spatial_index import PointSpatialIndex
+
+
+def _brute_force_nearest_(points: dict, x: float, y: float, tolerance: float) -> int:
+    best, best_distance = -1, np.inf
+    for point_id, (px, py) in points.items():
+        if abs(px - x) <= tolerance and abs(py - y) <= tolerance:
+            distance = ((px - x) / tolerance) ** 2 + ((py - y) / tolerance) ** 2
+            if distance <= 1 and distance < best_distance:
+                best, best_distance = point_id, distance
+    return best
+
+
+def test_nearest_matches_brute_force_while_merging_the_overlay():
+    rng = np.random.default_rng(0)
+    index = PointSpatialIndex()
+    ids = np.arange(5000)
+    x, y = rng.random(5000), rng.random(5000)
+    index.reset(ids, x, y)
+    points = dict(zip(ids.tolist(), zip(x.tolist(), y.tolist())))
+    next_id = 5000
+
+    for _ in range(300):
+        moved = rng.choice(list(points), 3, replace=False)
+        mx, my = rng.random(3), rng.random(3)
+        index.set(moved, mx, my)
+        points.update(zip(moved.tolist(), zip(mx.tolist(), my.tolist())))
+        assert index.nearest(mx[0], my[0], 1e-12) == moved[0]
+
+        removed = rng.choice(list(points))
+        index.remove(removed)
+        del points[removed]
+
+        nx, ny = rng.random(2)
+        index.set(next_id, nx, ny)
+        points[next_id] = (nx, ny)
+        next_id += 1
+
+        qx, qy = rng.random(2)
+        assert index.nearest(qx, qy, 0.02) == _brute_force_nearest_(points, qx, qy, 0.02)
+
+        # the overlay is merged into the grid instead of growing until the grid is rebuilt
+        assert len(index._overlay) <= index.MAX_OVERLAY_SIZE + 5
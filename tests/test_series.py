@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+from PySide6.QtCharts import QXYSeries
+from PySide6.QtGui import QColor
+
+from qtpex.qt_objects.configurable_line_series import ConfigurableLineSeries
+from qtpex.qt_objects.point_configuration_store import PointConfigurationStore
+from qtpex.qt_utility.series import set_series_points
+
+
+@pytest.mark.parametrize("count", [3, 5, 2])
+def test_set_series_points_keeps_configurations(qapp, count):
+    series = ConfigurableLineSeries()
+    series.append_many((np.arange(3.0), np.zeros(3)))
+    series.setPointConfiguration(1, {QXYSeries.PointConfiguration.Color: QColor(255, 0, 0)})
+
+    set_series_points(series, np.arange(count) + 0.5, np.ones(count))
+
+    np.testing.assert_array_equal(series.get_points_as_arrays()[0], np.arange(count) + 0.5)
+    colors, _, flags = series.get_configuration_columns()
+    np.testing.assert_array_equal(np.flatnonzero(flags & PointConfigurationStore.HAS_COLOR), [1])
+    assert colors[1] == QColor(255, 0, 0).rgba()
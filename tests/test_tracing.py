@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from qtpex.qt_utility.tracing import ALL_CATEGORIES, disable_tracing, enable_tracing, get_tracer, lazy
+
+
+@pytest.fixture
+def tracer():
+    yield get_tracer("test_tracing")
+    disable_tracing("test_tracing", ALL_CATEGORIES)
+
+
+def test_disabled_tracer_does_not_evaluate_lazy_arguments(tracer, capsys):
+    calls = []
+
+    def expensive(value):
+        calls.append(value)
+        return value * 2
+
+    tracer("value:", lazy(expensive, 21))
+    assert calls == []
+    assert capsys.readouterr().out == ""
+
+    enable_tracing("test_tracing")
+    tracer("value:", lazy(expensive, 21))
+    assert calls == [21]
+    assert capsys.readouterr().out == "[test_tracing] value: 42\n"
+
+
+def test_enable_and_disable_update_existing_tracers(tracer):
+    other = get_tracer("test_tracing_other")
+    assert not tracer.enabled and not other.enabled
+
+    enable_tracing("test_tracing")
+    assert tracer.enabled and not other.enabled
+    assert get_tracer("test_tracing") is tracer
+
+    enable_tracing(ALL_CATEGORIES)
+    assert other.enabled and get_tracer("test_tracing_new").enabled
+
+    disable_tracing(ALL_CATEGORIES)
+    assert not tracer.enabled and not other.enabled
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("interactive_chart, transferfunction_widget", [True, True, False]),
+    ("transferfunction_widget", [False, True, False]),
+    ("*", [True, True, True]),
+    ("", [False, False, False]),
+])
+def test_environment_enables_categories(value, expected):
+    code = ("from qtpex.qt_utility.tracing import get_tracer\n"
+            "print([get_tracer(c).enabled for c in ('interactive_chart', 'transferfunction_widget', 'other')])")
+    env = dict(os.environ, QTPEX_TRACE=value, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == str(expected)
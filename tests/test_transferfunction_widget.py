@@ -0,0 +1,154 @@
+import numpy as np
+import pytest
+from PySide6.QtGui import QColor
+
+from qtpex.qt_objects.point_configuration_store import PointConfigurationStore
+from qtpex.qt_widgets.transferfunction_widget import TransferFunctionWidget
+
+
+@pytest.fixture
+def tf(qapp):
+    return TransferFunctionWidget("linear")
+
+
+def test_reset_then_get_lut_update(tf):
+    tf.scatterseries.append(100, 0.5)
+    version = tf.lut_version()
+    tf.reset_tf()
+
+    new_version, i0, i1, entries = tf.get_lut_update(version)
+    assert new_version > version
+    assert (i0, i1) == (0, 256)
+    np.testing.assert_array_equal(entries, tf.get_lut())
+
+    # the versions after the reset are diffed as usual
+    assert tf.get_lut_update(new_version)[1:3] == (0, 0)
+
+
+def test_reset_emits_color_map_changed(tf, qapp):
+    changes = []
+    tf.color_map_changed_signal.connect(lambda change, interacting: changes.append(change))
+
+    for _ in range(2):
+        tf.scatterseries.append(100, 0.5)
+        qapp.processEvents()
+        tf.reset_tf()
+        qapp.processEvents()
+
+    assert len(changes) == 4
+    assert [c.points_added for c in changes] == [1, 2, 1, 2]
+    assert changes[1].points_removed == 3
+    assert changes[-1].version == tf.lut_version()
+
+
+def test_replace_many_updates_line_series_and_alpha(tf):
+    from PySide6.QtCore import QPointF
+
+    tf.scatterseries.append(100, 0.5)
+    tf.scatterseries.replace_many(1, [QPointF(100, 0.9)])
+
+    assert tf.line_series.at(1).y() == pytest.approx(0.9)
+    assert tf.get_points_rgba()[1, 3] == pytest.approx(0.9, abs=1 / 255)
+
+
+def test_sync_reuses_point_ids(tf, qapp):
+    other = TransferFunctionWidget("linear")
+    other.scatterseries.append_many((np.linspace(10, 240, 100), np.linspace(0.1, 0.9, 100)))
+    tf.copy_from_other_tf_widget(other)
+    ids = tf.scatterseries.get_point_ids().copy()
+
+    for y in np.linspace(0.2, 0.8, 50):
+        other.scatterseries.replace_many(50, np.array([[120.0, y]]))
+        version = tf.lut_version()
+        tf.copy_from_other_tf_widget(other)
+
+        # only the segments next to the moved point changed
+        x_min, x_max = tf.get_changed_x_range(version)
+        assert x_min > 10 and x_max < 240
+
+    np.testing.assert_array_equal(tf.scatterseries.get_point_ids(), ids)
+    np.testing.assert_array_equal(tf.get_lut(), other.get_lut())
+    np.testing.assert_array_equal(tf.line_series.get_points_as_arrays()[1], other.get_tf_state()[1])
+
+    # a reset of the same number of points keeps the ids too, and restores the default colors
+    tf.scatterseries.remove_range(1, 100)
+    tf.scatterseries.set_id_configuration_for_point_at_idx(1, {"custom": 1})
+    tf.reset_tf()
+    assert tf.scatterseries.get_extra_configurations() == {}
+    np.testing.assert_array_equal(tf.get_lut(), TransferFunctionWidget("linear").get_lut())
+
+
+def test_step_lut_uses_both_ends_and_exact_points(qapp):
+    tf = TransferFunctionWidget("step")
+    tf.scatterseries.append(100, 0.5)
+    tf.set_tf_state(np.array([0.0, 100.0, 255.0]), np.array([0.2, 0.5, 1.0]),
+                    np.array([0xffff0000, 0xff00ff00, 0xff0000ff], dtype=np.uint32), None,
+                    np.full(3, PointConfigurationStore.CONFIGURED | PointConfigurationStore.HAS_COLOR, np.uint8))
+
+    lut = tf.get_lut(256)
+    np.testing.assert_array_equal(lut[[0, 99, 100, 254, 255], :3],
+                                  [[255, 0, 0], [255, 0, 0], [0, 255, 0], [0, 255, 0], [0, 0, 255]])
+
+
+def test_current_color_matches_lut_for_offset_x_range(qapp):
+    tf = TransferFunctionWidget("linear", x_range=(100, 300), y_range=(0, 1))
+    tf.scatterseries.append(150, 0.25)
+    tf.scatterseries.append(250, 0.75)
+    tf.update_point_color(QColor(255, 0, 0), 2)
+    tf.update_point_color(QColor(0, 0, 255), 3)
+
+    lut = tf.get_lut(11, np.float64)
+    for i in range(11):
+        color = tf.get_current_color_for(i / 10)
+        np.testing.assert_allclose(color.getRgbF(), lut[i], atol=1e-4)
+
+
+@pytest.fixture
+def colored_tf(qapp):
+    tf = TransferFunctionWidget("linear")
+    tf.scatterseries.append(60, 0.3)
+    tf.scatterseries.append(180, 0.9)
+    tf.update_point_color(QColor(255, 0, 0), 2)
+    tf.update_point_color(QColor(0, 128, 255), 3)
+    return tf
+
+
+@pytest.mark.parametrize("chunk_size, workers", [(7, 1), (7, 4), (1000, 3), (1, 2)])
+def test_apply_matches_lut_lookup(colored_tf, chunk_size, workers):
+    data = np.random.default_rng(0).integers(0, 256, (37, 11), dtype=np.uint8)
+    expected = colored_tf.get_lut()[data]
+
+    np.testing.assert_array_equal(colored_tf.apply(data, chunk_size=chunk_size, workers=workers), expected)
+
+    # non-contiguous views of the data
+    np.testing.assert_array_equal(colored_tf.apply(data[:, ::3], chunk_size=chunk_size, workers=workers),
+                                  expected[:, ::3])
+    np.testing.assert_array_equal(colored_tf.apply(data.T, chunk_size=chunk_size, workers=workers),
+                                  expected.transpose(1, 0, 2))
+
+
+def test_apply_into_out_and_float_data(colored_tf):
+    data = np.random.default_rng(1).uniform(-10, 265, 1001)
+    lut = colored_tf.get_lut(1024, np.float32)
+    indices = np.clip(np.rint((data - 0) * 1023 / 255), 0, 1023).astype(np.intp)
+
+    out = np.empty(data.shape + (4,), dtype=np.float32)
+    assert colored_tf.apply(data, out=out, lut_size=1024, chunk_size=100, workers=2) is out
+    np.testing.assert_array_equal(out, lut[indices])
+
+    with pytest.raises(ValueError):
+        colored_tf.apply(data, out=np.empty((1000, 4), dtype=np.float32), lut_size=1024)
+
+    assert colored_tf.apply(np.uint8(60)).tolist() == colored_tf.get_lut()[60].tolist()
+
+
+def test_apply_memory_mapped_data_and_out(colored_tf, tmp_path):
+    data = np.memmap(tmp_path / "data.raw", dtype=np.uint8, mode="w+", shape=(64, 33))
+    data[:] = np.random.default_rng(2).integers(0, 256, data.shape, dtype=np.uint8)
+    out = np.memmap(tmp_path / "out.raw", dtype=np.uint8, mode="w+", shape=data.shape + (4,))
+
+    colored_tf.apply(data, out=out, chunk_size=100, workers=4)
+    out.flush()
+
+    expected = colored_tf.get_lut()[np.asarray(data)]
+    np.testing.assert_array_equal(np.fromfile(tmp_path / "out.raw", dtype=np.uint8).reshape(out.shape), expected)